@@ -0,0 +1,156 @@
+# cardgen 'jpeg' 파이프라인(app7.py)의 asyncio 버전 (ASGI 서버에서 실행)
+# OpenAI 호출과 이미지 다운로드를 기다리는 동안 스레드를 점유하지 않으므로
+# 한 프로세스에서 수백 개의 생성 요청을 동시에 처리할 수 있음
+# 실행: hypercorn app_async:app --bind 0.0.0.0:5000
+# (/generate API와 /metrics, /composite/stats만 제공하며, index.html과 /jobs, /render는 app7.py에서 제공)
+import asyncio
+import concurrent.futures
+import os
+
+import aiohttp
+import openai
+from quart import Quart, Response, request, jsonify, send_from_directory
+from quart_cors import cors
+
+import tracing
+from llm_cache import make_key
+from output_store import apply_cache_headers
+# 캐시, 인코더, 합성 프로세스 풀은 app7.py와 같은 것을 사용
+from cardgen import get_pipeline, services
+from cardgen.common import build_prompt, parse_style, static_url
+from cardgen.jpeg_pipeline import submit_card, finish_card, store_original, store_message
+from cardgen.settings import STATIC_FOLDER, FONTS_FOLDER
+
+PIPELINE = get_pipeline('jpeg')
+
+app = cors(Quart(__name__, static_folder=None))  # 외부 도메인에서 API 접근 허용
+
+# Pillow 작업(디코딩, 해시, 원본 저장 요청)을 실행하는 스레드 수 (이벤트 루프를 막지 않도록 분리)
+CPU_WORKERS = os.cpu_count() or 4
+CPU_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix='pillow')
+
+# 이미지 다운로드 설정
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=60, sock_connect=10)
+
+# OpenAI 호출과 이미지 다운로드가 함께 쓰는 연결 풀 (서버 시작 시 생성)
+HTTP_SESSION = None
+
+
+@app.before_serving
+async def open_session():
+    global HTTP_SESSION
+    services.start_background()  # 폴더 생성, 오래된 파일 정리, 상시 샘플러
+    HTTP_SESSION = aiohttp.ClientSession(timeout=DOWNLOAD_TIMEOUT)
+
+
+@app.after_serving
+async def close_session():
+    await HTTP_SESSION.close()
+
+
+async def run_in_pool(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(CPU_POOL, func, *args)
+
+
+# 메시지를 짧게 요약하는 함수 (app7.py와 같은 캐시 키와 백엔드(OpenAI 스케줄러)를 공유)
+async def generate_short_message(message, bypass_cache=False):
+    model = PIPELINE.chat_model
+    messages = [{"role": "user", "content": f"{message}. within 20 letters"}]
+    key = make_key(model, messages)
+    cache = services.llm_cache()
+
+    if not bypass_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    summarized = await services.provider().achat(model, messages)
+    cache.set(key, summarized)
+    return summarized
+
+
+# 원본에 텍스트를 그리고 저장하는 작업을 합성 프로세스 풀에 넘기고 결과 파일 이름을 기다림
+# (빈 공유 메모리 슬롯을 기다릴 수 있으므로 넘기는 것은 스레드 풀에서 실행하고,
+#  끝나면 app7.py의 compose_card처럼 finish_card로 합성 단계 시간과 인코딩 횟수를 기록)
+async def compose_result(img, image_id, summarized_message, style):
+    store_message(image_id, summarized_message)
+    with tracing.stage('composite'):
+        future = await run_in_pool(submit_card, img, summarized_message, style, PIPELINE)
+        await asyncio.wrap_future(future)
+        return finish_card(future)
+
+
+@app.route('/generate', methods=['POST'])
+async def generate_image():
+    try:
+        # openai 라이브러리의 비동기 호출도 공유 연결 풀을 사용하도록 설정 (요청 태스크마다 지정)
+        openai.aiosession.set(HTTP_SESSION)
+
+        data = await request.get_json()
+        title = data.get('title', '제목 없음')
+        message = data.get('message', '내용 없음')
+        instruction = data.get('instruction', '')
+        style = parse_style(data, PIPELINE.style_defaults)
+        bypass_cache = bool(data.get('noCache', False))
+        painting_style = data.get('painting_style', '선택 안함')
+
+        # 이미지 생성 흐름: DALL·E 생성 → 다운로드 → 원본 저장
+        async def create_image():
+            prompt = build_prompt(title, instruction, painting_style)
+            # b64_json이면 스레드 풀에서 바로 디코딩, URL만 있으면 공유 세션으로 다운로드
+            images = await services.provider().aimages(prompt, n=1, model=PIPELINE.image_model,
+                                                       size=PIPELINE.image_size, executor=CPU_POOL)
+            img = images[0]
+            image_id = await run_in_pool(store_original, img)
+            return img, image_id
+
+        # 텍스트 흐름: 메시지 요약
+        async def prepare_text():
+            summarized_message = await generate_short_message(message, bypass_cache=bypass_cache)
+            print("summarized_message: " + summarized_message + "\n")
+            return summarized_message
+
+        # 두 흐름을 동시에 실행하고 합성 단계에서만 합류
+        (img, image_id), summarized_message = await asyncio.gather(create_image(), prepare_text())
+
+        result_name = await compose_result(img, image_id, summarized_message, style)
+
+        return jsonify({
+            'imageUrl': static_url('results', result_name),
+            'originalUrl': static_url('originals', f'{image_id}.jpg'),
+            'imageId': image_id,
+            'message': summarized_message,
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# 단계별 소요 시간 히스토그램과 카운터 (app7.py의 /metrics와 같은 Prometheus 텍스트 형식)
+@app.route('/metrics')
+async def metrics():
+    return Response(tracing.METRICS.prometheus(), mimetype='text/plain; version=0.0.4')
+
+
+# 합성 프로세스 풀 상태 (공유 메모리로 넘긴 횟수, 빈 슬롯 수)
+@app.route('/composite/stats')
+async def composite_stats():
+    return jsonify(services.composite_pool(PIPELINE.image_size).stats()), 200
+
+
+# 정적 파일 제공 (백그라운드에서 쓰는 중인 파일은 스레드 풀에서 완료를 기다림)
+@app.route('/static/<path:filename>')
+async def serve_static(filename):
+    await run_in_pool(services.wait_written, os.path.join(STATIC_FOLDER, filename))
+    response = await send_from_directory(STATIC_FOLDER, filename)
+    return apply_cache_headers(response, filename, ('results', 'originals'))
+
+
+# 폰트 파일 제공
+@app.route('/fonts/<path:filename>')
+async def serve_fonts(filename):
+    return await send_from_directory(FONTS_FOLDER, filename)
+
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=5000)
@@ -0,0 +1,163 @@
+# 벤치마크 모음 실행기: 합성 단계 마이크로 벤치마크 + /generate 매크로 벤치마크를 JSON으로 저장하고 기준선과 비교
+# 실행: python -m benchmarks run --out bench.json [--quick] [--skip-macro] [--baseline baseline.json]
+#       python -m benchmarks compare baseline.json bench.json [--threshold 0.15]
+# 비교에서 기준선보다 threshold 비율 이상 나빠진 항목이 있으면 종료 코드 1을 반환
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+
+import PIL
+
+from benchmarks import macro, micro
+
+# 이 비율 이상 느려지거나(처리량은 줄어들면) 회귀로 표시
+THRESHOLD = 0.15
+
+# 너무 짧은 측정값은 타이머/스케줄링 잡음이 커서 절대 차이가 이보다 작으면 무시 (ms)
+MIN_DELTA_MS = 0.05
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        'time': datetime.datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'pillow': PIL.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def change(base, current):
+    """기준선 대비 나빠진 비율 (양수면 나빠짐)."""
+    if base['value'] == 0:
+        return float('inf') if current['value'] > 0 and base['better'] == 'lower' else 0.0
+    ratio = (current['value'] - base['value']) / base['value']
+    return -ratio if base['better'] == 'higher' else ratio
+
+
+def compare(baseline, current, threshold=THRESHOLD):
+    """두 결과 파일(dict)을 비교해 (회귀 목록, 개선 목록, 기준선에만 있는 키)를 반환합니다."""
+    base_results = {r['key']: r for r in baseline['results']}
+    regressions, improvements = [], []
+    for r in current['results']:
+        base = base_results.get(r['key'])
+        if base is None:
+            continue
+        delta = change(base, r)
+        if r['unit'] == 'ms' and abs(r['value'] - base['value']) < MIN_DELTA_MS:
+            continue
+        if delta > threshold:
+            regressions.append((r['key'], base['value'], r['value'], r['unit'], delta))
+        elif delta < -threshold:
+            improvements.append((r['key'], base['value'], r['value'], r['unit'], delta))
+    missing = sorted(set(base_results) - {r['key'] for r in current['results']})
+    return regressions, improvements, missing
+
+
+def stage_changes(baseline, current):
+    """단계별 변화 비율의 기하 평균 (기계 전체가 느려진 것인지 일부 조합만 나빠진 것인지 구분용)."""
+    base_results = {r['key']: r for r in baseline['results']}
+    logs = {}
+    for r in current['results']:
+        base = base_results.get(r['key'])
+        if base is None or base['value'] <= 0 or r['value'] <= 0:
+            continue
+        ratio = r['value'] / base['value']
+        if base['better'] == 'higher':
+            ratio = 1 / ratio
+        logs.setdefault(r['stage'], []).append(math.log(ratio))
+    return {stage: math.exp(sum(values) / len(values)) - 1 for stage, values in logs.items()}
+
+
+def print_comparison(regressions, improvements, missing, threshold):
+    def show(title, rows):
+        print(f"{title} ({len(rows)})")
+        for key, base, value, unit, delta in sorted(rows, key=lambda row: -abs(row[4])):
+            print(f"  {key:<80} {base:10.3f} -> {value:10.3f} {unit:<6} {delta:+.0%}")
+
+    show(f"regressions over {threshold:.0%}", regressions)
+    show(f"improvements over {threshold:.0%}", improvements)
+    if missing:
+        print(f"missing from current run ({len(missing)}): {', '.join(missing[:5])}{' ...' if len(missing) > 5 else ''}")
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def command_run(args):
+    results = []
+    print("micro benchmarks")
+    results += micro.run(quick=args.quick)
+    micro.summarize(results)
+    if not args.skip_macro:
+        print("macro benchmarks")
+        for server in args.servers:
+            results += macro.run(server, args.concurrency, args.requests)
+
+    report = {'environment': environment(), 'results': results}
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(f"wrote {len(results)} results to {args.out}")
+
+    if args.baseline:
+        return report_comparison(load(args.baseline), report, args.threshold)
+    return 0
+
+
+def report_comparison(baseline, current, threshold):
+    """비교 결과를 출력하고 회귀가 있으면 1, 없으면 0을 반환합니다."""
+    print("stage change (geometric mean, + is worse)")
+    for stage, delta in stage_changes(baseline, current).items():
+        print(f"  {stage:<9} {delta:+.1%}")
+    found = compare(baseline, current, threshold)
+    print_comparison(*found, threshold)
+    return 1 if found[0] else 0
+
+
+def command_compare(args):
+    return report_comparison(load(args.baseline), load(args.current), args.threshold)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='벤치마크 실행과 기준선 비교')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='벤치마크를 실행하고 JSON으로 저장')
+    run.add_argument('--out', default='bench.json')
+    run.add_argument('--quick', action='store_true', help='글자 크기 조합을 줄여 빠르게 실행')
+    run.add_argument('--skip-macro', action='store_true', help='/generate 매크로 벤치마크 생략')
+    run.add_argument('--servers', nargs='+', default=['sync'], choices=['sync', 'async'])
+    run.add_argument('--concurrency', type=int, default=macro.CONCURRENCY)
+    run.add_argument('--requests', type=int, default=macro.REQUESTS)
+    run.add_argument('--baseline', help='실행 후 비교할 기준선 JSON')
+    run.add_argument('--threshold', type=float, default=THRESHOLD)
+    run.set_defaults(handler=command_run)
+
+    cmp = commands.add_parser('compare', help='두 결과 JSON 비교')
+    cmp.add_argument('baseline')
+    cmp.add_argument('current')
+    cmp.add_argument('--threshold', type=float, default=THRESHOLD)
+    cmp.set_defaults(handler=command_compare)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# DALL·E 이미지 받기 시간 비교: URL 응답 + 다운로드 vs b64_json 응답 + 바로 디코딩
+# 가짜 OpenAI 서버(benchmarks.fake_openai)를 같은 프로세스에서 띄우고, --rtt로 네트워크 왕복 시간을 흉내냄
+# 실행: python -m benchmarks.bench_b64 --rounds 20 --rtt 0.05 [--replay DIR]
+import argparse
+import asyncio
+import statistics
+import time
+
+import openai
+
+from benchmarks.fake_openai import FakeOpenAI, IMAGE_VARIANTS, start_in_thread
+from http_session import ImageDownloader
+
+FAKE_PORT = 8101
+IMAGE_SIZE = '1024x1024'
+
+
+def start_fake(fake):
+    loop = start_in_thread(fake, port=FAKE_PORT)
+    # 이미지 생성 시간이 측정에 섞이지 않도록 미리 만들어 둠
+    for seed in range(IMAGE_VARIANTS):
+        asyncio.run_coroutine_threadsafe(fake.png_b64(IMAGE_SIZE, seed), loop).result()
+
+
+def bench(label, response_format, downloader, rounds):
+    timings = []
+    for i in range(rounds + 1):
+        start = time.perf_counter()
+        response = openai.Image.create(model='dall-e-3', prompt=f'benchmark {i}', n=1,
+                                       size=IMAGE_SIZE, response_format=response_format)
+        image = downloader.load_generated(response['data'][0])
+        elapsed = (time.perf_counter() - start) * 1000
+        if i:  # 첫 번째는 연결/이미지 준비용으로 제외
+            timings.append(elapsed)
+    assert image.size == tuple(int(v) for v in IMAGE_SIZE.split('x'))
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{label:<6} mean {statistics.mean(timings):8.1f} ms   p50 {statistics.median(timings):8.1f} ms   p95 {p95:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='URL vs b64_json 이미지 받기 비교')
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--rtt', type=float, default=0.05)
+    parser.add_argument('--replay', metavar='DIR')
+    args = parser.parse_args()
+
+    fake = FakeOpenAI(chat_latency=0, image_latency=0, rtt=args.rtt, replay_dir=args.replay)
+    start_fake(fake)
+    openai.api_base = f'http://127.0.0.1:{FAKE_PORT}/v1'
+    openai.api_key = 'fake'
+
+    downloader = ImageDownloader()
+    print(f"rounds={args.rounds} rtt={args.rtt * 1000:.0f} ms size={IMAGE_SIZE}")
+    bench('url', 'url', downloader, args.rounds)
+    bench('b64', 'b64_json', downloader, args.rounds)
+    stats = downloader.stats()
+    print(f"url downloads: {stats['downloads']}, inline b64 images: {stats['inline_images']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# 카드 합성(줄바꿈 + 텍스트 그리기 + 300KB JPEG 인코딩) 처리량 비교
+#   threads : 요청 스레드처럼 스레드 풀에서 합성 (GIL을 나눠 씀)
+#   pickled : 프로세스 풀에 픽셀을 피클로 전달 (compositing.render_card)
+#   shared  : CompositingPool (공유 메모리 슬롯으로 픽셀 전달)
+# 실행: python -m benchmarks.bench_compositing --cards 64 --workers 4
+import argparse
+import concurrent.futures
+import os
+import tempfile
+import time
+
+import compositing
+from compositing_pool import CompositingPool
+from providers import parse_size, render_stub_image
+
+FONTS_FOLDER = os.path.join(os.getcwd(), 'fonts')
+MAX_SIZE = 300 * 1024
+MESSAGE = '생일 축하해 친구야 오늘 하루 행복하게 보내'
+STYLE = {'font': 'NanumBrush.ttf', 'fontSize': 'auto', 'textColor': 'black', 'borderColor': 'white',
+         'borderWidth': 2, 'position': 'center'}
+
+
+def bench(label, submit, images):
+    start = time.perf_counter()
+    names = [future.result().name for future in [submit(image) for image in images]]
+    elapsed = time.perf_counter() - start
+    assert len(set(names)) == len(images)
+    print(f"{label:<8} {len(images) / elapsed:7.1f} cards/s   ({elapsed * 1000 / len(images):6.1f} ms/card)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='카드 합성 처리량 비교 (스레드 vs 프로세스 풀)')
+    parser.add_argument('--cards', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--size', default='1024x1024')
+    args = parser.parse_args()
+
+    images = [render_stub_image(f'card {i}', args.size) for i in range(args.cards)]
+    print(f"cards={args.cards} workers={args.workers} size={args.size} cpus={os.cpu_count()}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        # 스레드: 이 프로세스에서 워커 상태를 초기화하고 같은 함수를 실행
+        compositing.init_worker(FONTS_FOLDER)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.workers) as pool:
+            bench('threads', lambda img: pool.submit(
+                compositing.render_card, img.tobytes(), img.size, img.mode, MESSAGE, STYLE,
+                folder, MAX_SIZE), images)
+
+        for name in os.listdir(folder):
+            os.remove(os.path.join(folder, name))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers, initializer=compositing.init_worker,
+                                                    initargs=(FONTS_FOLDER,)) as pool:
+            pool.submit(int).result()  # 워커 시작 시간 제외
+            bench('pickled', lambda img: pool.submit(
+                compositing.render_card, img.tobytes(), img.size, img.mode, MESSAGE, STYLE, folder, MAX_SIZE), images)
+
+        for name in os.listdir(folder):
+            os.remove(os.path.join(folder, name))
+        pool = CompositingPool(FONTS_FOLDER, workers=args.workers, image_size=parse_size(args.size))
+        try:
+            pool.submit(render_stub_image('warm', args.size), MESSAGE, STYLE, folder, MAX_SIZE).result()  # 워커 시작 시간 제외
+            bench('shared', lambda img: pool.submit(img, MESSAGE, STYLE, folder, MAX_SIZE), images)
+            print(f"         {pool.stats()}")
+        finally:
+            pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
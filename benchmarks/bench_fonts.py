@@ -0,0 +1,43 @@
+# 폰트 로드 시간 비교: 요청마다 ImageFont.truetype() vs FontRegistry 재사용
+# 실행: python -m benchmarks.bench_fonts
+import os
+import time
+
+from PIL import ImageFont
+
+from font_registry import FontRegistry
+
+FONTS_FOLDER = os.path.join(os.getcwd(), 'fonts')
+FONT_SIZES = range(10, 101, 5)  # index.html의 fontSize 범위
+SAMPLE_TEXT = '생일 축하해 친구야 오늘 하루 행복하게 보내'
+ROUNDS = 20
+
+
+def bench(label, load):
+    """모든 폰트/크기 조합을 ROUNDS번 불러와 텍스트 너비를 잰 평균 시간(ms)을 출력합니다."""
+    names = sorted(n for n in os.listdir(FONTS_FOLDER) if n.endswith('.ttf'))
+    start = time.perf_counter()
+    count = 0
+    for _ in range(ROUNDS):
+        for name in names:
+            for size in FONT_SIZES:
+                font = load(name, size)
+                font.getbbox(SAMPLE_TEXT)
+                count += 1
+    elapsed = (time.perf_counter() - start) * 1000 / count
+    print(f"{label:<24} {elapsed:.3f} ms / load+measure")
+    return elapsed
+
+
+def main():
+    before = bench('truetype per request', lambda name, size: ImageFont.truetype(os.path.join(FONTS_FOLDER, name), size))
+
+    start = time.perf_counter()
+    registry = FontRegistry(FONTS_FOLDER)
+    print(f"{'registry startup scan':<24} {(time.perf_counter() - start) * 1000:.1f} ms")
+    after = bench('FontRegistry.get', registry.get)
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
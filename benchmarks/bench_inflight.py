@@ -0,0 +1,177 @@
+# 프로세스 하나가 동시에 처리할 수 있는 생성 요청 수 비교: app7.py(스레드) vs app_async.py(asyncio)
+# 가짜 OpenAI 서버(benchmarks.fake_openai)에 지연 시간을 두고 /generate를 동시에 보내,
+# OpenAI 응답을 기다리는 요청 수의 최대값과 서버 프로세스의 스레드 수를 측정
+# 실행: python -m benchmarks.bench_inflight --requests 200
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+from benchmarks.fake_openai import FakeOpenAI, start_server
+
+# 스레드 서버의 요청 처리 스레드 수 (gunicorn gthread 워커 하나에 해당)
+SYNC_THREADS = 32
+
+FAKE_PORT = 8100
+APP_PORT = 5100
+SAMPLE_INTERVAL = 0.05
+
+
+def serve_sync(port, api_base):
+    """app7.py를 고정 크기 스레드 풀 WSGI 서버로 실행합니다."""
+    import concurrent.futures
+
+    import openai
+    from werkzeug.serving import BaseWSGIServer
+
+    import app7
+    if api_base:  # 없으면 OPENAI_PROVIDER 환경 변수의 백엔드 사용 (benchmarks.loadgen의 stub)
+        openai.api_base = api_base
+        openai.api_key = 'fake'
+
+    class PooledWSGIServer(BaseWSGIServer):
+        def __init__(self, *args, threads, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=threads)
+            self.request_queue_size = 1024
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self._handle, request, client_address)
+
+        def _handle(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    PooledWSGIServer('127.0.0.1', port, app7.app, threads=SYNC_THREADS).serve_forever()
+
+
+def serve_async(port, api_base):
+    """app_async.py를 hypercorn으로 실행합니다."""
+    import openai
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    import app_async
+    if api_base:  # 없으면 OPENAI_PROVIDER 환경 변수의 백엔드 사용 (benchmarks.loadgen의 stub)
+        openai.api_base = api_base
+        openai.api_key = 'fake'
+
+    config = Config()
+    config.bind = [f'127.0.0.1:{port}']
+    config.backlog = 1024
+    config.accesslog = None
+    asyncio.run(serve(app_async.app, config))
+
+
+def thread_count(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('Threads:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+async def wait_ready(session, url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(url) as response:
+                await response.read()
+                return
+        except aiohttp.ClientError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f'server at {url} did not start')
+
+
+async def run_load(mode, fake, requests):
+    """mode 서버를 띄우고 requests개의 /generate를 한 번에 보낸 뒤 측정 결과를 반환합니다."""
+    api_base = f'http://127.0.0.1:{FAKE_PORT}/v1'
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.bench_inflight', '--serve', mode,
+         '--port', str(APP_PORT), '--api-base', api_base],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    app_url = f'http://127.0.0.1:{APP_PORT}'
+    try:
+        connector = aiohttp.TCPConnector(limit=0)
+        timeout = aiohttp.ClientTimeout(total=600)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await wait_ready(session, f'{app_url}/fonts/NanumBrush.ttf')
+            fake.reset()
+            peak_threads = thread_count(process.pid)
+
+            async def one(i):
+                body = {'title': f'부하 테스트 {i}', 'message': f'메시지 {i}', 'noCache': True}
+                async with session.post(f'{app_url}/generate', json=body) as response:
+                    await response.read()
+                    return response.status
+
+            start = time.perf_counter()
+            tasks = [asyncio.ensure_future(one(i)) for i in range(requests)]
+            while not all(task.done() for task in tasks):
+                peak_threads = max(peak_threads, thread_count(process.pid))
+                await asyncio.sleep(SAMPLE_INTERVAL)
+            elapsed = time.perf_counter() - start
+            statuses = [task.result() if not task.exception() else 'exception' for task in tasks]
+    finally:
+        process.terminate()
+        process.wait()
+
+    return {
+        'mode': mode,
+        'ok': statuses.count(200),
+        'failed': len(statuses) - statuses.count(200),
+        'peak_inflight': fake.peak_inflight,
+        'peak_threads': peak_threads,
+        'seconds': elapsed,
+    }
+
+
+async def compare(args):
+    fake = FakeOpenAI(args.chat_latency, args.image_latency)
+    runner = await start_server(fake, port=FAKE_PORT)
+    try:
+        results = []
+        for mode in args.modes:
+            results.append(await run_load(mode, fake, args.requests))
+    finally:
+        await runner.cleanup()
+
+    print(f"requests={args.requests} chat_latency={args.chat_latency}s image_latency={args.image_latency}s")
+    print(f"{'mode':<6} {'ok':>5} {'failed':>6} {'peak in-flight':>15} {'peak threads':>13} {'seconds':>8}")
+    for r in results:
+        print(f"{r['mode']:<6} {r['ok']:>5} {r['failed']:>6} {r['peak_inflight']:>15} {r['peak_threads']:>13} {r['seconds']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='동시 처리 요청 수 비교 (스레드 vs asyncio)')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--chat-latency', type=float, default=2.0)
+    parser.add_argument('--image-latency', type=float, default=5.0)
+    parser.add_argument('--modes', nargs='+', default=['sync', 'async'], choices=['sync', 'async'])
+    # 내부용: 측정 대상 서버 프로세스로 실행
+    parser.add_argument('--serve', choices=['sync', 'async'])
+    parser.add_argument('--port', type=int, default=APP_PORT)
+    parser.add_argument('--api-base')
+    args = parser.parse_args()
+
+    if args.serve == 'sync':
+        serve_sync(args.port, args.api_base)
+    elif args.serve == 'async':
+        serve_async(args.port, args.api_base)
+    else:
+        asyncio.run(compare(args))
+
+
+if __name__ == '__main__':
+    main()
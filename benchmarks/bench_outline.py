@@ -0,0 +1,52 @@
+# 텍스트 테두리 그리기 시간 비교: 오프셋마다 draw.text 반복 vs stroke 한 번에 그리기
+# 실행: python -m benchmarks.bench_outline
+import os
+import time
+
+from PIL import Image, ImageDraw
+
+from font_registry import FontRegistry
+from text_layout import layout_text, LINE_SPACING
+
+FONTS_FOLDER = os.path.join(os.getcwd(), 'fonts')
+MESSAGE = '생일 축하해 친구야 오늘 하루 행복하게 보내 ' * 3
+BORDER_WIDTHS = (1, 2, 4, 8)
+ROUNDS = 5
+
+
+def draw_offsets(image, block, font, border_width):
+    """기존 방식: 테두리 두께 안의 모든 오프셋에 draw.text를 반복 (두께의 제곱에 비례)."""
+    draw = ImageDraw.Draw(image)
+    for dx in range(-border_width, border_width + 1):
+        for dy in range(-border_width, border_width + 1):
+            if dx or dy:
+                draw.text((10 + dx, 10 + dy), block.text, font=font, fill='white')
+    draw.text((10, 10), block.text, font=font, fill='black')
+
+
+def draw_stroke(image, block, font, border_width):
+    """새 방식: stroke_width로 테두리와 글자를 한 번에 그림."""
+    draw = ImageDraw.Draw(image)
+    draw.text((10, 10), block.text, font=font, fill='black', stroke_width=border_width,
+              stroke_fill='white', spacing=LINE_SPACING - 2 * border_width)
+
+
+def main():
+    fonts = FontRegistry(FONTS_FOLDER)
+    font = fonts.get('NanumBarunGothic.ttf', 50)
+    block = layout_text(MESSAGE, font, 1004)
+    base = Image.new('RGB', (1024, 1024), 'gray')
+
+    print(f"{'border':>6} {'offsets (ms)':>14} {'stroke (ms)':>12}")
+    for border_width in BORDER_WIDTHS:
+        timings = []
+        for draw in (draw_offsets, draw_stroke):
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                draw(base.copy(), block, font, border_width)
+            timings.append((time.perf_counter() - start) * 1000 / ROUNDS)
+        print(f"{border_width:>6} {timings[0]:>14.1f} {timings[1]:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
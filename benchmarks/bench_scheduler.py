@@ -0,0 +1,117 @@
+# OpenAI 스케줄러 동작 확인: 429 재시도, 같은 요청 합치기, 우선순위
+# 가짜 OpenAI 서버(benchmarks.fake_openai)가 지연 시간과 함께 일정 비율로 429를 돌려줌
+# 실행: python -m benchmarks.bench_scheduler
+import argparse
+import concurrent.futures
+import statistics
+import time
+
+import openai
+
+from benchmarks.fake_openai import FakeOpenAI, start_in_thread
+from openai_scheduler import OpenAIScheduler, INTERACTIVE, BATCH
+
+FAKE_PORT = 8102
+MODEL = 'gpt-4-turbo'
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run_concurrently(func, args, workers=200):
+    """func(arg)를 모두 동시에 실행하고 (성공 여부, 걸린 시간) 리스트를 반환합니다."""
+    def timed(arg):
+        start = time.perf_counter()
+        try:
+            func(arg)
+            return True, time.perf_counter() - start
+        except Exception:
+            return False, time.perf_counter() - start
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(timed, args))
+
+
+def report(label, results, fake):
+    ok = [elapsed for success, elapsed in results if success]
+    print(f"  {label:<10} ok {len(ok):>4}/{len(results):<4} upstream {fake.requests:>4} (429: {fake.rate_limited:>3})"
+          + (f"   p50 {statistics.median(ok):6.2f}s  p95 {percentile(ok, 0.95):6.2f}s" if ok else ''))
+
+
+def bench_retries(fake, calls):
+    """서로 다른 요청을 동시에 보내 429가 섞여도 모두 성공하는지 비교합니다."""
+    print(f"[429 retries] {calls} distinct chat calls, error rate {fake.error_rate:.0%}")
+    messages = [[{'role': 'user', 'content': f'message {i}'}] for i in range(calls)]
+
+    fake.reset()
+    results = run_concurrently(lambda m: openai.ChatCompletion.create(model=MODEL, messages=m), messages)
+    report('bare', results, fake)
+
+    fake.reset()
+    scheduler = OpenAIScheduler(base_delay=0.2)
+    results = run_concurrently(lambda m: scheduler.chat(MODEL, m), messages)
+    report('scheduler', results, fake)
+    print(f"  scheduler stats: {scheduler.stats()}")
+
+
+def bench_coalescing(fake, calls):
+    """같은 요청을 동시에 보내 실제로 나간 요청 수를 비교합니다."""
+    print(f"[coalescing] {calls} identical chat calls")
+    messages = [{'role': 'user', 'content': 'same message'}]
+
+    fake.reset()
+    results = run_concurrently(lambda _: openai.ChatCompletion.create(model=MODEL, messages=messages), range(calls))
+    report('bare', results, fake)
+
+    fake.reset()
+    scheduler = OpenAIScheduler(base_delay=0.2)
+    results = run_concurrently(lambda _: scheduler.chat(MODEL, messages), range(calls))
+    report('scheduler', results, fake)
+
+
+def bench_priority(fake, batch_calls, interactive_calls, rpm):
+    """한도를 넘는 배치 요청이 쌓인 뒤에 들어온 화면 요청이 얼마나 기다리는지 측정합니다."""
+    print(f"[priority] {batch_calls} batch calls then {interactive_calls} interactive calls, limit {rpm} RPM")
+    fake.reset()
+    scheduler = OpenAIScheduler(limits={MODEL: (rpm, None)}, base_delay=0.2)
+
+    def call(lane):
+        start = time.perf_counter()
+        scheduler.chat(MODEL, [{'role': 'user', 'content': f'{lane} {time.perf_counter()}'}],
+                       priority=INTERACTIVE if lane == 'interactive' else BATCH)
+        return lane, time.perf_counter() - start
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=batch_calls + interactive_calls) as pool:
+        futures = [pool.submit(call, 'batch') for _ in range(batch_calls)]
+        time.sleep(0.2)  # 배치 요청이 한도를 다 쓰고 대기열에 쌓인 뒤
+        futures += [pool.submit(call, 'interactive') for _ in range(interactive_calls)]
+        timings = [future.result() for future in futures]
+
+    for lane in ('interactive', 'batch'):
+        values = [elapsed for name, elapsed in timings if name == lane]
+        print(f"  {lane:<11} p50 {statistics.median(values):6.2f}s  max {max(values):6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OpenAI 스케줄러 확인')
+    parser.add_argument('--calls', type=int, default=100)
+    parser.add_argument('--error-rate', type=float, default=0.3)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--retry-after', type=float)
+    args = parser.parse_args()
+
+    fake = FakeOpenAI(chat_latency=args.latency, error_rate=args.error_rate, retry_after=args.retry_after)
+    start_in_thread(fake, port=FAKE_PORT)
+    openai.api_base = f'http://127.0.0.1:{FAKE_PORT}/v1'
+    openai.api_key = 'fake'
+
+    bench_retries(fake, args.calls)
+    bench_coalescing(fake, args.calls)
+    fake.error_rate = 0
+    bench_priority(fake, batch_calls=150, interactive_calls=5, rpm=600)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+# 서버 콜드 스타트 측정: 프로세스 시작부터 첫 응답(/)과 첫 /generate 응답까지 걸리는 시간
+# gunicorn pre-fork 방식과 같이 마스터가 앱을 import한 뒤 워커를 fork해 요청을 처리하게 함
+#   fork     : 마스터가 소켓을 열고 앱을 import한 뒤 fork한 워커가 werkzeug로 그 소켓에서 처리 (gunicorn --preload와 같은 순서)
+#   gunicorn : gunicorn -w 1 --preload (설치되어 있을 때)
+# /generate는 스텁 백엔드(지연 0)로 보내므로 OpenAI 호출 없이 import/초기화 비용만 보임
+# 실행: python -m benchmarks.bench_startup --repeat 5
+#       python -m benchmarks.bench_startup --app 'cardgen:create_app("summary")'
+#       python -m benchmarks.bench_startup --root /tmp/old-checkout   # 다른 체크아웃(이전 커밋)의 app7:app과 비교
+#       python -m benchmarks.bench_startup --preload   # 마스터에서 cardgen.services.preload() 호출 (fork 방식만)
+import argparse
+import importlib
+import importlib.util
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+APP_PORT = 5300
+
+BODY = {'title': '시작 시간 측정', 'message': '생일 축하해 친구야 오늘 하루 행복하게 보내', 'noCache': True}
+
+
+def load_app(spec):
+    """gunicorn과 같은 'module:name' 또는 'module:factory(...)' 형식의 앱을 불러옵니다."""
+    module_name, _, expr = spec.partition(':')
+    module = importlib.import_module(module_name)
+    return eval(expr or 'app', vars(module))
+
+
+def serve_forked(spec, port, preload=False):
+    """마스터: 소켓을 열고 앱을 import한 뒤 워커를 fork하고, 종료 신호를 받으면 워커도 종료합니다."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(('127.0.0.1', port))
+    sock.listen(128)
+
+    start = time.perf_counter()
+    app = load_app(spec)
+    if preload:
+        importlib.import_module('cardgen.services').preload()
+    print(json.dumps({'import_ms': (time.perf_counter() - start) * 1000}), flush=True)
+
+    pid = os.fork()
+    if pid == 0:
+        from werkzeug.serving import make_server
+        make_server('127.0.0.1', port, app, threaded=True, fd=sock.fileno()).serve_forever()
+        os._exit(0)
+
+    def stop(signum, frame):
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+        os._exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    os.waitpid(pid, 0)
+
+
+def spawn(server, spec, root, port, preload=False):
+    env = dict(os.environ, OPENAI_PROVIDER='stub', STUB_CHAT_LATENCY='0', STUB_IMAGE_LATENCY='0',
+               PYTHONPATH=root)
+    if server == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-w', '1', '--preload', '-b', f'127.0.0.1:{port}', spec]
+    else:
+        # 이 파일을 스크립트로 실행 (root가 다른 체크아웃이어도 그쪽 앱을 import하도록 cwd/PYTHONPATH를 root로)
+        command = [sys.executable, os.path.abspath(__file__), '--serve', spec, '--port', str(port)]
+        if preload:
+            command.append('--preload')
+    return subprocess.Popen(command, cwd=root, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            text=True)
+
+
+def request(url, body=None, timeout=120):
+    """응답이 올 때까지 보내고(연결 거부면 다시 시도) 상태 코드를 반환합니다."""
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, data, headers), timeout=timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+        except (ConnectionError, urllib.error.URLError):
+            if time.perf_counter() > deadline:
+                raise
+            time.sleep(0.005)
+
+
+def measure_once(server, spec, root, port, preload=False):
+    base = f'http://127.0.0.1:{port}'
+    start = time.perf_counter()
+    process = spawn(server, spec, root, port, preload)
+    try:
+        index_status = request(f'{base}/')
+        first_index = time.perf_counter() - start
+        generate_status = request(f'{base}/generate', BODY)
+        first_generate = time.perf_counter() - start
+        warm_start = time.perf_counter()
+        request(f'{base}/generate', BODY)
+        warm_generate = time.perf_counter() - warm_start
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            out, _ = process.communicate(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            out, _ = process.communicate()
+    import_ms = None
+    for line in out.splitlines():
+        if line.startswith('{"import_ms"'):
+            import_ms = json.loads(line)['import_ms']
+    if generate_status != 200:
+        raise RuntimeError(f'/generate returned {generate_status} (index {index_status})')
+    return {
+        'import_ms': import_ms,
+        'first_index_ms': first_index * 1000,
+        'first_generate_ms': first_generate * 1000,
+        'warm_generate_ms': warm_generate * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='서버 콜드 스타트 측정 (pre-fork)')
+    parser.add_argument('--app', default='app7:app', help="'module:app' 또는 'module:factory(...)'")
+    parser.add_argument('--root', default=os.getcwd(), help='앱을 불러올 체크아웃 경로')
+    parser.add_argument('--server', choices=['auto', 'fork', 'gunicorn'], default='auto')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--port', type=int, default=APP_PORT)
+    parser.add_argument('--preload', action='store_true', help='마스터에서 무거운 모듈을 미리 불러옴 (fork 방식)')
+    parser.add_argument('--serve', metavar='APP', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_forked(args.serve, args.port, args.preload)
+        return
+
+    server = args.server
+    if server == 'auto':
+        server = 'gunicorn' if importlib.util.find_spec('gunicorn') else 'fork'
+    print(f"app={args.app} root={args.root} server={server} preload={args.preload} repeat={args.repeat}")
+
+    runs = [measure_once(server, args.app, args.root, args.port, args.preload) for _ in range(args.repeat)]
+    for name in ('import_ms', 'first_index_ms', 'first_generate_ms', 'warm_generate_ms'):
+        values = [run[name] for run in runs if run[name] is not None]
+        if values:
+            print(f"{name:<18} median {statistics.median(values):8.1f}   min {min(values):8.1f}   max {max(values):8.1f}")
+
+
+if __name__ == '__main__':
+    main()
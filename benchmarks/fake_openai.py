@@ -0,0 +1,236 @@
+# 부하 테스트용 가짜 OpenAI 서버 (채팅 요약, DALL·E 이미지 생성, 이미지 다운로드를 지연 시간과 함께 흉내냄)
+# 실행: python -m benchmarks.fake_openai --port 8100 --chat-latency 1 --image-latency 3
+# 앱에서는 openai.api_base = 'http://127.0.0.1:8100/v1' 로 지정해서 사용
+#
+# --replay DIR 을 주면 DIR에 녹화해 둔 실제 DALL·E 이미지(*.png)를 돌려주고, 없으면 절차적으로 만든 이미지를 사용
+# 녹화: OPENAI_API_KEY=... python -m benchmarks.fake_openai --record DIR --count 4
+import argparse
+import asyncio
+import base64
+import glob
+import os
+import random
+import time
+from io import BytesIO
+
+from aiohttp import web
+from PIL import Image
+
+# 생성하는 이미지 종류 수 (같은 종류는 PNG를 한 번만 만들고 재사용)
+IMAGE_VARIANTS = 16
+
+
+def render_png(size, seed):
+    """seed마다 색이 다른 그라디언트에 잡음을 섞은 PNG를 만듭니다 (실제 DALL·E PNG와 비슷한 크기)."""
+    width, height = size
+    gradient = Image.linear_gradient('L').resize((width, height))
+    tint = Image.new('RGB', (width, height), ((seed * 53) % 256, (seed * 97) % 256, (seed * 151) % 256))
+    image = Image.merge('RGB', (gradient, gradient.transpose(Image.Transpose.ROTATE_90), gradient))
+    image = Image.blend(image, tint, 0.5)
+    noise = Image.effect_noise((width, height), 24).convert('RGB')
+    image = Image.blend(image, noise, 0.3)
+    with BytesIO() as buf:
+        image.save(buf, 'PNG')
+        return buf.getvalue()
+
+
+def load_recorded(folder):
+    """녹화된 PNG 파일들을 (width, height) -> [PNG bytes] 로 읽습니다."""
+    recorded = {}
+    for path in sorted(glob.glob(os.path.join(folder, '*.png'))):
+        with open(path, 'rb') as f:
+            data = f.read()
+        with Image.open(BytesIO(data)) as image:
+            recorded.setdefault(image.size, []).append(data)
+    return recorded
+
+
+def record(folder, count, size='1024x1024'):
+    """실제 DALL·E API로 이미지를 count개 만들어 folder에 PNG로 저장합니다."""
+    import openai
+    openai.api_key = os.environ['OPENAI_API_KEY']
+    os.makedirs(folder, exist_ok=True)
+    for i in range(count):
+        response = openai.Image.create(model='dall-e-3', prompt=f'An artistic landscape, variation {i}',
+                                       n=1, size=size, response_format='b64_json')
+        path = os.path.join(folder, f'{size}-{i}.png')
+        with open(path, 'wb') as f:
+            f.write(base64.b64decode(response['data'][0]['b64_json']))
+        print(f"Recorded {path}")
+
+
+class FakeOpenAI:
+    def __init__(self, chat_latency=1.0, image_latency=3.0, rtt=0.0, replay_dir=None,
+                 error_rate=0.0, retry_after=None, seed=0):
+        self.chat_latency = chat_latency
+        self.image_latency = image_latency
+        self.rtt = rtt  # 모든 요청(이미지 다운로드 포함)에 더하는 네트워크 왕복 시간
+        self.error_rate = error_rate  # 채팅/이미지 생성 요청 중 429로 응답하는 비율
+        self.retry_after = retry_after  # 429 응답의 Retry-After 헤더 값 (None이면 헤더 없음)
+        self.random = random.Random(seed)
+        self.rate_limited = 0
+        self.recorded = load_recorded(replay_dir) if replay_dir else {}
+        self.inflight = 0  # 응답을 기다리는 중인 채팅/이미지 생성 요청 수
+        self.peak_inflight = 0
+        self.requests = 0
+        self.images = {}  # (width, height, seed) -> PNG bytes, ('b64', size, seed) -> base64 문자열
+
+    def _enter(self):
+        self.requests += 1
+        self.inflight += 1
+        self.peak_inflight = max(self.peak_inflight, self.inflight)
+
+    def _leave(self):
+        self.inflight -= 1
+
+    def _rate_limit_response(self):
+        """error_rate 확률로 OpenAI와 같은 형식의 429 응답을 반환합니다. 통과하면 None."""
+        if self.random.random() >= self.error_rate:
+            return None
+        self.rate_limited += 1
+        headers = {'Retry-After': str(self.retry_after)} if self.retry_after is not None else None
+        return web.json_response({'error': {
+            'message': 'Rate limit reached for requests', 'type': 'requests', 'code': 'rate_limit_exceeded',
+        }}, status=429, headers=headers)
+
+    async def chat_completions(self, request):
+        body = await request.json()
+        self._enter()
+        try:
+            await asyncio.sleep(self.rtt + self.chat_latency)
+        finally:
+            self._leave()
+        limited = self._rate_limit_response()
+        if limited is not None:
+            return limited
+        content = body['messages'][-1]['content'][:20]
+        return web.json_response({
+            'id': f'chatcmpl-{self.requests}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+        })
+
+    async def image_generations(self, request):
+        body = await request.json()
+        self._enter()
+        try:
+            await asyncio.sleep(self.rtt + self.image_latency)
+        finally:
+            self._leave()
+        limited = self._rate_limit_response()
+        if limited is not None:
+            return limited
+        size = body.get('size', '1024x1024')
+        seeds = [(self.requests + i) % IMAGE_VARIANTS for i in range(int(body.get('n', 1)))]
+        if body.get('response_format') == 'b64_json':
+            # 이미지를 응답 안에 base64로 포함
+            data = [{'b64_json': await self.png_b64(size, seed)} for seed in seeds]
+        else:
+            base = f'{request.scheme}://{request.host}'
+            data = [{'url': f'{base}/images/{size}/{seed}.png'} for seed in seeds]
+        return web.json_response({'created': int(time.time()), 'data': data})
+
+    async def png(self, size, seed):
+        """녹화된 이미지가 있으면 그중 하나를, 없으면 만든 이미지를 PNG bytes로 반환합니다."""
+        width, height = (int(v) for v in size.split('x'))
+        recorded = self.recorded.get((width, height))
+        if recorded:
+            return recorded[seed % len(recorded)]
+        key = (width, height, seed)
+        data = self.images.get(key)
+        if data is None:
+            data = await asyncio.get_running_loop().run_in_executor(None, render_png, (width, height), seed)
+            self.images[key] = data
+        return data
+
+    async def png_b64(self, size, seed):
+        """png()의 base64 문자열 (녹화된 응답을 재생하듯 한 번 만든 문자열을 재사용)."""
+        key = ('b64', size, seed)
+        data = self.images.get(key)
+        if data is None:
+            data = base64.b64encode(await self.png(size, seed)).decode('ascii')
+            self.images[key] = data
+        return data
+
+    async def image_file(self, request):
+        await asyncio.sleep(self.rtt)
+        data = await self.png(request.match_info['size'], int(request.match_info['seed']))
+        return web.Response(body=data, content_type='image/png')
+
+    async def stats(self, request):
+        return web.json_response(self.stats_dict())
+
+    def stats_dict(self):
+        return {'inflight': self.inflight, 'peak_inflight': self.peak_inflight, 'requests': self.requests,
+                'rate_limited': self.rate_limited}
+
+    def reset(self):
+        self.peak_inflight = self.inflight
+        self.requests = 0
+        self.rate_limited = 0
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_post('/v1/chat/completions', self.chat_completions)
+        app.router.add_post('/v1/images/generations', self.image_generations)
+        app.router.add_get('/images/{size}/{seed}.png', self.image_file)
+        app.router.add_get('/stats', self.stats)
+        return app
+
+
+async def start_server(fake, host='127.0.0.1', port=8100):
+    """현재 이벤트 루프에서 가짜 서버를 시작하고 AppRunner를 반환합니다 (끝나면 runner.cleanup())."""
+    runner = web.AppRunner(fake.make_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def start_in_thread(fake, host='127.0.0.1', port=8100):
+    """별도 스레드의 이벤트 루프에서 가짜 서버를 실행하고 그 루프를 반환합니다 (동기 코드의 벤치마크용)."""
+    import threading
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(start_server(fake, host, port))
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return loop
+
+
+def main():
+    parser = argparse.ArgumentParser(description='가짜 OpenAI 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--chat-latency', type=float, default=1.0)
+    parser.add_argument('--image-latency', type=float, default=3.0)
+    parser.add_argument('--rtt', type=float, default=0.0)
+    parser.add_argument('--replay', metavar='DIR')
+    parser.add_argument('--record', metavar='DIR')
+    parser.add_argument('--count', type=int, default=4)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float)
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record, args.count)
+        return
+
+    fake = FakeOpenAI(args.chat_latency, args.image_latency, args.rtt, args.replay, args.error_rate, args.retry_after)
+    web.run_app(fake.make_app(), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+# /generate 부하 테스트: OpenAI 대신 로컬 스텁(providers.StubProvider)으로 서버를 띄우고
+# 고정 동시성(closed loop) 또는 고정 요청률(open loop)로 요청을 보내 처리량과 지연 분포를 측정
+# 네트워크 없이 Flask/Pillow 처리 비용만 재거나, 스텁 지연/오류율을 실제 API에 가깝게 두고 꼬리 지연을 볼 수 있음
+# 실행: python -m benchmarks.loadgen --server sync --concurrency 16 --requests 200
+#       python -m benchmarks.loadgen --server async --rate 20 --duration 30 --image-latency 8,15
+#       python -m benchmarks.loadgen --url http://127.0.0.1:5000   # 이미 떠 있는 서버 (OPENAI_PROVIDER=stub 권장)
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+from benchmarks.bench_inflight import thread_count, wait_ready
+
+APP_PORT = 5200
+
+# 스텁도 실제 앱처럼 스케줄러를 거치므로, 분당 한도(dall-e-3 50장 등)를 풀어 서버 처리량만 재도록 함
+# (재시도와 합치기는 그대로 동작)
+STUB_RATE_LIMITS = {model: [1000000, None] for model in ('gpt-3.5-turbo', 'gpt-4-turbo', 'dall-e-2', 'dall-e-3')}
+
+# 요청 본문에 섞어 쓰는 값 (폰트 크기/위치/길이가 달라야 합성 비용이 실제와 비슷함)
+MESSAGES = [
+    '생일 축하해! 올해도 행복한 일만 가득하길 바랄게',
+    '합격 축하합니다. 그동안 정말 고생 많았어요',
+    '새해 복 많이 받으세요',
+    '언제나 응원하고 있어. 힘내!',
+    '결혼을 진심으로 축하드립니다. 두 분의 앞날에 행복이 가득하기를 바랍니다',
+]
+POSITIONS = ['center', 'top left', 'bottom right', 'auto']
+FONT_SIZES = [30, 50, 80, 'auto']
+
+
+def make_body(rng, i):
+    return {
+        'title': f'부하 테스트 {i}',
+        'message': rng.choice(MESSAGES),
+        'position': rng.choice(POSITIONS),
+        'fontSize': rng.choice(FONT_SIZES),
+        'borderWidth': rng.choice([0, 1, 3]),
+        'noCache': True,
+    }
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def spawn_server(mode, port, chat_latency, image_latency, error_rate, seed):
+    """스텁 백엔드로 app7.py(sync) 또는 app_async.py(async) 서버 프로세스를 띄웁니다."""
+    env = dict(os.environ, OPENAI_PROVIDER='stub', STUB_CHAT_LATENCY=chat_latency,
+               STUB_IMAGE_LATENCY=image_latency, STUB_ERROR_RATE=str(error_rate), STUB_SEED=str(seed),
+               OPENAI_RATE_LIMITS=json.dumps(STUB_RATE_LIMITS))
+    return subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.bench_inflight', '--serve', mode, '--port', str(port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def run_load(url, requests=None, concurrency=None, rate=None, duration=None, seed=0, pid=None):
+    """url 서버의 /generate에 부하를 주고 결과 dict를 반환합니다.
+
+    concurrency가 주어지면 그 수만큼 요청을 계속 유지하고(closed loop),
+    rate가 주어지면 초당 rate개를 도착 간격이 지수 분포가 되도록 보냅니다(open loop, 응답을 기다리지 않음).
+    requests개를 보내거나 duration초가 지나면 멈춥니다.
+    """
+    rng = random.Random(seed)
+    latencies = []
+    statuses = {}
+    peak_threads = 0
+    deadline = time.perf_counter() + duration if duration else None
+    counter = iter(range(requests)) if requests else iter(int, 1)  # requests가 없으면 끝없이
+
+    def next_index():
+        if deadline is not None and time.perf_counter() >= deadline:
+            return None
+        return next(counter, None)
+
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=600)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await wait_ready(session, f'{url}/fonts/NanumBrush.ttf')
+
+        async def one(i):
+            start = time.perf_counter()
+            try:
+                async with session.post(f'{url}/generate', json=make_body(rng, i)) as response:
+                    await response.read()
+                    status = response.status
+            except aiohttp.ClientError:
+                status = 'exception'
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+        async def closed_loop_worker():
+            while (i := next_index()) is not None:
+                await one(i)
+
+        async def open_loop():
+            tasks = []
+            while (i := next_index()) is not None:
+                tasks.append(asyncio.ensure_future(one(i)))
+                await asyncio.sleep(rng.expovariate(rate))
+            await asyncio.gather(*tasks)
+
+        async def sample_threads():
+            nonlocal peak_threads
+            while True:
+                peak_threads = max(peak_threads, thread_count(pid))
+                await asyncio.sleep(0.1)
+
+        sampler = asyncio.ensure_future(sample_threads()) if pid else None
+        start = time.perf_counter()
+        if rate:
+            await open_loop()
+        else:
+            await asyncio.gather(*(closed_loop_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        if sampler is not None:
+            sampler.cancel()
+
+    return {
+        'requests': sum(statuses.values()),
+        'ok': statuses.get(200, 0),
+        'statuses': {str(k): v for k, v in statuses.items()},
+        'seconds': elapsed,
+        'throughput': statuses.get(200, 0) / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 0.50),
+        'p90': percentile(latencies, 0.90),
+        'p99': percentile(latencies, 0.99),
+        'max': max(latencies, default=0.0),
+        'peak_threads': peak_threads,
+    }
+
+
+def print_result(label, r):
+    print(f"{label}: {r['ok']}/{r['requests']} ok in {r['seconds']:.1f}s -> {r['throughput']:.2f} req/s   statuses {r['statuses']}")
+    print(f"  latency p50 {r['p50']:.3f}s  p90 {r['p90']:.3f}s  p99 {r['p99']:.3f}s  max {r['max']:.3f}s"
+          + (f"   peak threads {r['peak_threads']}" if r['peak_threads'] else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='/generate 부하 테스트 (스텁 백엔드)')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--server', choices=['sync', 'async'], default='sync', help='스텁 백엔드로 띄울 서버')
+    target.add_argument('--url', help='이미 실행 중인 서버 주소')
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument('--concurrency', type=int, default=16)
+    load.add_argument('--rate', type=float, help='초당 요청 수 (open loop)')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--duration', type=float, help='초 (지정하면 --requests 대신 시간으로 멈춤)')
+    parser.add_argument('--chat-latency', default='0.1,0.3', help='스텁 요약 지연 "중앙값,p95" 초')
+    parser.add_argument('--image-latency', default='0.5,1.5', help='스텁 이미지 생성 지연 "중앙값,p95" 초')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    requests = None if args.duration else args.requests
+    if args.url:
+        result = asyncio.run(run_load(args.url, requests, args.concurrency, args.rate, args.duration, args.seed))
+        print_result(args.url, result)
+        return
+
+    process = spawn_server(args.server, APP_PORT, args.chat_latency, args.image_latency, args.error_rate, args.seed)
+    try:
+        result = asyncio.run(run_load(f'http://127.0.0.1:{APP_PORT}', requests, args.concurrency, args.rate,
+                                      args.duration, args.seed, pid=process.pid))
+    finally:
+        process.terminate()
+        process.wait()
+    load = f'rate {args.rate}/s' if args.rate else f'concurrency {args.concurrency}'
+    print(f"stub chat {args.chat_latency}s, image {args.image_latency}s, error rate {args.error_rate:.0%}")
+    print_result(f'{args.server} ({load})', result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# /generate 매크로 벤치마크: 스텁 백엔드로 서버를 띄우고 고정 동시성으로 요청해 처리량과 지연을 측정
+# 스텁 지연은 0으로 두어 OpenAI 응답 시간이 아닌 서버(Flask + Pillow) 처리 비용만 잼
+# 단독 실행: python -m benchmarks.macro --server sync --concurrency 8 --requests 100
+import argparse
+import asyncio
+
+from benchmarks.loadgen import APP_PORT, run_load, spawn_server, print_result
+
+CONCURRENCY = 8
+REQUESTS = 100
+STUB_LATENCY = '0'
+
+
+def run(server='sync', concurrency=CONCURRENCY, requests=REQUESTS, seed=0):
+    """server('sync' = app7.py, 'async' = app_async.py)를 측정해 결과 레코드 리스트를 반환합니다."""
+    process = spawn_server(server, APP_PORT, STUB_LATENCY, STUB_LATENCY, 0.0, seed)
+    try:
+        result = asyncio.run(run_load(f'http://127.0.0.1:{APP_PORT}', requests, concurrency, seed=seed,
+                                      pid=process.pid))
+    finally:
+        process.terminate()
+        process.wait()
+    print_result(f'  generate {server} (concurrency {concurrency})', result)
+
+    params = {'server': server, 'concurrency': concurrency}
+    prefix = f'generate server={server} concurrency={concurrency}'
+    records = [{'key': f'{prefix} metric=throughput', 'stage': 'generate', 'params': dict(params, metric='throughput'),
+                'value': result['throughput'], 'unit': 'req/s', 'better': 'higher'}]
+    for metric in ('p50', 'p90', 'p99'):
+        records.append({'key': f'{prefix} metric={metric}', 'stage': 'generate', 'params': dict(params, metric=metric),
+                        'value': result[metric] * 1000, 'unit': 'ms', 'better': 'lower'})
+    # 실패한 요청이 있으면 결과를 믿을 수 없으므로 비교에서 바로 드러나도록 기록
+    records.append({'key': f'{prefix} metric=errors', 'stage': 'generate', 'params': dict(params, metric='errors'),
+                    'value': result['requests'] - result['ok'], 'unit': 'count', 'better': 'lower'})
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description='/generate 매크로 벤치마크 (스텁 백엔드)')
+    parser.add_argument('--server', choices=['sync', 'async'], default='sync')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--requests', type=int, default=REQUESTS)
+    args = parser.parse_args()
+    run(args.server, args.concurrency, args.requests)
+
+
+if __name__ == '__main__':
+    main()
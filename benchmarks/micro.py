@@ -0,0 +1,171 @@
+# app7.py 합성 단계별 마이크로 벤치마크 (줄바꿈, 위치 계산, 텍스트 그리기, JPEG 인코딩)
+# 번들 폰트 전체 x 글자 크기(index.html 범위 10~100) x 메시지 길이 x 이미지 크기 조합을 측정
+# 단독 실행: python -m benchmarks.micro [--quick]   (JSON 저장/비교는 python -m benchmarks)
+import argparse
+import os
+import statistics
+import time
+
+from compositing import calculate_text_position, draw_text_with_border, prepare_wrapped_text
+from font_registry import FontRegistry
+from jpeg_encoder import BudgetJpegEncoder
+from providers import render_stub_image
+from text_placement import pick_text_placement
+
+FONTS_FOLDER = os.path.join(os.getcwd(), 'fonts')
+
+# app7.py와 같은 설정
+AUTO_FONT_SIZE_RANGE = (10, 100)
+MAX_IMAGE_BYTES = 300 * 1024
+
+FONT_SIZES = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 'auto']
+QUICK_FONT_SIZES = [10, 50, 100, 'auto']
+MESSAGES = {
+    'short': '생일 축하해',
+    'medium': '생일 축하해 친구야 오늘 하루 행복하게 보내',
+    'long': '결혼을 진심으로 축하드립니다 두 분이 함께 걸어갈 앞날에 사랑과 행복이 가득하기를 바라며 '
+            '언제나 서로를 아끼는 부부가 되시길 기원합니다',
+}
+IMAGE_SIZES = ['512x512', '1024x1024']
+POSITIONS = ['center', 'top left', 'bottom right', 'auto']
+BORDER_WIDTHS = [0, 1, 4]
+
+# 한 번 측정할 때 최소한 이 시간(초)만큼 반복 (아주 짧은 함수의 타이머 오차를 줄임)
+MIN_ROUND_SECONDS = 0.02
+ROUNDS = 5
+
+
+def measure(func, rounds=ROUNDS):
+    """func 한 번 실행 시간(ms)의 최소값과 중앙값을 반환합니다.
+
+    비교에는 최소값을 사용합니다 (다른 프로세스나 GC 때문에 늘어난 시간은 빠지고 코드 비용만 남음).
+    """
+    func()  # 캐시 준비
+    start = time.perf_counter()
+    func()
+    once = time.perf_counter() - start
+    inner = max(1, int(MIN_ROUND_SECONDS / once)) if once > 0 else 100
+
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(inner):
+            func()
+        samples.append((time.perf_counter() - start) * 1000 / inner)
+    return min(samples), statistics.median(samples)
+
+
+def record(stage, params, func, rounds=ROUNDS):
+    best, median = measure(func, rounds)
+    key = stage + ' ' + ' '.join(f'{k}={v}' for k, v in params.items())
+    return {'key': key, 'stage': stage, 'params': params, 'value': best, 'median': median,
+            'unit': 'ms', 'better': 'lower'}
+
+
+def image_dimensions(size):
+    return tuple(int(v) for v in size.split('x'))
+
+
+def bench_wrap(fonts, sizes, rounds):
+    """줄바꿈(+ auto 글자 크기 탐색): compositing.prepare_wrapped_text"""
+    results = []
+    for font_name in fonts.names():
+        for font_size in sizes:
+            for message_name, message in MESSAGES.items():
+                for image_size in IMAGE_SIZES:
+                    width, height = image_dimensions(image_size)
+                    results.append(record('wrap', {
+                        'font': font_name, 'size': font_size, 'message': message_name, 'image': image_size,
+                    }, lambda: prepare_wrapped_text(fonts, message, font_name, font_size, width, height, 1,
+                                                    AUTO_FONT_SIZE_RANGE), rounds))
+    return results
+
+
+def bench_position(fonts, images, rounds):
+    """위치 계산: 이름으로 지정한 위치(calculate_text_position)와 이미지 분석("auto")"""
+    results = []
+    for image_size, image in images.items():
+        for message_name, message in MESSAGES.items():
+            font, block = prepare_wrapped_text(fonts, message, 'NanumBrush.ttf', 50, image.width, image.height, 1)
+            for position in POSITIONS:
+                if position == 'auto':
+                    # draw_text_with_border가 auto일 때 부르는 영역 분석
+                    func = lambda: pick_text_placement(image, block.width + 2, block.height + 2, 'auto')
+                else:
+                    func = lambda: calculate_text_position(image, position, block, padding=1)
+                results.append(record('position', {
+                    'position': position, 'message': message_name, 'image': image_size,
+                }, func, rounds))
+    return results
+
+
+def bench_draw(fonts, images, sizes, rounds):
+    """텍스트와 테두리 그리기: compositing.draw_text_with_border (원본 복사 포함)"""
+    results = []
+    image = images['1024x1024']
+    message = MESSAGES['medium']
+    for font_name in fonts.names():
+        for font_size in sizes:
+            font, block = prepare_wrapped_text(fonts, message, font_name, font_size, image.width, image.height, 4,
+                                               AUTO_FONT_SIZE_RANGE)
+            for border_width in BORDER_WIDTHS:
+                results.append(record('draw', {
+                    'font': font_name, 'size': font_size, 'border': border_width, 'image': '1024x1024',
+                }, lambda: draw_text_with_border(image.copy(), block, font, 'center', 'black', 'white', border_width),
+                    rounds))
+    return results
+
+
+def bench_encode(fonts, images, rounds):
+    """300KB 예산 JPEG 인코딩: BudgetJpegEncoder.encode (app7.save_image_with_compression에서 디스크 쓰기를 뺀 부분)"""
+    results = []
+    for image_size, image in images.items():
+        carded = image.copy()
+        font, block = prepare_wrapped_text(fonts, MESSAGES['medium'], 'NanumBrush.ttf', 50,
+                                           image.width, image.height, 1)
+        draw_text_with_border(carded, block, font, 'center', 'black', 'white', 1)
+        for variant, target in (('original', image), ('card', carded)):
+            encoder = BudgetJpegEncoder(min_quality=10, max_quality=95)
+            results.append(record('encode', {'image': image_size, 'variant': variant},
+                                  lambda: encoder.encode(target, MAX_IMAGE_BYTES), rounds))
+    return results
+
+
+def run(quick=False, rounds=ROUNDS):
+    """모든 단계를 측정해 결과 레코드 리스트를 반환합니다 (quick이면 글자 크기를 줄여 빠르게)."""
+    fonts = FontRegistry(FONTS_FOLDER, default_name='NanumBrush.ttf')
+    sizes = QUICK_FONT_SIZES if quick else FONT_SIZES
+    images = {size: render_stub_image('benchmark', size) for size in IMAGE_SIZES}
+    results = []
+    for stage, bench in (
+        ('wrap', lambda: bench_wrap(fonts, sizes, rounds)),
+        ('position', lambda: bench_position(fonts, images, rounds)),
+        ('draw', lambda: bench_draw(fonts, images, sizes, rounds)),
+        ('encode', lambda: bench_encode(fonts, images, rounds)),
+    ):
+        start = time.perf_counter()
+        stage_results = bench()
+        print(f"  {stage:<9} {len(stage_results):>4} cases  {time.perf_counter() - start:6.1f}s")
+        results.extend(stage_results)
+    return results
+
+
+def summarize(results):
+    """단계별 중앙값/최대값 (ms)을 출력합니다."""
+    stages = {}
+    for r in results:
+        stages.setdefault(r['stage'], []).append(r['value'])
+    for stage, values in stages.items():
+        print(f"  {stage:<9} median {statistics.median(values):8.3f} ms   max {max(values):8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='합성 단계 마이크로 벤치마크')
+    parser.add_argument('--quick', action='store_true')
+    args = parser.parse_args()
+    results = run(args.quick)
+    summarize(results)
+
+
+if __name__ == '__main__':
+    main()
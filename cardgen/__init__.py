@@ -0,0 +1,22 @@
+# 카드 생성 서버 (app.py ~ app7.py를 하나로 합친 패키지)
+# 파이프라인 이름으로 앱을 만듦 (pipelines.PIPELINES 참고)
+#   create_app('jpeg')                            # app7.py
+#   create_app('summary')                         # app6.py
+#   create_app('translate', keep_originals=True)  # app5.py
+# gunicorn (pre-fork) 실행 예:
+#   gunicorn -w 4 --preload -b 0.0.0.0:5000 'cardgen:create_app("jpeg")'
+# /jobs 진행 이벤트(SSE)는 연결마다 워커를 붙잡으므로 기본으로 꺼져 있음 (화면은 상태 조회로 진행 확인)
+# 켤 때는 스레드 워커로 실행:
+#   JOB_EVENTS=1 gunicorn -w 4 -k gthread --threads 16 --preload -b 0.0.0.0:5000 'cardgen:create_app("jpeg")'
+# openai, PIL, numpy 같은 무거운 모듈과 스레드/프로세스 풀은 처음 필요할 때 만들어지므로
+# import와 앱 생성에는 Flask를 불러오는 시간만 들고, --preload 마스터는 스레드 없이 워커를 fork함
+from cardgen.pipelines import PIPELINES, Pipeline, get_pipeline
+
+
+def create_app(pipeline='jpeg', **overrides):
+    """pipeline 이름의 Flask 앱을 만듭니다 (Flask는 이때 불러옴)."""
+    from cardgen.factory import create_app as build
+    return build(pipeline, **overrides)
+
+
+__all__ = ['PIPELINES', 'Pipeline', 'create_app', 'get_pipeline']
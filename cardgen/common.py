@@ -0,0 +1,93 @@
+# 파이프라인들이 함께 쓰는 요청 값 해석, 응답 헤더, 프롬프트, OpenAI 호출 함수
+from flask import request
+
+import profiling
+from cardgen import services, settings
+
+# fontSize가 "auto"일 때 탐색하는 글자 크기 범위 (index.html 입력 범위와 동일)
+AUTO_FONT_SIZE_RANGE = (10, 100)
+
+# 텍스트 테두리 두께 기본값과 최대값 (px)
+DEFAULT_BORDER_WIDTH = 1
+MAX_BORDER_WIDTH = 20
+
+
+# 응답에 단계별 소요 시간 헤더를 붙이는 함수 (settings.TIMING_HEADER가 False면 요청이 원할 때만)
+def add_timing_header(response, trace):
+    if settings.TIMING_HEADER or request.headers.get('X-Timing'):
+        response.headers['X-Timing'] = trace.header()
+    return response
+
+# 요청이 원하면(X-Profile 헤더나 ?profile=1) 요청 프로파일을 여는 with 문 (settings.PROFILING_ENABLED가 False면 항상 None)
+# 프로파일은 요청이 보낸 X-Request-ID(파일 이름으로 안전한 경우) 또는 새 ID로 저장
+def request_profile():
+    wanted = request.headers.get('X-Profile', '0') not in ('', '0') or request.args.get('profile') == '1'
+    request_id = profiling.safe_request_id(request.headers.get('X-Request-ID'))
+    return profiling.request_profile(settings.PROFILES_FOLDER, request_id,
+                                     enabled=settings.PROFILING_ENABLED and wanted)
+
+# 프로파일을 저장했으면 응답에 그 ID를 붙이는 함수
+def add_profile_header(response, profile):
+    if profile is not None:
+        response.headers['X-Profile-Id'] = profile.request_id
+    return response
+
+# 요청의 borderWidth 값을 0 ~ MAX_BORDER_WIDTH 사이 정수로 변환하는 함수
+def parse_border_width(value):
+    try:
+        return max(0, min(int(value), MAX_BORDER_WIDTH))
+    except (TypeError, ValueError):
+        return DEFAULT_BORDER_WIDTH
+
+# 요청에 없는 텍스트 스타일 값의 기본값 (파이프라인의 style_defaults로 일부를 바꿈)
+STYLE_DEFAULTS = {
+    'font': settings.DEFAULT_FONT,
+    'fontSize': 50,
+    'textColor': 'black',
+    'borderColor': 'white',
+    'position': 'center',
+}
+
+# 요청의 텍스트 스타일 값 (position, 색, fontSize가 "auto"면 이미지 분석/크기 맞춤 사용)
+def parse_style(data, defaults=None):
+    defaults = dict(STYLE_DEFAULTS, **(defaults or {}))
+    return {
+        'font': data.get('font', defaults['font']),
+        'fontSize': data.get('fontSize', defaults['fontSize']),
+        'textColor': data.get('textColor', defaults['textColor']),
+        'borderColor': data.get('borderColor', defaults['borderColor']),
+        'borderWidth': parse_border_width(data.get('borderWidth', DEFAULT_BORDER_WIDTH)),
+        'position': data.get('position', defaults['position']),
+    }
+
+# DALL·E에 이미지 생성을 요청하는 프롬프트 생성
+def build_prompt(title, instruction, painting_style):
+    return (
+        f"Create an artistic image in the style of {painting_style}. "
+        f"The theme is: {title}. "
+        f"Exclude all text, letters, and symbols. Follow these additional instructions: {instruction}"
+    )
+
+# 정적 폴더 아래 파일의 URL (예: static_url('results', name))
+def static_url(folder, filename):
+    return f'{settings.PUBLIC_URL}/static/{folder}/{filename}'
+
+# 모델에 한 번 묻고 답을 반환하는 함수 (같은 요청은 캐시된 응답을 재사용)
+# (batch가 True면 화면에서 기다리는 요청보다 나중에 실행)
+def ask(model, content, bypass_cache=False, batch=False):
+    from openai_scheduler import INTERACTIVE, BATCH
+    messages = [{"role": "user", "content": content}]
+    priority = BATCH if batch else INTERACTIVE
+
+    def create():
+        return services.provider().chat(model, messages, priority=priority)
+
+    return services.llm_cache().get_or_create(model, messages, create, bypass=bypass_cache)
+
+# 텍스트를 지정된 언어로 번역하는 함수
+def translate_text(text, target_language, model, bypass_cache=False):
+    return ask(model, f"Translate '{text}' to {target_language}. Just print out the results.", bypass_cache)
+
+# 메시지를 짧게 요약하는 함수
+def generate_short_message(message, model, bypass_cache=False, batch=False):
+    return ask(model, f"{message}. within 20 letters", bypass_cache, batch)
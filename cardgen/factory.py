@@ -0,0 +1,110 @@
+# Flask 앱 생성: 공통 라우트(정적 파일, 페이지, 지표/통계) + 선택한 파이프라인의 라우트
+# 앱을 만들 때는 객체나 스레드를 만들지 않고, 첫 요청 때 services.start_background()로 시작함
+import importlib
+import os
+
+from flask import Blueprint, Flask, Response, current_app, jsonify, request, send_from_directory
+
+import tracing
+from cardgen import services, settings
+from cardgen.pipelines import get_pipeline
+from output_store import apply_cache_headers
+
+# 응답에서 브라우저 스크립트가 읽을 수 있는 헤더
+EXPOSE_HEADERS = ['X-Timing', 'X-Profile-Id']
+
+common = Blueprint('common', __name__)
+
+
+def create_app(pipeline='jpeg', **overrides):
+    """pipeline 이름('translate', 'summary', 'jpeg')의 Flask 앱을 만듭니다.
+
+    overrides로 파이프라인 설정 일부(chat_model, image_size 등, pipelines.Pipeline 참고)를 바꿀 수 있습니다.
+    """
+    from flask_cors import CORS
+
+    config = get_pipeline(pipeline, **overrides)
+    app = Flask('cardgen', static_folder=None)  # /static 은 아래 serve_static 라우트에서 직접 제공
+    app.config['PIPELINE'] = config
+    CORS(app, expose_headers=EXPOSE_HEADERS)  # CORS 설정을 통해 외부 도메인에서 API에 접근 가능하도록 허용
+
+    app.register_blueprint(common)
+    module = importlib.import_module(f'cardgen.{config.module}')
+    app.register_blueprint(module.blueprint)
+    app.config['PIPELINE_FEATURES'] = list(module.FEATURES)
+    app.before_request(services.start_background)
+    return app
+
+
+# 선택한 파이프라인 이름과 추가 기능 (화면이 /jobs, /render를 쓸 수 있는지 확인)
+@common.route('/pipeline')
+def pipeline_info():
+    config = current_app.config['PIPELINE']
+    return jsonify({'name': config.name, 'features': current_app.config['PIPELINE_FEATURES']}), 200
+
+# 단계별 소요 시간 히스토그램(p50/p95/p99)과 카운터 (Prometheus 텍스트 형식)
+@common.route('/metrics')
+def metrics():
+    return Response(tracing.METRICS.prometheus(), mimetype='text/plain; version=0.0.4')
+
+# 상시 샘플러가 모은 가장 많이 실행 중인 함수 목록 (?limit=N)
+@common.route('/profile/hot')
+def profile_hot():
+    if not settings.HOT_SAMPLER_ENABLED:
+        return jsonify({'error': 'Hot frame sampler is disabled'}), 404
+    return jsonify(services.hot_sampler().hot(request.args.get('limit', 20, type=int))), 200
+
+# 상시 샘플러가 모은 전체 스택 (collapsed stack 형식, flamegraph.pl이나 speedscope로 열 수 있음)
+@common.route('/profile/hot.folded')
+def profile_hot_folded():
+    if not settings.HOT_SAMPLER_ENABLED:
+        return jsonify({'error': 'Hot frame sampler is disabled'}), 404
+    return Response(services.hot_sampler().folded(), mimetype='text/plain')
+
+# OpenAI 응답 캐시 적중/실패 통계
+@common.route('/cache/stats')
+def cache_stats():
+    return jsonify(services.llm_cache().stats()), 200
+
+# 폰트 레지스트리 상태 (등록된 폰트, 캐시 적중 횟수)
+@common.route('/font-cache/stats')
+def font_stats():
+    return jsonify(services.fonts().stats()), 200
+
+# OpenAI 호출 스케줄러 통계 (재시도, 한도 대기, 합쳐진 호출 수)
+@common.route('/openai/stats')
+def openai_stats():
+    return jsonify(services.scheduler().stats()), 200
+
+# DALL·E 이미지 다운로드 통계 (평균 TTFB, 전송 속도)
+@common.route('/download/stats')
+def download_stats():
+    return jsonify(services.downloader().stats()), 200
+
+# React 정적 파일 제공 라우트 추가 11/17
+@common.route('/react')
+def serve_react():
+    return send_from_directory(settings.REACT_FOLDER, 'index.html')
+
+@common.route('/react/<path:filename>')
+def serve_react_static(filename):
+    return send_from_directory(settings.REACT_FOLDER, filename)
+
+# 정적 파일 제공
+@common.route('/static/<path:filename>')
+def serve_static(filename):
+    # 아직 백그라운드에서 쓰는 중인 파일이면 완료될 때까지 기다림
+    services.wait_written(os.path.join(settings.STATIC_FOLDER, filename))
+    response = send_from_directory(settings.STATIC_FOLDER, filename)
+    # results/, originals/ 아래의 내용 해시 이름 이미지만 장기 캐시 허용 (다시 쓰이는 .json 메타데이터는 제외)
+    return apply_cache_headers(response, filename, ('results', 'originals'))
+
+# HTML 파일 제공
+@common.route('/')
+def serve_index():
+    return send_from_directory(settings.HTML_FOLDER, 'index.html')
+
+# 폰트 파일 제공
+@common.route('/fonts/<path:filename>')
+def serve_fonts(filename):
+    return send_from_directory(settings.FONTS_FOLDER, filename)
@@ -0,0 +1,415 @@
+# 'jpeg' 파이프라인 (app7.py): 번역 없이 요약, 300KB 이하 JPEG, 결과 캐시, 합성 프로세스 풀
+# /generate, /generate/batch, /jobs, /render와 이 파이프라인이 쓰는 객체의 통계 라우트를 제공
+import json
+import os
+import re
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+import profiling
+import tracing
+from cardgen import services, settings
+from cardgen.common import (
+    AUTO_FONT_SIZE_RANGE, add_profile_header, add_timing_header, build_prompt, generate_short_message, parse_style,
+    request_profile, static_url,
+)
+from jobs import JobQueueFull
+from output_store import atomic_write, image_key, touch_existing
+from result_cache import canonical_style, canonical_text
+from stage_executor import get_executor, run_stages
+
+blueprint = Blueprint('jpeg_pipeline', __name__)
+
+# 화면(index.html)에 알려주는 추가 기능 (/jobs 진행 이벤트, /render 재합성, /generate/batch)
+FEATURES = ('jobs', 'render', 'batch')
+
+# 원본/결과 JPEG 크기 제한
+MAX_IMAGE_BYTES = 300 * 1024
+
+# 모델별로 한 번의 요청에서 만들 수 있는 이미지 수 (dall-e-3은 n=1만 지원)
+IMAGE_MODEL_MAX_N = {"dall-e-2": 10, "dall-e-3": 1}
+
+# /generate/batch 한 번에 허용하는 항목 수, 항목별 변형 수, 전체 이미지 수
+BATCH_MAX_ITEMS = 10
+BATCH_MAX_VARIANTS = 4
+BATCH_MAX_IMAGES = 16
+
+# /render에서 허용하는 이미지 ID 형식
+IMAGE_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+
+# 이미지 파일 크기를 조정하는 함수 (max_size 이하에서 가장 높은 JPEG 품질을 탐색)
+def save_image_with_compression(image, path, max_size):
+    with tracing.stage('encode_original'):
+        result = services.jpeg_encoder().encode(image, max_size)
+        atomic_write(path, result.data)
+    tracing.count('jpeg_encodes', result.encodes)
+    print(f"Saved '{path}' with size {result.size / 1024:.2f} KB (Quality: {result.quality}, Encodes: {result.encodes})")
+    return result
+
+# 이미지 ID(원본 픽셀 내용 해시)에 해당하는 원본 이미지와 메타데이터 경로
+def original_paths(image_id):
+    return (os.path.join(settings.ORIGINALS_FOLDER, f'{image_id}.jpg'),
+            os.path.join(settings.ORIGINALS_FOLDER, f'{image_id}.json'))
+
+# 텍스트 없는 원본 이미지를 이미지 ID로 저장하고 ID를 반환하는 함수 (/render에서 재사용)
+# (인코딩은 백그라운드에서 진행되어 텍스트 합성과 동시에 처리됨)
+# 같은 원본이 이미 있거나 쓰는 중이면 다시 인코딩하지 않고 수정 시각만 갱신
+def store_original(img):
+    image_id = image_key(img)
+    original_img_path, _ = original_paths(image_id)
+    writer = services.async_writer()
+    if not touch_existing(original_img_path) and not writer.is_pending(original_img_path):
+        writer.submit(original_img_path, save_image_with_compression, img, original_img_path, MAX_IMAGE_BYTES)
+    return image_id
+
+# 저장된 원본 이미지를 불러오는 함수 (아직 인코딩 중이면 기다리고, 없으면 None)
+def load_original(image_id):
+    from PIL import Image
+    original_img_path, meta_path = original_paths(image_id)
+    if not services.async_writer().wait(original_img_path):
+        return None
+    # 다시 합성에 쓰는 원본은 수정 시각을 갱신해 정리 대상에서 빠지게 함
+    touch_existing(original_img_path)
+    touch_existing(meta_path)
+    with tracing.stage('load_original'):
+        return Image.open(original_img_path).convert('RGB')
+
+# 요약 문구를 원본과 함께 저장해 스타일만 바꿀 때 다시 사용
+def store_message(image_id, message):
+    _, meta_path = original_paths(image_id)
+    atomic_write(meta_path, json.dumps({'message': message}, ensure_ascii=False).encode('utf-8'))
+
+# DALL·E에 이미지 n개를 한 번에 요청해 PIL 이미지 리스트로 반환하는 함수
+# (응답에 포함된 이미지를 디코딩하고, URL만 있으면 그 URL에서 이미지 다운로드)
+# (batch가 True면 화면에서 기다리는 요청보다 나중에 실행)
+def create_images(prompt, pipeline, n=1, batch=False):
+    from openai_scheduler import INTERACTIVE, BATCH
+    return services.provider().images(prompt, n=n, model=pipeline.image_model, size=pipeline.image_size,
+                                      priority=BATCH if batch else INTERACTIVE)
+
+# 이미지 count개를 만드는 데 필요한 요청별 n 값 리스트 (dall-e-3처럼 n=1만 되면 [1, 1, ...])
+def split_image_count(count, image_model):
+    max_n = IMAGE_MODEL_MAX_N.get(image_model, 1)
+    return [min(max_n, count - start) for start in range(0, count, max_n)]
+
+# 같은 프롬프트로 이미지를 count개 생성하는 함수 (요청이 여러 번 필요하면 image_pool에서 동시에 요청)
+def request_images(prompt, pipeline, count):
+    counts = split_image_count(count, pipeline.image_model)
+    if len(counts) == 1:
+        return create_images(prompt, pipeline, counts[0])
+    return [img for images in services.image_pool().map(lambda n: create_images(prompt, pipeline, n), counts)
+            for img in images]
+
+# 이미지 생성 파이프라인 (요청 데이터 → 결과 정보 dict)
+# progress(stage, **data)가 주어지면 단계가 끝날 때마다 호출
+# (summarized → image_ready → composited → saved, 앞의 두 단계는 순서가 바뀔 수 있음)
+def run_generation(data, pipeline, progress=None):
+    def notify(stage, **info):
+        if progress is not None:
+            progress(stage, **info)
+
+    title = data.get('title', '제목 없음')
+    message = data.get('message', '내용 없음')
+    instruction = data.get('instruction', '')
+    style = parse_style(data, pipeline.style_defaults)  # position, fontSize가 "auto"면 이미지 분석/크기 맞춤 사용
+    bypass_cache = bool(data.get('noCache', False))  # true면 캐시를 건너뛰고 새로 요청
+    painting_style = data.get('painting_style', '선택 안함')
+    result_cache = services.result_cache()
+
+    # 결과 캐시 키: 원본 이미지를 결정하는 값 / 결과 이미지 전체를 결정하는 값 (요약 문구는 chat_model에 따라 다름)
+    original_fields = {
+        'model': pipeline.image_model,
+        'size': pipeline.image_size,
+        'title': canonical_text(title),
+        'instruction': canonical_text(instruction),
+        'painting_style': canonical_text(painting_style),
+    }
+    full_fields = dict(original_fields, chat_model=pipeline.chat_model, message=canonical_text(message),
+                       style=canonical_style(style))
+    hit, entry = (None, None) if bypass_cache else result_cache.lookup(original_fields, full_fields)
+
+    # 같은 요청이 있었으면 저장된 결과를 그대로 반환 (요약, DALL·E, 합성 모두 생략)
+    if hit == 'full':
+        result = {
+            'imageUrl': static_url('results', entry.result_name),
+            'originalUrl': static_url('originals', f'{entry.image_id}.jpg'),
+            'imageId': entry.image_id,
+            'message': entry.message,
+        }
+        notify('summarized', message=entry.message)
+        notify('image_ready', imageId=entry.image_id, originalUrl=result['originalUrl'])
+        notify('composited', **result)
+        notify('saved', imageUrl=result['imageUrl'])
+        return result
+
+    # 이미지 생성 흐름: DALL·E 생성 → 다운로드 → 원본 저장
+    # (프롬프트는 title, instruction, painting_style만 사용하므로 요약을 기다리지 않음)
+    def create_image():
+        # 이미지 값이 같은 요청의 원본이 있으면 DALL·E를 호출하지 않고 그 원본에 합성
+        img = load_original(entry.image_id) if hit == 'original' else None
+        if img is not None:
+            image_id = entry.image_id
+        else:
+            # DALL·E API를 통해 이미지 생성 (응답에 포함된 이미지를 디코딩, URL만 있으면 다운로드)
+            img = request_images(build_prompt(title, instruction, painting_style), pipeline, 1)[0]
+
+            # 기본 생성 이미지를 이미지 ID로 저장 (텍스트가 없는 원본 이미지)
+            image_id = store_original(img)
+        notify('image_ready', imageId=image_id, originalUrl=static_url('originals', f'{image_id}.jpg'))
+        return img, image_id
+
+    # 텍스트 흐름: 메시지 요약
+    def prepare_text():
+        summarized_message = generate_short_message(message, pipeline.chat_model, bypass_cache=bypass_cache)
+        print("summarized_message: " + summarized_message + "\n")
+        notify('summarized', message=summarized_message)
+        return summarized_message
+
+    # 두 흐름을 동시에 실행하고 합성 단계에서만 합류
+    results = run_stages({
+        'img': (create_image, []),
+        'text': (prepare_text, []),
+    })
+    img, image_id = results['img']
+    summarized_message = results['text']
+
+    # 요약 문구를 원본과 함께 저장해 스타일만 바꿀 때 다시 사용
+    store_message(image_id, summarized_message)
+
+    # 줄바꿈, 텍스트 그리기, JPEG 인코딩과 저장은 합성 프로세스에서 실행 (요청 스레드가 GIL을 오래 잡지 않도록)
+    result_name = compose_card(img, summarized_message, style, pipeline)
+    result = {
+        'imageUrl': static_url('results', result_name),
+        'originalUrl': static_url('originals', f'{image_id}.jpg'),
+        'imageId': image_id,
+        'message': summarized_message,
+    }
+    notify('composited', **result)
+    result_cache.put(original_fields, full_fields, image_id, result_name, summarized_message)
+
+    # 진행 상황을 받는 쪽에는 파일 쓰기가 끝난 뒤 saved를 알림
+    if progress is not None:
+        services.wait_written(os.path.join(settings.RESULTS_FOLDER, result_name))
+        notify('saved', imageUrl=result['imageUrl'])
+    return result
+
+# 요청 추적을 열고 run_generation을 실행 (비동기 작업용, 단계 시간과 전체 시간을 /metrics에 기록)
+def run_traced_generation(data, pipeline, progress=None):
+    with tracing.request_trace():
+        return run_generation(data, pipeline, progress)
+
+# 합성 작업을 프로세스 풀에 넘기고 Future를 반환 (결과는 results/<내용 해시>.jpg 파일 이름)
+# (요청 프로파일이 켜져 있으면 합성 워커도 샘플링)
+def submit_card(img, message, style, pipeline):
+    pool = services.composite_pool(pipeline.image_size)
+    return pool.submit(img, message, style, settings.RESULTS_FOLDER, MAX_IMAGE_BYTES, AUTO_FONT_SIZE_RANGE,
+                       profile=profiling.active())
+
+# 합성 작업 결과를 기다려 합성 프로세스에서 잰 단계 시간(font, wrap, draw, encode)을 기록하고 파일 이름을 반환
+def finish_card(future):
+    card = future.result()
+    for stage, seconds in card.timings.items():
+        tracing.record(stage, seconds)
+    tracing.count('jpeg_encodes', card.encodes)
+    profiling.merge(card.stacks, 'compositing')
+    return card.name
+
+# 이미지에 문구를 합성해 저장하고 결과 파일 이름을 반환하는 함수 (composite는 대기 시간을 포함한 전체 합성 시간)
+def compose_card(img, message, style, pipeline):
+    with tracing.stage('composite'):
+        return finish_card(submit_card(img, message, style, pipeline))
+
+# 여러 카드를 한 번에 생성하는 파이프라인 (요청 데이터 → 결과 목록)
+# items의 각 항목은 /generate와 같은 값을 가지며, 항목에 없는 값은 요청 최상위 값을 사용
+# 항목마다 variants개의 이미지를 만들고, 같은 문구의 요약은 한 번만 요청
+def run_batch(data, pipeline):
+    defaults = {key: value for key, value in data.items() if key not in ('items', 'variants')}
+    items = [{**defaults, **item} for item in (data.get('items') or [{}])]
+    variants = int(data.get('variants', 1))
+    if len(items) > BATCH_MAX_ITEMS:
+        raise ValueError(f"Too many items (max {BATCH_MAX_ITEMS})")
+    if not 1 <= variants <= BATCH_MAX_VARIANTS:
+        raise ValueError(f"variants must be between 1 and {BATCH_MAX_VARIANTS}")
+    if len(items) * variants > BATCH_MAX_IMAGES:
+        raise ValueError(f"Too many images (max {BATCH_MAX_IMAGES})")
+
+    # 메시지 요약: 같은 문구는 한 번만 요청 (단계 실행 스레드 풀에서 동시에 실행, OpenAI 호출은 배치 우선순위)
+    summaries = {}
+    summary_keys = []
+    for item in items:
+        key = (item.get('message', '내용 없음'), bool(item.get('noCache', False)))
+        if key not in summaries:
+            summaries[key] = get_executor().submit(generate_short_message, key[0], pipeline.chat_model,
+                                                   bypass_cache=key[1], batch=True)
+        summary_keys.append(key)
+
+    # 이미지 생성: 항목마다 variants개를 image_pool에서 동시에 요청 (동시 요청 수는 IMAGE_CONCURRENCY로 제한)
+    image_pool = services.image_pool()
+    image_futures = []
+    for item in items:
+        prompt = build_prompt(item.get('title', '제목 없음'), item.get('instruction', ''),
+                              item.get('painting_style', '선택 안함'))
+        image_futures.append([image_pool.submit(create_images, prompt, pipeline, n, True)
+                              for n in split_image_count(variants, pipeline.image_model)])
+
+    # 합성: 항목의 요약과 이미지가 준비되는 대로 프로세스 풀에 넘김
+    manifest = []
+    renders = []
+    for item, key, futures in zip(items, summary_keys, image_futures):
+        entry = {'title': item.get('title', '제목 없음'), 'variants': []}
+        manifest.append(entry)
+        try:
+            summarized_message = summaries[key].result()
+            entry['message'] = summarized_message
+            style = parse_style(item, pipeline.style_defaults)
+            for future in futures:
+                for img in future.result():
+                    image_id = store_original(img)
+                    store_message(image_id, summarized_message)
+                    render = submit_card(img, summarized_message, style, pipeline)
+                    renders.append((entry, image_id, render))
+        except Exception as e:
+            # 한 항목이 실패해도 나머지 항목 결과는 반환
+            entry['error'] = str(e)
+
+    for entry, image_id, render in renders:
+        try:
+            result_name = finish_card(render)
+        except Exception as e:
+            entry['error'] = str(e)
+            continue
+        entry['variants'].append({
+            'imageUrl': static_url('results', result_name),
+            'originalUrl': static_url('originals', f'{image_id}.jpg'),
+            'imageId': image_id,
+        })
+
+    return {
+        'items': manifest,
+        'images': sum(len(entry['variants']) for entry in manifest),
+        'summaryRequests': len(summaries),
+        'imageRequests': sum(len(futures) for futures in image_futures),
+    }
+
+@blueprint.route('/generate', methods=['POST'])
+def generate_image():
+    try:
+        # 화면에는 결과 이미지 URL과 /render에서 쓸 이미지 ID를 반환
+        with tracing.request_trace() as trace, request_profile() as profile:
+            result = run_generation(request.json, current_app.config['PIPELINE'])
+        return add_profile_header(add_timing_header(jsonify(result), trace), profile), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# 여러 카드(항목 x 변형)를 한 번에 생성하고 결과 목록(manifest)을 반환
+@blueprint.route('/generate/batch', methods=['POST'])
+def generate_batch():
+    try:
+        return jsonify(run_batch(request.json, current_app.config['PIPELINE'])), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# 비동기 작업 API: 작업을 등록하고 바로 작업 ID를 반환 (생성은 jobs 워커에서 진행)
+@blueprint.route('/jobs', methods=['POST'])
+def create_job():
+    try:
+        job = services.jobs().submit(run_traced_generation, request.json, current_app.config['PIPELINE'])
+    except JobQueueFull as e:
+        # 대기열이 가득 차면 잠시 후 다시 시도하도록 안내
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = str(settings.JOB_RETRY_AFTER)
+        return response, 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    info = {'jobId': job.id, 'statusUrl': f'/jobs/{job.id}'}
+    if settings.JOB_EVENTS_ENABLED:
+        info['eventsUrl'] = f'/jobs/{job.id}/events'
+    return jsonify(info), 202
+
+# 작업 상태 조회 (status: queued, running, done, error / 진행 중이면 progress, 완료 시 result 포함)
+@blueprint.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = services.jobs().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict()), 200
+
+# 작업 진행 상황을 server-sent events로 전달 (progress 이벤트 후 done 또는 error로 끝남)
+# 연결마다 서버 워커 하나를 작업이 끝날 때까지 쓰므로 settings.JOB_EVENTS_ENABLED일 때만 제공
+@blueprint.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    if not settings.JOB_EVENTS_ENABLED:
+        return jsonify({'error': 'Job events are disabled; poll the job status instead'}), 404
+    jobs = services.jobs()
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def stream():
+        for event in jobs.iter_events(job):
+            if event is None:
+                yield ': keep-alive\n\n'  # 연결 유지용 주석
+                continue
+            name, payload = event
+            yield f"event: {name}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    response = Response(stream(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # 프록시가 이벤트를 모아서 보내지 않도록
+    return response
+
+# 저장된 원본 이미지에 텍스트 스타일만 바꿔 다시 합성 (DALL·E 호출 없음)
+@blueprint.route('/render', methods=['POST'])
+def render_image():
+    try:
+        data = request.json
+        image_id = str(data.get('imageId', ''))
+        style = parse_style(data, current_app.config['PIPELINE'].style_defaults)
+
+        # 이미지 ID는 16진수 문자열만 허용 (경로 조작 방지)
+        if not IMAGE_ID_PATTERN.fullmatch(image_id):
+            return jsonify({'error': 'Invalid imageId'}), 400
+
+        # 원본이 아직 인코딩 중이면 완료될 때까지 기다림
+        _, meta_path = original_paths(image_id)
+        img = load_original(image_id)
+        if img is None or not os.path.exists(meta_path):
+            return jsonify({'error': 'Image not found'}), 404
+
+        # 문구를 따로 보내지 않으면 /generate 때 저장한 요약 문구 사용
+        message = data.get('message')
+        if message is None:
+            with open(meta_path, encoding='utf-8') as f:
+                message = json.load(f)['message']
+
+        result_name = compose_card(img, message, style, current_app.config['PIPELINE'])
+
+        return jsonify({
+            'imageUrl': static_url('results', result_name),
+            'imageId': image_id,
+            'message': message,
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# 결과 캐시 통계 (전체/원본 적중률, 재사용으로 아낀 파일 크기)
+@blueprint.route('/result-cache/stats')
+def result_cache_stats():
+    return jsonify(services.result_cache().stats()), 200
+
+# JPEG 저장 횟수와 저장당 인코딩 횟수 통계
+@blueprint.route('/encoder/stats')
+def encoder_stats():
+    return jsonify(services.jpeg_encoder().stats()), 200
+
+# 합성 프로세스 풀 상태 (공유 메모리로 넘긴 횟수, 빈 슬롯 수)
+@blueprint.route('/composite/stats')
+def composite_stats():
+    return jsonify(services.composite_pool(current_app.config['PIPELINE'].image_size).stats()), 200
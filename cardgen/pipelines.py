@@ -0,0 +1,58 @@
+# 생성 파이프라인 설정 (create_app에서 이름으로 고르고, 필요한 값만 바꿔 쓸 수 있음)
+
+
+class Pipeline:
+    """/generate가 문구와 이미지를 만드는 방식과 그 라우트를 가진 모듈(cardgen.<module>).
+
+    - translate: 문구를 영어로 번역해 요약한 뒤 다시 한국어로 번역 (False면 원문을 바로 요약)
+    - keep_originals: 텍스트 없는 원본 이미지도 저장해 originalUrl로 반환
+    - chat_model, image_model, image_size: 요약/번역과 DALL·E 호출에 쓰는 모델과 크기
+    - style_defaults: 요청에 없는 텍스트 스타일 값의 기본값 (common.STYLE_DEFAULTS 중 바꿀 값만)
+    """
+
+    FIELDS = ('translate', 'keep_originals', 'chat_model', 'image_model', 'image_size', 'style_defaults')
+
+    def __init__(self, name, module, description, translate=False, keep_originals=True,
+                 chat_model='gpt-4-turbo', image_model='dall-e-3', image_size='1024x1024', style_defaults=None):
+        self.name = name
+        self.module = module
+        self.description = description
+        self.translate = translate
+        self.keep_originals = keep_originals
+        self.chat_model = chat_model
+        self.image_model = image_model
+        self.image_size = image_size
+        self.style_defaults = dict(style_defaults or {})
+
+    def replace(self, **overrides):
+        """일부 값만 바꾼 새 설정을 반환합니다. 모르는 이름이면 ValueError를 발생시킵니다."""
+        unknown = sorted(set(overrides) - set(self.FIELDS))
+        if unknown:
+            raise ValueError(f"Unknown pipeline options: {', '.join(unknown)}")
+        values = {field: getattr(self, field) for field in self.FIELDS}
+        values.update(overrides)
+        return Pipeline(self.name, self.module, self.description, **values)
+
+    def __repr__(self):
+        values = ', '.join(f'{field}={getattr(self, field)!r}' for field in self.FIELDS)
+        return f'Pipeline({self.name!r}, {values})'
+
+
+PIPELINES = {
+    # app.py, app2.py, app4.py, app5.py: 번역 → 요약 → 재번역, PNG 저장
+    # (스크립트마다 다른 기본 스타일은 각 스크립트에서 style_defaults로 지정)
+    'translate': Pipeline('translate', 'png_pipeline', '번역 후 요약 (PNG 저장)',
+                          translate=True, keep_originals=False),
+    # app6.py: 번역 없이 바로 요약, 원본과 결과를 PNG로 저장
+    'summary': Pipeline('summary', 'png_pipeline', '번역 없이 요약 (PNG 저장)'),
+    # app7.py: 요약, 300KB 이하 JPEG, 결과 캐시, /render, /jobs, /generate/batch
+    'jpeg': Pipeline('jpeg', 'jpeg_pipeline', '번역 없이 요약 (300KB JPEG, 합성 프로세스 풀)'),
+}
+
+
+def get_pipeline(name, **overrides):
+    """이름에 해당하는 파이프라인 설정을 반환합니다 (overrides로 일부 값을 바꿈)."""
+    if name not in PIPELINES:
+        raise ValueError(f"Unknown pipeline '{name}' (choose from {', '.join(PIPELINES)})")
+    pipeline = PIPELINES[name]
+    return pipeline.replace(**overrides) if overrides else pipeline
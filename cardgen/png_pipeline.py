@@ -0,0 +1,101 @@
+# 'translate', 'summary' 파이프라인의 /generate (app.py ~ app6.py 방식, 결과를 PNG로 저장)
+#   translate: 제목/문구/부가 설명 번역 → 영어 요약 → 한국어로 재번역 (app4.py, app5.py)
+#   summary: 번역 없이 원문을 바로 요약 (app6.py)
+# 어느 쪽이든 요약과 DALL·E 생성은 run_stages로 동시에 진행하고 합성 단계에서만 합류
+import os
+
+from flask import Blueprint, current_app, jsonify, request
+
+import tracing
+from cardgen import services, settings
+from cardgen.common import (
+    AUTO_FONT_SIZE_RANGE, add_profile_header, add_timing_header, build_prompt, generate_short_message, parse_style,
+    request_profile, static_url, translate_text,
+)
+from output_store import save_image
+from stage_executor import run_stages
+
+blueprint = Blueprint('png_pipeline', __name__)
+
+# 화면(index.html)에 알려주는 추가 기능 (/jobs, /render, /generate/batch 없음)
+FEATURES = ()
+
+
+# 생성에 필요한 단계 (이름 → (함수, 의존 단계 목록)), 'message'와 'img' 단계의 결과를 사용
+def generation_stages(pipeline, title, message, instruction, painting_style, bypass_cache=False):
+    model = pipeline.chat_model
+
+    def create_image(theme, extra):
+        prompt = build_prompt(theme, extra, painting_style)
+        return services.provider().images(prompt, n=1, model=pipeline.image_model, size=pipeline.image_size)[0]
+
+    if not pipeline.translate:
+        return {
+            'message': (lambda: generate_short_message(message, model, bypass_cache), []),
+            'img': (lambda: create_image(title, instruction), []),
+        }
+
+    # title, message, instruction 번역은 서로 독립적이므로 동시에 시작하고,
+    # DALL·E 프롬프트는 title, instruction 번역만 필요하므로 요약을 기다리지 않음
+    def translate(text, language):
+        return lambda: translate_text(text, language, model, bypass_cache)
+
+    return {
+        'title': (translate(title, "English"), []),
+        'translated_message': (translate(message, "English"), []),
+        'instruction': (translate(instruction, "English"), []),
+        'summary': (lambda translated: generate_short_message(translated, model, bypass_cache),
+                    ['translated_message']),
+        'message': (lambda summary: translate_text(summary, "Korean", model, bypass_cache), ['summary']),
+        'img': (create_image, ['title', 'instruction']),
+    }
+
+# 이미지에 문구를 테두리와 함께 그리는 함수 (줄바꿈, 위치/색 자동 선택은 compositing.py와 같음)
+def draw_message(img, message, style):
+    from compositing import draw_text_with_border, prepare_wrapped_text
+    border_width = style['borderWidth']
+    font, block = prepare_wrapped_text(services.fonts(), message, style['font'], style['fontSize'],
+                                       img.width, img.height, border_width, AUTO_FONT_SIZE_RANGE)
+    draw_text_with_border(img, block, font, style['position'], style['textColor'], style['borderColor'], border_width)
+
+# 생성 파이프라인 (요청 데이터 → 결과 정보 dict)
+def run_generation(data, pipeline):
+    title = data.get('title', '제목 없음')
+    message = data.get('message', '내용 없음')
+    instruction = data.get('instruction', '')
+    style = parse_style(data, pipeline.style_defaults)
+    bypass_cache = bool(data.get('noCache', False))  # true면 캐시를 건너뛰고 새로 요청
+    painting_style = data.get('painting_style', '선택 안함')
+
+    results = run_stages(generation_stages(pipeline, title, message, instruction, painting_style, bypass_cache))
+    result_message = results['message']
+    img = results['img']
+    print("result_message: " + result_message + "\n")
+
+    # 기본 생성 이미지를 저장 (텍스트가 없는 원본 이미지)
+    result = {}
+    if pipeline.keep_originals:
+        with tracing.stage('encode_original'):
+            result['originalUrl'] = static_url('originals', save_image(img, settings.ORIGINALS_FOLDER, 'PNG'))
+
+    # 텍스트가 추가된 이미지를 로컬에 저장 (최종 이미지)
+    with tracing.stage('composite'):
+        draw_message(img, result_message, style)
+    with tracing.stage('encode'):
+        result_name = save_image(img, settings.RESULTS_FOLDER, 'PNG')
+    print(f"Image saved at: {os.path.join(settings.RESULTS_FOLDER, result_name)}")
+
+    result['imageUrl'] = static_url('results', result_name)
+    return result
+
+@blueprint.route('/generate', methods=['POST'])
+def generate_image():
+    try:
+        # 단계 시간(번역/요약, DALL·E, 합성, 저장)과 전체 시간을 /metrics에 기록 (요청하면 프로파일도 저장)
+        with tracing.request_trace() as trace, request_profile() as profile:
+            result = run_generation(request.json, current_app.config['PIPELINE'])
+        return add_profile_header(add_timing_header(jsonify(result), trace), profile), 200
+
+    except Exception as e:
+        print(f"Error generating image: {e}")
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,185 @@
+# 요청들이 함께 쓰는 객체 (OpenAI 백엔드, 캐시, 폰트, 인코더, 스레드/프로세스 풀)
+# 모두 처음 사용할 때 만들고, 무거운 모듈(openai, PIL, numpy, requests)도 그때 불러옴
+# → 앱을 import하는 데는 Flask만 필요하고, gunicorn 마스터 프로세스는 스레드나 풀을 만들지 않음
+import concurrent.futures
+import os
+import threading
+
+from cardgen import settings
+
+_instances = {}
+_lock = threading.RLock()  # 만드는 중에 다른 객체를 가져올 수 있으므로 재진입 가능
+_started = False
+
+
+def _get(name, build):
+    with _lock:
+        if name not in _instances:
+            _instances[name] = build()
+        return _instances[name]
+
+
+def existing(name):
+    """name 객체가 이미 만들어졌으면 반환하고, 아니면 None을 반환합니다 (만들지 않음)."""
+    with _lock:
+        return _instances.get(name)
+
+
+# OpenAI 호출 스케줄러 (모델별 속도 한도, 429/5xx 재시도, 같은 요청 합치기)
+def scheduler():
+    def build():
+        from openai_scheduler import OpenAIScheduler
+        return OpenAIScheduler(limits=settings.OPENAI_RATE_LIMITS)
+    return _get('scheduler', build)
+
+
+# DALL·E 이미지 다운로드 (keep-alive 연결 재사용, 타임아웃/재시도, 받는 동안 바로 디코딩)
+def downloader():
+    def build():
+        from http_session import ImageDownloader
+        return ImageDownloader()
+    return _get('downloader', build)
+
+
+# 요약/번역과 이미지 생성을 맡는 백엔드 (OPENAI_PROVIDER=stub이면 OpenAI 없이 로컬 스텁으로 동작, providers.py 참고)
+def provider():
+    def build():
+        from providers import create_provider
+        return create_provider(scheduler=scheduler(), downloader=downloader(),
+                               response_format=settings.IMAGE_RESPONSE_FORMAT)
+    return _get('provider', build)
+
+
+# OpenAI 응답 캐시
+def llm_cache():
+    def build():
+        from llm_cache import ResponseCache
+        return ResponseCache(max_entries=settings.LLM_CACHE_ENTRIES, ttl=settings.LLM_CACHE_TTL,
+                             db_path=settings.LLM_CACHE_DB)
+    return _get('llm_cache', build)
+
+
+# 폰트 레지스트리 (fonts 폴더의 폰트를 처음 사용할 때 확인하고 크기별 폰트 객체를 재사용)
+def fonts():
+    def build():
+        from font_registry import FontRegistry
+        return FontRegistry(settings.FONTS_FOLDER, default_name=settings.DEFAULT_FONT)
+    return _get('fonts', build)
+
+
+# JPEG 저장 인코더 (직전 저장 품질을 다음 탐색의 시작점으로 사용)
+def jpeg_encoder():
+    def build():
+        from jpeg_encoder import BudgetJpegEncoder
+        return BudgetJpegEncoder(min_quality=10, max_quality=95)
+    return _get('jpeg_encoder', build)
+
+
+# 원본/결과 JPEG 인코딩과 디스크 쓰기를 요청 스레드 밖에서 처리하는 워커
+def async_writer():
+    def build():
+        from output_store import AsyncWriter
+        return AsyncWriter(max_workers=settings.WRITER_WORKERS)
+    return _get('async_writer', build)
+
+
+def wait_written(path):
+    """path가 아직 백그라운드에서 쓰는 중이면 끝날 때까지 기다립니다 (쓰기 워커가 없으면 바로 반환)."""
+    writer = existing('async_writer')
+    if writer is not None:
+        writer.wait(path)
+
+
+# 비동기 작업(/jobs) 실행 워커
+def jobs():
+    def build():
+        from jobs import JobManager
+        return JobManager(max_workers=settings.JOB_WORKERS, max_pending=settings.JOB_MAX_PENDING)
+    return _get('jobs', build)
+
+
+# DALL·E 요청용 스레드 풀 (배치 요청 전체가 공유, 동시 요청 수는 IMAGE_CONCURRENCY로 제한)
+def image_pool():
+    return _get('image_pool', lambda: concurrent.futures.ThreadPoolExecutor(
+        max_workers=settings.IMAGE_CONCURRENCY, thread_name_prefix='dalle'))
+
+
+# 합성용 프로세스 풀 (워커마다 폰트 레지스트리와 JPEG 인코더를 계속 유지)
+# 공유 메모리 슬롯은 처음 호출할 때의 image_size('1024x1024', 파이프라인의 DALL·E 이미지 크기)에 맞춤
+def composite_pool(image_size='1024x1024'):
+    def build():
+        from compositing_pool import CompositingPool
+        from providers import parse_size
+        return CompositingPool(settings.FONTS_FOLDER, workers=settings.COMPOSITE_WORKERS,
+                               default_font=settings.DEFAULT_FONT, image_size=parse_size(image_size),
+                               max_shared_bytes=settings.COMPOSITE_SHARED_MAX_BYTES)
+    return _get('composite_pool', build)
+
+
+# /generate 결과 캐시 (아직 쓰는 중인 파일도 있는 것으로 봄)
+def result_cache():
+    def build():
+        from result_cache import ResultCache
+        return ResultCache(settings.ORIGINALS_FOLDER, settings.RESULTS_FOLDER,
+                           max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+                           store_results=settings.RESULT_CACHE_STORE_RESULTS, pending=async_writer().is_pending)
+    return _get('result_cache', build)
+
+
+# 상시 샘플러 (만들 때 바로 시작)
+def hot_sampler():
+    def build():
+        import profiling
+        sampler = profiling.HotFrameSampler()
+        sampler.start()
+        return sampler
+    return _get('hot_sampler', build)
+
+
+# 오래된 결과 파일 정리 스레드 (folders 목록으로 한 번만 시작)
+def janitor(folders):
+    def build():
+        from output_store import OutputJanitor
+        worker = OutputJanitor(folders, max_age=settings.OUTPUT_MAX_AGE, max_bytes=settings.OUTPUT_MAX_BYTES)
+        worker.start()
+        return worker
+    return _get('janitor', build)
+
+
+def preload():
+    """요청 처리에 쓰는 무거운 모듈을 미리 불러옵니다 (객체나 스레드는 만들지 않음).
+
+    gunicorn --preload 마스터에서 호출하면(gunicorn.conf.py의 on_starting 등) 워커들이 fork로
+    이미 불러온 모듈을 함께 쓰므로 워커마다 첫 요청에서 import하는 시간이 없어집니다.
+    """
+    import compositing_pool  # noqa: F401  (PIL, numpy)
+    import jobs  # noqa: F401
+    import jpeg_encoder  # noqa: F401
+    import llm_cache  # noqa: F401
+    import providers  # noqa: F401  (openai, aiohttp, requests)
+    import result_cache  # noqa: F401
+
+
+def start_background():
+    """프로세스에서 처음 요청을 받기 전에 한 번 폴더를 만들고 백그라운드 스레드를 시작합니다.
+
+    gunicorn --preload 마스터에서 시작한 스레드는 fork한 워커에 복사되지 않으므로
+    import나 앱 생성 때가 아니라 워커가 첫 요청을 받을 때 호출합니다.
+    """
+    global _started
+    if _started:
+        return
+    with _lock:
+        if _started:
+            return
+        for folder in (settings.STATIC_FOLDER, settings.ORIGINALS_FOLDER, settings.RESULTS_FOLDER):
+            os.makedirs(folder, exist_ok=True)
+
+        # 오래된 결과 파일 정리 (하루 지난 파일 삭제, 전체 500MB 초과 시 오래된 순으로 삭제)
+        janitor([settings.ORIGINALS_FOLDER, settings.RESULTS_FOLDER])
+        if settings.HOT_SAMPLER_ENABLED:
+            hot_sampler()
+
+        if not os.path.exists(settings.REACT_FOLDER):  # React 폴더가 없는 경우 경고 출력 11/17
+            print("⚠️ React build 폴더가 없습니다. React 빌드 파일을 static/react에 배치하세요.")
+        _started = True
@@ -0,0 +1,69 @@
+# 서버 전체에서 쓰는 경로와 설정값 (다른 모듈을 불러오지 않으므로 import 비용이 없음)
+import json
+import os
+
+# 정적 파일, HTML 파일, 폰트 경로 설정
+STATIC_FOLDER = os.path.join(os.getcwd(), 'static')
+HTML_FOLDER = os.path.join(STATIC_FOLDER, 'html')
+REACT_FOLDER = os.path.join(STATIC_FOLDER, 'react')  # React 빌드 파일 경로 11/17
+ORIGINALS_FOLDER = os.path.join(STATIC_FOLDER, 'originals')  # 텍스트 없는 원본 이미지
+RESULTS_FOLDER = os.path.join(STATIC_FOLDER, 'results')  # 텍스트가 합성된 결과 이미지 (내용 해시별)
+FONTS_FOLDER = os.path.join(os.getcwd(), 'fonts')
+PROFILES_FOLDER = os.path.join(os.getcwd(), 'profiles')  # 요청 프로파일(<요청 ID>.folded) 저장 위치
+DEFAULT_FONT = 'NanumBrush.ttf'
+
+# 결과 URL 앞부분
+PUBLIC_URL = 'http://localhost:5000'
+
+# OpenAI 응답 캐시 설정 (LLM_CACHE_DB를 지정하면 SQLite 파일에도 저장)
+LLM_CACHE_DB = None  # 예: os.path.join(os.getcwd(), 'cache', 'llm_cache.sqlite3')
+LLM_CACHE_ENTRIES = 1024
+LLM_CACHE_TTL = 24 * 60 * 60
+
+# DALL·E 응답 형식 ("b64_json"이면 응답 안의 이미지를 바로 디코딩, "url"이면 URL에서 다시 내려받음)
+IMAGE_RESPONSE_FORMAT = "b64_json"
+
+# 오래된 결과 파일 정리 (하루 지난 파일 삭제, 전체 500MB 초과 시 오래된 순으로 삭제)
+OUTPUT_MAX_AGE = 24 * 60 * 60
+OUTPUT_MAX_BYTES = 500 * 1024 * 1024
+
+# 원본/결과 JPEG 인코딩과 디스크 쓰기를 요청 스레드 밖에서 처리하는 워커 수
+WRITER_WORKERS = 4
+
+# 비동기 작업(/jobs) 실행 워커 수와 대기열 길이 (가득 차면 503 + Retry-After 응답)
+JOB_WORKERS = 4
+JOB_MAX_PENDING = 16
+JOB_RETRY_AFTER = 5  # 초
+
+# 작업 진행 상황을 server-sent events(/jobs/<id>/events)로도 보낼지 여부 (환경 변수 JOB_EVENTS=1)
+# 스트림 하나가 작업이 끝날 때까지 서버 워커 하나를 붙잡으므로 sync 워커(gunicorn 기본값)에서는 끄고,
+# gthread/비동기 워커(예: gunicorn -k gthread --threads 16)에서만 켬. 꺼져 있으면 화면은 GET /jobs/<id>를 조회
+JOB_EVENTS_ENABLED = os.environ.get('JOB_EVENTS') == '1'
+
+# DALL·E 동시 요청 수 제한 (배치 요청 전체가 공유하는 스레드 풀)
+IMAGE_CONCURRENCY = 4
+
+# 모델별 (분당 요청 수, 분당 토큰 수) 한도 덮어쓰기 (openai_scheduler.DEFAULT_LIMITS 참고)
+# 환경 변수 OPENAI_RATE_LIMITS에 JSON으로 지정 (예: '{"dall-e-3": [100, null]}')
+OPENAI_RATE_LIMITS = json.loads(os.environ.get('OPENAI_RATE_LIMITS') or '{}')
+
+# 텍스트 합성/인코딩 프로세스 수 (프로세스 풀은 처음 합성 요청 때 생성, 픽셀은 공유 메모리로 전달)
+COMPOSITE_WORKERS = os.cpu_count() or 2
+COMPOSITE_SHARED_MAX_BYTES = 32 * 1024 * 1024  # 픽셀 전달용 공유 메모리 전체 크기 한도 (/dev/shm 사용)
+
+# /generate 결과 캐시 (같은 요청이면 저장된 결과를, 이미지 값만 같으면 저장된 원본을 재사용)
+# 색인된 파일이 RESULT_CACHE_MAX_BYTES를 넘으면 오래 쓰이지 않은 항목의 파일부터 삭제
+# RESULT_CACHE_STORE_RESULTS가 False면 원본만 기록 (항상 합성은 다시 하고 DALL·E 호출만 생략)
+RESULT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+RESULT_CACHE_STORE_RESULTS = True
+
+# True면 모든 /generate 응답에 단계별 소요 시간(X-Timing 헤더)을 붙임 (환경 변수 TIMING_HEADER=1)
+# (False여도 요청에 X-Timing 헤더가 있으면 그 요청에는 붙임)
+TIMING_HEADER = os.environ.get('TIMING_HEADER') == '1'
+
+# 요청별 프로파일 허용 여부 (환경 변수 PROFILING_ENABLED=1)
+# True면 X-Profile 헤더나 ?profile=1이 있는 /generate 요청을 샘플링해 PROFILES_FOLDER에 저장
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED') == '1'
+
+# 모든 스레드를 낮은 빈도로 샘플링해 가장 많이 실행 중인 함수를 집계 (/profile/hot, 첫 요청 때 시작)
+HOT_SAMPLER_ENABLED = True
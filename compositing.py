@@ -0,0 +1,191 @@
+# 생성된 이미지에 요약 문구를 합성하는 함수들 (요청 스레드와 배치용 프로세스 풀에서 함께 사용)
+import multiprocessing
+import multiprocessing.connection
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+
+from PIL import Image, ImageDraw
+
+import profiling
+from font_registry import FontRegistry
+from jpeg_encoder import BudgetJpegEncoder
+from output_store import image_key, atomic_write, touch_existing
+from text_layout import fit_font_size, layout_text, LINE_SPACING
+from text_placement import pick_text_placement
+
+
+# 텍스트 위치를 계산하는 함수 (줄바꿈 결과의 폭/높이를 그대로 사용, padding은 테두리 두께)
+def calculate_text_position(image, position_hint, block, padding=0):
+    text_width = block.width + 2 * padding
+    text_height = block.height + 2 * padding
+
+    # 위치에 따라 x, y 좌표 계산
+    if position_hint == 'top left':
+        x, y = 10, 10
+    elif position_hint == 'top right':
+        x, y = image.width - text_width - 10, 10
+    elif position_hint == 'bottom right':
+        x, y = image.width - text_width - 10, image.height - text_height - 10
+    elif position_hint == 'bottom left':
+        x, y = 10, image.height - text_height - 10
+    else:
+        x = (image.width - text_width) / 2
+        y = (image.height - text_height) / 2
+
+    # 텍스트가 이미지 밖으로 나가지 않도록 조정
+    return max(0, min(x, image.width - text_width)), max(0, min(y, image.height - text_height))
+
+# 폰트를 불러와 텍스트를 이미지 크기에 맞게 줄바꿈하는 함수
+# font_size가 "auto"면 이미지 안(여백 10px, 테두리 두께 제외)에 들어가는 가장 큰 크기를 auto_range 안에서 찾음
+def prepare_wrapped_text(fonts, message, font_name, font_size, image_width, image_height, border_width=0,
+                         auto_range=(10, 100)):
+    if font_size == 'auto':
+        margin = 20 + 2 * border_width
+        return fit_font_size(fonts, font_name, message, image_width - margin, image_height - margin,
+                             min_size=auto_range[0], max_size=auto_range[1])
+
+    font = fonts.get(font_name, font_size)
+    return font, layout_text(message, font, image_width - 20)
+
+# 줄바꿈된 텍스트를 테두리와 함께 이미지에 그리는 함수
+# (Pillow의 stroke 기능으로 테두리와 글자를 한 번에 그리므로 테두리 두께와 관계없이 한 번만 래스터화)
+def draw_text_with_border(image, block, font, position, text_color, border_color, border_width=1):
+    # 텍스트 위치 계산 (테두리가 이미지 밖으로 나가지 않도록 두께만큼 여유를 둠)
+    x, y = calculate_text_position(image, position, block, padding=border_width)
+
+    # 위치나 색상이 "auto"면 이미지 영역 분석으로 대비가 크고 복잡하지 않은 곳과 색을 고름
+    if 'auto' in (position, text_color, border_color):
+        placement = pick_text_placement(image, block.width + 2 * border_width,
+                                        block.height + 2 * border_width, position)
+        if position == 'auto':
+            x, y = placement.x, placement.y
+        if text_color == 'auto':
+            text_color = placement.text_color
+        if border_color == 'auto':
+            border_color = placement.border_color
+
+    draw = ImageDraw.Draw(image)
+
+    # 테두리와 텍스트 그리기 (stroke가 줄 간격을 넓히지 않도록 spacing 보정)
+    draw.text(
+        (x + border_width, y + border_width), block.text, font=font, fill=text_color,
+        stroke_width=border_width, stroke_fill=border_color,
+        spacing=LINE_SPACING - 2 * border_width,
+    )
+
+
+# 아래는 프로세스 풀 워커에서 실행되는 부분 (워커마다 폰트 레지스트리와 인코더를 하나씩 가짐)
+_worker_fonts = None
+_worker_encoder = None
+_worker_shared = None  # 부모 프로세스가 만든 공유 메모리 (compositing_pool.CompositingPool)
+
+
+def _exit_with_parent(sentinel):
+    # 서버 프로세스가 정리 없이 종료되면(SIGKILL 등) multiprocessing이 넘겨준 부모 sentinel이 읽을 수 있게 되므로
+    # 그때 워커도 종료 (기다리기만 하고 주기적으로 확인하지는 않음)
+    multiprocessing.connection.wait([sentinel])
+    os._exit(0)
+
+
+def init_worker(fonts_folder, default_name='NanumBrush.ttf', min_quality=10, max_quality=95,
+                shared_name=None, warm_font_size=None):
+    """ProcessPoolExecutor의 initializer. 워커 프로세스에서 한 번 폰트 목록을 읽고 인코더를 만듭니다.
+
+    shared_name이 있으면 그 공유 메모리에 연결하고, warm_font_size가 있으면 모든 폰트를 그 크기로
+    미리 열어 첫 요청이 폰트 파싱 비용을 내지 않도록 합니다.
+    """
+    global _worker_fonts, _worker_encoder, _worker_shared
+    parent = multiprocessing.parent_process()
+    if parent is not None:
+        threading.Thread(target=_exit_with_parent, args=(parent.sentinel,), daemon=True).start()
+    _worker_fonts = FontRegistry(fonts_folder, default_name=default_name)
+    _worker_encoder = BudgetJpegEncoder(min_quality=min_quality, max_quality=max_quality)
+    if shared_name is not None:
+        _worker_shared = shared_memory.SharedMemory(name=shared_name)
+    if warm_font_size is not None:
+        for name in _worker_fonts.names():
+            _worker_fonts.get(name, warm_font_size)
+
+
+class CardResult:
+    """합성 결과: 저장한 파일 이름, 단계별 소요 시간(font, wrap, draw, encode 초), JPEG 인코딩 횟수,
+    프로파일을 요청했으면 합성하는 동안 샘플링한 스택(Counter)."""
+
+    def __init__(self, name, timings, encodes, stacks=None):
+        self.name = name
+        self.timings = timings
+        self.encodes = encodes
+        self.stacks = stacks
+
+
+def _render_and_save(image, message, style, results_folder, max_size, auto_range, profile=False):
+    if not profile:
+        return _render(image, message, style, results_folder, max_size, auto_range)
+    # 요청 프로파일이 켜진 요청이면 이 워커에서 합성하는 동안 직접 샘플링해 스택을 함께 돌려줌
+    session = profiling.ProfileSession()
+    session.add_thread(threading.get_ident())
+    session.start()
+    try:
+        card = _render(image, message, style, results_folder, max_size, auto_range)
+    finally:
+        session.stop()
+    card.stacks = session.stacks
+    return card
+
+
+def _render(image, message, style, results_folder, max_size, auto_range):
+    border_width = style['borderWidth']
+    font_seconds = _worker_fonts.load_seconds
+    start = time.perf_counter()
+    font, block = prepare_wrapped_text(_worker_fonts, message, style['font'], style['fontSize'],
+                                       image.width, image.height, border_width, auto_range)
+    wrapped = time.perf_counter()
+    draw_text_with_border(image, block, font, style['position'], style['textColor'], style['borderColor'], border_width)
+    drawn = time.perf_counter()
+
+    name = f'{image_key(image)}.jpg'
+    path = os.path.join(results_folder, name)
+    encodes = 0
+    if not touch_existing(path):  # 같은 결과가 이미 있으면 다시 인코딩하지 않고 수정 시각만 갱신
+        result = _worker_encoder.encode(image, max_size)
+        encodes = result.encodes
+        atomic_write(path, result.data)
+
+    # 줄바꿈 시간에는 폰트 파일을 여는 시간이 섞여 있으므로 따로 떼어 기록
+    font_seconds = _worker_fonts.load_seconds - font_seconds
+    timings = {
+        'font': font_seconds,
+        'wrap': wrapped - start - font_seconds,
+        'draw': drawn - wrapped,
+        'encode': time.perf_counter() - drawn,
+    }
+    return CardResult(name, timings, encodes)
+
+
+def render_card(image_data, size, mode, message, style, results_folder, max_size, auto_range=(10, 100),
+                profile=False):
+    """워커에서 원본 픽셀(image_data)에 문구를 합성하고 results_folder/<내용 해시>.jpg로 저장합니다.
+
+    style은 font, fontSize, textColor, borderColor, borderWidth, position 값을 가진 dict이며,
+    저장한 파일 이름과 단계별 소요 시간을 CardResult로 반환합니다. profile이 True면 합성하는 동안
+    샘플링한 스택도 함께 반환합니다.
+    """
+    image = Image.frombytes(mode, size, image_data)
+    return _render_and_save(image, message, style, results_folder, max_size, auto_range, profile)
+
+
+def render_shared(offset, size, mode, message, style, results_folder, max_size, auto_range=(10, 100),
+                  profile=False):
+    """render_card와 같지만 픽셀을 인자로 받지 않고 공유 메모리의 offset 위치에서 읽습니다.
+
+    픽셀은 Pillow 이미지로 한 번 복사되므로, 이 함수가 반환되면 부모는 그 영역을 다시 써도 됩니다.
+    """
+    length = size[0] * size[1] * len(mode)
+    view = _worker_shared.buf[offset:offset + length]
+    try:
+        image = Image.frombytes(mode, size, view)
+    finally:
+        view.release()
+    return _render_and_save(image, message, style, results_folder, max_size, auto_range, profile)
@@ -0,0 +1,198 @@
+# 텍스트 합성과 JPEG 인코딩을 별도 프로세스에서 실행하는 풀 (요청 스레드가 GIL을 잡고 있지 않도록)
+# 디코딩된 픽셀은 피클로 보내지 않고 공유 메모리 슬롯에 복사해 넘김
+import atexit
+import concurrent.futures
+import multiprocessing
+import os
+import queue
+import threading
+from multiprocessing import shared_memory
+
+import compositing
+
+# 공유 메모리로 넘길 수 있는 이미지 모드 (픽셀당 바이트 수 = 모드 글자 수)
+SHARED_MODES = ('RGB', 'RGBA', 'L')
+
+# 슬롯 크기를 정할 이미지 크기 (파이프라인이 요청하는 DALL·E 이미지 크기, RGB 3바이트/픽셀로 계산)
+DEFAULT_IMAGE_SIZE = (1024, 1024)
+
+# 공유 메모리 전체 크기 한도 (Docker 기본 /dev/shm이 64MB이므로 그 절반, 넘는 슬롯은 만들지 않음)
+MAX_SHARED_BYTES = 32 * 1024 * 1024
+
+# 워커 프로세스 시작 방식: fork는 서버의 listen 소켓, 스레드, 락 상태까지 물려받으므로
+# forkserver로 깨끗한 프로세스에서 워커를 만듦 (서버가 정리 없이 종료되어도 포트를 붙잡지 않음)
+MP_START_METHOD = 'forkserver'
+
+# 워커당 슬롯 수 (워커가 합성하는 동안 다음 이미지를 미리 복사해 둘 수 있도록 2개)
+SLOTS_PER_WORKER = 2
+
+
+class CompositingPool:
+    """compositing.render_card를 실행하는 ProcessPoolExecutor와 픽셀 전달용 공유 메모리.
+
+    - 시작할 때 slots x slot_bytes 크기의 공유 메모리를 한 번 만들고, 워커는 initializer에서 연결합니다.
+      slot_bytes는 image_size의 RGB 이미지 크기, 전체 크기는 max_shared_bytes 이하입니다.
+      요청마다 공유 메모리를 만들고 지우는 비용 없이 빈 슬롯에 픽셀을 복사하고 슬롯 위치만 넘깁니다.
+    - 빈 슬롯이 없으면 submit이 기다리므로 합성 대기열이 메모리를 무한히 쓰지 않습니다.
+    - 슬롯에 맞지 않는 이미지(더 큰 이미지, RGBA, 팔레트 모드 등)는 픽셀을 피클로 넘깁니다.
+    - 워커 프로세스는 폰트 레지스트리와 JPEG 인코더를 계속 유지하므로 폰트 캐시가 요청 간에 재사용됩니다.
+    - 워커는 MP_START_METHOD(forkserver)로 만들므로 서버의 소켓이나 스레드를 물려받지 않습니다.
+    - 워커가 비정상 종료되어 풀이 깨지면(BrokenProcessPool) 같은 공유 메모리로 풀을 다시 만들고 작업을 한 번 재시도합니다.
+    """
+
+    def __init__(self, fonts_folder, workers=None, default_font='NanumBrush.ttf', warm_font_size=50,
+                 image_size=DEFAULT_IMAGE_SIZE, slots=None, slot_bytes=None, max_shared_bytes=MAX_SHARED_BYTES,
+                 min_quality=10, max_quality=95):
+        self.workers = workers or os.cpu_count() or 2
+        self.slot_bytes = slot_bytes or image_size[0] * image_size[1] * 3
+        self.slots = min(slots or self.workers * SLOTS_PER_WORKER, max_shared_bytes // self.slot_bytes)
+        # 한도 안에 슬롯이 하나도 들어가지 않으면 공유 메모리 없이 모두 피클로 넘김
+        self._shared = None
+        if self.slots:
+            self._shared = shared_memory.SharedMemory(create=True, size=self.slots * self.slot_bytes)
+        self._free = queue.Queue()
+        for slot in range(self.slots):
+            self._free.put(slot)
+        self._initargs = (fonts_folder, default_font, min_quality, max_quality,
+                          self._shared.name if self._shared is not None else None, warm_font_size)
+        self._executor = self._new_executor()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.shared_submits = 0
+        self.pickled_submits = 0
+        self.slot_waits = 0
+        self.restarts = 0
+        self.retries = 0
+        atexit.register(self.shutdown)
+
+    def _new_executor(self):
+        context = multiprocessing.get_context(MP_START_METHOD)
+        if MP_START_METHOD == 'forkserver':
+            # forkserver가 합성 모듈(PIL, numpy)을 한 번 불러 두고 워커는 거기서 fork하므로 워커마다 import하지 않음
+            context.set_forkserver_preload(['compositing'])
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=compositing.init_worker,
+            initargs=self._initargs,
+        )
+
+    def _restart(self, broken):
+        """broken 풀을 새 풀로 바꿉니다 (다른 작업이 이미 바꿨으면 그대로 두고 현재 풀을 반환)."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('CompositingPool is shut down')
+            if self._executor is broken:
+                self._executor = self._new_executor()
+                self.restarts += 1
+                print(f"⚠️ 합성 워커 풀이 깨져 다시 만들었습니다 (restarts={self.restarts})")
+            executor = self._executor
+        broken.shutdown(wait=False, cancel_futures=True)
+        return executor
+
+    def _run(self, fn, args, release=None):
+        # 워커가 죽어 BrokenProcessPool로 끝나면 풀을 다시 만들고 한 번 재시도한 결과를 넘겨주는 Future
+        # (release는 재시도까지 모두 끝난 뒤 호출하므로 그동안 슬롯의 픽셀이 유지됨)
+        outer = concurrent.futures.Future()
+        outer.set_running_or_notify_cancel()
+
+        def finish(result=None, error=None):
+            if release is not None:
+                release()
+            if error is not None:
+                outer.set_exception(error)
+            else:
+                outer.set_result(result)
+
+        def attempt(retries_left):
+            executor = self._executor
+            try:
+                try:
+                    future = executor.submit(fn, *args)
+                except concurrent.futures.process.BrokenProcessPool:
+                    future = self._restart(executor).submit(fn, *args)
+            except BaseException as e:
+                finish(error=e)
+                return
+
+            def done(future):
+                error = future.exception()
+                if isinstance(error, concurrent.futures.process.BrokenProcessPool) and retries_left:
+                    try:
+                        self._restart(executor)
+                    except BaseException as e:
+                        finish(error=e)
+                        return
+                    with self._lock:
+                        self.retries += 1
+                    attempt(retries_left - 1)
+                elif error is not None:
+                    finish(error=error)
+                else:
+                    finish(future.result())
+
+            future.add_done_callback(done)
+
+        try:
+            attempt(1)
+        except BaseException:
+            if release is not None:
+                release()
+            raise
+        return outer
+
+    def submit(self, image, message, style, results_folder, max_size, auto_range=(10, 100), profile=False):
+        """image에 문구를 합성해 results_folder에 저장하는 작업을 넘기고, compositing.CardResult를 돌려줄 Future를 반환합니다.
+
+        profile이 True면 워커가 합성하는 동안 자기 스택을 샘플링해 CardResult.stacks로 돌려줍니다.
+        """
+        length = image.width * image.height * len(image.mode)
+        if self._shared is None or image.mode not in SHARED_MODES or length > self.slot_bytes:
+            with self._lock:
+                self.pickled_submits += 1
+            return self._run(compositing.render_card, (image.tobytes(), image.size, image.mode,
+                                                       message, style, results_folder, max_size, auto_range, profile))
+
+        try:
+            slot = self._free.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self.slot_waits += 1
+            slot = self._free.get()
+        offset = slot * self.slot_bytes
+        try:
+            self._shared.buf[offset:offset + length] = image.tobytes()
+        except BaseException:
+            self._free.put(slot)
+            raise
+        # 워커가 픽셀을 복사해 간 뒤(작업과 재시도가 끝난 뒤) 슬롯을 돌려놓음
+        future = self._run(compositing.render_shared, (offset, image.size, image.mode, message, style,
+                                                       results_folder, max_size, auto_range, profile),
+                           release=lambda: self._free.put(slot))
+        with self._lock:
+            self.shared_submits += 1
+        return future
+
+    def shutdown(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._shared is not None:
+            self._shared.close()
+            self._shared.unlink()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'slots': self.slots,
+                'slot_bytes': self.slot_bytes,
+                'free_slots': self._free.qsize(),
+                'shared_submits': self.shared_submits,
+                'pickled_submits': self.pickled_submits,
+                'slot_waits': self.slot_waits,
+                'restarts': self.restarts,
+                'retries': self.retries,
+            }
@@ -0,0 +1,98 @@
+# 프로세스 전체에서 공유하는 폰트 레지스트리 (폰트 파일 목록 + 크기별 폰트 객체 캐시)
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from PIL import ImageFont
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc')
+
+
+class FontRegistry:
+    """fonts 폴더의 폰트를 시작할 때 한 번 확인하고, (폰트 이름, 크기)별 FreeTypeFont를 재사용합니다.
+
+    요청마다 ImageFont.truetype()으로 폰트를 새로 여는 대신 같은 객체를 돌려주므로
+    폰트 파싱 비용뿐 아니라 FreeType이 글리프를 캐시해 둔 효과도 요청 간에 유지됩니다.
+    폰트 파일은 경로로 엽니다. Pillow는 메모리에서 열 때 bytes 객체만 받기 때문에
+    mmap을 넘기려면 결국 복사해야 하고, 경로로 열면 FreeType이 직접 파일을 매핑합니다.
+    """
+
+    def __init__(self, folder, default_name='NanumBrush.ttf', max_fonts=128):
+        self.folder = folder
+        self.default_name = default_name
+        self.max_fonts = max_fonts
+        self._paths = {}
+        self._fonts = OrderedDict()  # (name, size) -> FreeTypeFont
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.load_seconds = 0.0  # 캐시에 없던 폰트 파일을 여는 데 쓴 누적 시간
+        self.scan()
+
+    def scan(self):
+        """폴더를 다시 읽어 사용할 수 있는 폰트 목록을 갱신합니다."""
+        paths = {}
+        if os.path.isdir(self.folder):
+            for name in sorted(os.listdir(self.folder)):
+                if not name.lower().endswith(FONT_EXTENSIONS):
+                    continue
+                path = os.path.join(self.folder, name)
+                try:
+                    ImageFont.truetype(path, 10)  # 열 수 없는 파일은 목록에서 제외
+                except OSError as e:
+                    print(f"Skipping font {name}: {e}")
+                    continue
+                paths[name] = path
+        with self._lock:
+            self._paths = paths
+            self._fonts.clear()
+
+    def names(self):
+        return sorted(self._paths)
+
+    def resolve(self, font_name):
+        """등록된 폰트 이름이면 그대로, 아니면 기본 폰트 이름을 반환합니다."""
+        if font_name in self._paths:
+            return font_name
+        print(f"Font {font_name} not found. Using {self.default_name}.")
+        return self.default_name
+
+    def get(self, font_name, font_size):
+        """(폰트 이름, 크기)에 해당하는 폰트 객체를 반환합니다. 모르는 이름은 기본 폰트로 대체합니다."""
+        font_name = self.resolve(font_name)
+        font_size = int(font_size)
+        key = (font_name, font_size)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return font
+            self.misses += 1
+            path = self._paths.get(font_name)
+
+        if path is None:
+            # 기본 폰트 파일도 없으면 Pillow 내장 폰트 사용
+            return ImageFont.load_default()
+        start = time.perf_counter()
+        font = ImageFont.truetype(path, font_size)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.load_seconds += elapsed
+            self._fonts[key] = font
+            self._fonts.move_to_end(key)
+            while len(self._fonts) > self.max_fonts:
+                self._fonts.popitem(last=False)
+        return font
+
+    def stats(self):
+        with self._lock:
+            return {
+                'fonts': sorted(self._paths),
+                'cached': len(self._fonts),
+                'hits': self.hits,
+                'misses': self.misses,
+                'load_ms': self.load_seconds * 1000,
+            }
@@ -0,0 +1,128 @@
+# 생성된 이미지를 내려받는 공유 HTTP 세션 (연결 재사용, 타임아웃, 재시도, 스트리밍 디코딩)
+import binascii
+import threading
+import time
+from io import BytesIO
+
+import requests
+from PIL import Image, ImageFile
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 호스트별로 유지하는 keep-alive 연결 수 (동시에 내려받는 요청 수에 맞춤)
+POOL_SIZE = 16
+
+# (연결, 읽기) 타임아웃 초
+TIMEOUT = (5, 30)
+
+# 연결 실패와 429/5xx 응답은 지수 백오프로 다시 시도 (0.5초, 1초, 2초 ...)
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# 응답 본문을 읽어 디코더에 넘기는 단위 (바이트)
+CHUNK_SIZE = 64 * 1024
+
+
+def make_session(pool_size=POOL_SIZE, retries=RETRIES, backoff_factor=BACKOFF_FACTOR):
+    """keep-alive 연결 풀과 재시도 정책을 설정한 requests.Session을 만듭니다."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # 재시도 후에도 실패하면 응답을 그대로 돌려주고 raise_for_status에서 처리
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def image_from_b64(payload):
+    """DALL·E의 b64_json 값을 PIL 이미지로 디코딩합니다.
+
+    a2b_base64가 만든 bytes를 BytesIO가 복사하지 않고 그대로 참조하므로
+    base64 디코딩 한 번 외에는 추가 복사가 없습니다.
+    """
+    image = Image.open(BytesIO(binascii.a2b_base64(payload)))
+    image.load()
+    return image
+
+
+class ImageDownloader:
+    """이미지 URL을 공유 세션으로 받으면서 도착한 조각을 바로 Pillow 파서에 넘겨 디코딩합니다.
+
+    본문 전체를 response.content에 모은 뒤 BytesIO로 다시 복사하지 않으므로 전송과
+    디코딩이 겹치고, 다운로드마다 첫 바이트까지의 시간(TTFB)과 전송 속도를 기록합니다.
+    """
+
+    def __init__(self, session=None, timeout=TIMEOUT, chunk_size=CHUNK_SIZE):
+        self.session = session or make_session()
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self.downloads = 0
+        self.failures = 0
+        self.total_bytes = 0
+        self.total_seconds = 0.0
+        self.total_ttfb = 0.0
+        self.inline_images = 0  # URL 요청 없이 응답 안의 b64_json으로 받은 이미지 수
+        self.last = None
+
+    def load_generated(self, item):
+        """openai.Image.create 응답의 data 항목을 이미지로 만듭니다.
+
+        b64_json이 있으면 바로 디코딩하고, 없으면(URL 형식 응답) url을 내려받습니다.
+        """
+        payload = item.get('b64_json')
+        if payload is None:
+            return self.fetch_image(item['url'])
+        image = image_from_b64(payload)
+        with self._lock:
+            self.inline_images += 1
+        return image
+
+    def fetch_image(self, url):
+        """url의 이미지를 내려받아 디코딩된 PIL 이미지를 반환합니다."""
+        start = time.perf_counter()
+        try:
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                ttfb = time.perf_counter() - start  # 응답 헤더를 받은 시점
+                parser = ImageFile.Parser()
+                size = 0
+                for chunk in response.iter_content(self.chunk_size):
+                    parser.feed(chunk)
+                    size += len(chunk)
+                image = parser.close()
+        except Exception:
+            with self._lock:
+                self.failures += 1
+            raise
+
+        elapsed = time.perf_counter() - start
+        rate = size / elapsed if elapsed > 0 else 0.0
+        with self._lock:
+            self.downloads += 1
+            self.total_bytes += size
+            self.total_seconds += elapsed
+            self.total_ttfb += ttfb
+            self.last = {'bytes': size, 'ttfb_ms': ttfb * 1000, 'bytes_per_sec': rate}
+        print(f"Downloaded image ({size / 1024:.2f} KB) TTFB {ttfb * 1000:.0f} ms, {rate / 1024:.0f} KB/s")
+        return image
+
+    def stats(self):
+        with self._lock:
+            count = self.downloads
+            return {
+                'downloads': count,
+                'failures': self.failures,
+                'inline_images': self.inline_images,
+                'bytes': self.total_bytes,
+                'avg_ttfb_ms': self.total_ttfb * 1000 / count if count else 0.0,
+                'avg_bytes_per_sec': self.total_bytes / self.total_seconds if self.total_seconds else 0.0,
+                'last': self.last,
+            }
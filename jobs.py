@@ -0,0 +1,149 @@
+# 이미지 생성 작업을 백그라운드에서 실행하고 진행 상황을 알려주는 작업 관리 모듈
+import concurrent.futures
+import threading
+import time
+import uuid
+
+
+class JobQueueFull(Exception):
+    """대기 중인 작업이 너무 많아 새 작업을 받을 수 없을 때 발생합니다."""
+
+
+class Job:
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.status = 'queued'  # queued → running → done / error
+        self.stage = None
+        self.progress = None  # 마지막 progress 이벤트 데이터 (상태 조회로도 미리보기 등을 보여줄 수 있도록)
+        self.result = None
+        self.error = None
+        self.events = []  # (이벤트 이름, 데이터) 목록
+        self.created_at = time.time()
+        self.finished_at = None
+        self.condition = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'error')
+
+    def publish(self, event, **data):
+        with self.condition:
+            self.events.append((event, data))
+            self.condition.notify_all()
+
+    def finish(self, status, result=None, error=None):
+        """상태, 결과와 마지막 이벤트(done/error)를 한 번에 기록합니다.
+
+        iter_events가 끝난 작업을 보고 스트림을 닫기 전에 마지막 이벤트가 반드시 목록에 있도록
+        같은 잠금 안에서 처리합니다.
+        """
+        with self.condition:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+            self.events.append((status, {'error': error} if error is not None else dict(result)))
+            self.condition.notify_all()
+
+    def to_dict(self):
+        with self.condition:
+            info = {'jobId': self.id, 'status': self.status, 'stage': self.stage}
+            if self.progress is not None:
+                info['progress'] = self.progress
+            if self.result is not None:
+                info['result'] = self.result
+            if self.error is not None:
+                info['error'] = self.error
+            return info
+
+
+class JobManager:
+    """고정 크기 스레드 풀에서 작업을 실행합니다.
+
+    실행 중 + 대기 중인 작업 수가 max_workers + max_pending에 도달하면 submit()이
+    JobQueueFull을 발생시키므로, 요청 스레드는 작업을 등록하고 바로 반환됩니다.
+    끝난 작업은 ttl초 동안 상태를 조회할 수 있습니다.
+    """
+
+    def __init__(self, max_workers=4, max_pending=16, ttl=60 * 60):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='job'
+        )
+        self._jobs = {}
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        """func(*args, progress=progress)를 실행하는 작업을 등록하고 Job을 반환합니다.
+
+        func는 progress(stage, **data)를 호출해 단계별 진행 상황을 알릴 수 있으며,
+        반환값이 작업 결과가 됩니다.
+        """
+        with self._lock:
+            self._remove_expired()
+            if self._active >= self.max_workers + self.max_pending:
+                raise JobQueueFull(f"Too many pending jobs ({self._active})")
+            job = Job()
+            self._jobs[job.id] = job
+            self._active += 1
+
+        def progress(stage, **data):
+            with job.condition:
+                job.stage = stage
+                job.progress = dict(data, stage=stage)
+            job.publish('progress', stage=stage, **data)
+
+        def run():
+            with job.condition:
+                job.status = 'running'
+            job.publish('status', status='running')
+            try:
+                result = func(*args, progress=progress)
+            except Exception as e:
+                job.finish('error', error=str(e))
+            else:
+                job.finish('done', result=result)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+        self._executor.submit(run)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pending_count(self):
+        with self._lock:
+            return self._active
+
+    def _remove_expired(self):
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def iter_events(self, job, heartbeat=15):
+        """작업 이벤트를 순서대로 내보내는 제너레이터. 작업이 끝나면 종료합니다.
+
+        heartbeat초 동안 새 이벤트가 없으면 연결 유지를 위해 None을 내보냅니다.
+        """
+        index = 0
+        while True:
+            with job.condition:
+                if index >= len(job.events) and not job.finished:
+                    job.condition.wait(heartbeat)
+                new_events = job.events[index:]
+                index += len(new_events)
+                finished = job.finished and index >= len(job.events)
+            if not new_events and not finished:
+                yield None
+            for event in new_events:
+                yield event
+            if finished:
+                return
@@ -0,0 +1,182 @@
+# 목표 파일 크기 이하가 되도록 JPEG 품질을 찾는 인코더
+import math
+import threading
+from io import BytesIO
+
+# 기본 인코딩 옵션 (4:2:0 서브샘플링 + 허프만 테이블 최적화)
+BASE_OPTIONS = {'subsampling': 2, 'optimize': True}
+
+# 품질 탐색이 끝난 뒤 추가로 시도하는 옵션 조합 (같은 품질에서 더 작게 나오면 한 단계 높은 품질로 저장 가능)
+EXTRA_VARIANTS = [
+    {'subsampling': 2, 'optimize': True, 'progressive': True},
+]
+
+
+# 예산 안에 들어온 결과가 예산의 이 비율 이상이면 (예산보다 3% 이내로 작으면) 더 높은 품질을 찾지 않고 멈춤
+# (품질을 1 올려도 보통 파일 크기가 3% 넘게 커지므로 더 찾아도 얻는 것이 거의 없음)
+DEFAULT_TOLERANCE = 0.03
+
+# 첫 시도 후 다음 품질을 추정할 때 쓰는 기본 기울기
+# (log(파일 크기)는 log(libjpeg 양자화 배율)에 대해 대략 -0.3 ~ -0.75 기울기의 직선)
+DEFAULT_SLOPE = -0.5
+
+
+def _quant_scale(quality):
+    """libjpeg가 품질 값을 양자화 테이블 배율(%)로 바꾸는 식."""
+    return 5000 / quality if quality < 50 else 200 - 2 * quality
+
+
+def _quality_for_scale(scale):
+    return 5000 / scale if scale > 100 else (200 - scale) / 2
+
+
+def encode_jpeg(image, quality, **options):
+    """이미지를 주어진 품질로 JPEG 인코딩한 바이트를 반환합니다."""
+    with BytesIO() as buf:
+        image.save(buf, 'JPEG', quality=quality, **options)
+        return buf.getvalue()
+
+
+class EncodeResult:
+    def __init__(self, data, quality, options, encodes):
+        self.data = data
+        self.quality = quality
+        self.options = options
+        self.encodes = encodes
+
+    @property
+    def size(self):
+        return len(self.data)
+
+
+class BudgetJpegEncoder:
+    """max_size 바이트 이하에서 가장 높은 품질을 이분/할선 탐색으로 찾는 인코더.
+
+    품질을 5씩 낮추며 매번 다시 인코딩하는 대신, 지금까지 인코딩한 두 점을
+    (log 양자화 배율, log 크기) 평면에서 잇는 직선으로 목표 크기에 해당하는 품질을
+    추정하고, 예산 안/밖으로 확인된 품질 사이로 범위를 좁혀 나갑니다.
+    양쪽이 모두 확인된 뒤에는 Illinois 방식으로 가중치를 준 할선을 써서 한쪽 끝에 머무르지 않습니다.
+    직전 저장에서 수렴한 품질을 첫 시도 값으로 사용하므로 비슷한 이미지가 이어지면
+    보통 2~3번의 인코딩으로 끝납니다 (수렴하지 못한 저장 뒤에는 start_quality부터 다시 시작). 결과가 예산보다 tolerance 비율 이내로 작으면 바로 멈추고,
+    추가 옵션 시도를 포함한 인코딩 횟수는 max_encodes를 넘지 않습니다 (최저 품질로도 넘치는 경우 제외).
+    """
+
+    def __init__(self, min_quality=10, max_quality=95, start_quality=85, max_encodes=4,
+                 tolerance=DEFAULT_TOLERANCE):
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.start_quality = start_quality
+        self.max_encodes = max_encodes
+        self.tolerance = tolerance
+        self._last_quality = None
+        self._lock = threading.Lock()
+        self.saves = 0
+        self.total_encodes = 0
+
+    def _next_quality(self, samples, fit, over, max_size, fit_weight=1.0, over_weight=1.0):
+        """지금까지의 샘플로 다음에 시도할 품질을 추정합니다.
+
+        fit/over는 예산 안/밖으로 확인된 (품질, 크기) 중 목표에 가장 가까운 것이고,
+        둘 다 있으면 그 사이에서 가중치(Illinois 방식)를 준 할선으로 추정합니다.
+        """
+        low = fit[0] + 1 if fit is not None else self.min_quality
+        high = over[0] - 1 if over is not None else self.max_quality
+        if low > high:
+            return None
+
+        # (log 양자화 배율, log 크기) 평면에서 목표 크기에 해당하는 점을 추정
+        target = math.log(max_size * 0.98)
+        if fit is not None and over is not None:
+            # 범위 양 끝을 잇는 할선. 한쪽 끝만 계속 남으면 그쪽 잔차에 가중치를 줄여
+            # 할선이 한쪽으로만 조금씩 움직이며 멈춰 버리지 않도록 함
+            x1, f1 = math.log(_quant_scale(fit[0])), (math.log(fit[1]) - target) * fit_weight
+            x2, f2 = math.log(_quant_scale(over[0])), (math.log(over[1]) - target) * over_weight
+            if f1 == f2:
+                return (low + high) // 2
+            guess = _quality_for_scale(math.exp(x1 - f1 * (x2 - x1) / (f2 - f1)))
+            return max(low, min(high, int(round(guess))))
+
+        if len(samples) == 1:
+            q, size = samples[0]
+            x1, y1 = math.log(_quant_scale(q)), math.log(size)
+            slope = DEFAULT_SLOPE
+        else:
+            # 아직 한쪽만 확인됐으면 최근 두 샘플로 외삽
+            (q1, s1), (q2, s2) = samples[-2:]
+            x1, y1 = math.log(_quant_scale(q1)), math.log(s1)
+            x2, y2 = math.log(_quant_scale(q2)), math.log(s2)
+            slope = (y2 - y1) / (x2 - x1) if x1 != x2 and y1 != y2 else DEFAULT_SLOPE
+        guess = _quality_for_scale(math.exp(x1 + (target - y1) / slope))
+        guess = int(round(guess))
+        return max(low, min(high, guess))
+
+    def encode(self, image, max_size):
+        """max_size 바이트 이하로 인코딩한 EncodeResult를 반환합니다.
+
+        최저 품질로도 max_size를 넘으면 최저 품질 결과를 그대로 반환합니다.
+        """
+        samples = []
+        best = None  # (quality, data)
+        fit = over = None  # 예산 안/밖으로 확인된 (품질, 크기) 중 목표에 가장 가까운 것
+        fit_weight = over_weight = 1.0
+        last_side = None
+        encodes = 0
+        q = max(self.min_quality, min(self.max_quality, self._last_quality or self.start_quality))
+
+        while q is not None and encodes < self.max_encodes:
+            data = encode_jpeg(image, q, **BASE_OPTIONS)
+            encodes += 1
+            samples.append((q, len(data)))
+            if len(data) <= max_size:
+                fit = (q, len(data))
+                best = (q, data)
+                fit_weight = 1.0
+                if last_side == 'fit':
+                    over_weight /= 2
+                last_side = 'fit'
+                if len(data) >= max_size * (1 - self.tolerance):
+                    break  # 예산에 충분히 가까움
+            else:
+                over = (q, len(data))
+                over_weight = 1.0
+                if last_side == 'over':
+                    fit_weight /= 2
+                last_side = 'over'
+            q = self._next_quality(samples, fit, over, max_size, fit_weight, over_weight)
+
+        options = BASE_OPTIONS
+        if best is None:
+            # 최저 품질로도 예산을 넘는 경우 최저 품질 결과로 저장
+            if samples[-1][0] != self.min_quality:
+                data = encode_jpeg(image, self.min_quality, **BASE_OPTIONS)
+                encodes += 1
+            best = (self.min_quality, data)
+        elif over is not None and over[0] == best[0] + 1 and encodes < self.max_encodes:
+            # 한 단계 높은 품질에서 다른 옵션 조합이 예산 안에 들어오면 그 결과를 사용
+            for variant in EXTRA_VARIANTS:
+                data = encode_jpeg(image, over[0], **variant)
+                encodes += 1
+                if len(data) <= max_size:
+                    best = (over[0], data)
+                    options = variant
+                    break
+
+        quality, data = best
+        # 예산 근처에서 멈췄거나 바로 위 품질이 넘치는 것을 확인한 경우에만 다음 시작 품질로 기억
+        # (인코딩 횟수가 다 되어 예산보다 한참 작게 끝난 품질을 기억하면 다음 이미지들도 그 품질에 묶임)
+        converged = len(data) >= max_size * (1 - self.tolerance) or (over is not None and over[0] <= quality + 1)
+        with self._lock:
+            self._last_quality = quality if converged else None
+            self.saves += 1
+            self.total_encodes += encodes
+        return EncodeResult(data, quality, options, encodes)
+
+    def stats(self):
+        """저장 횟수와 저장당 평균 인코딩 횟수를 반환합니다."""
+        with self._lock:
+            return {
+                'saves': self.saves,
+                'encodes': self.total_encodes,
+                'encodes_per_save': self.total_encodes / self.saves if self.saves else 0.0,
+                'last_quality': self._last_quality,
+            }
@@ -0,0 +1,127 @@
+# OpenAI 채팅 응답 캐시 (메모리 LRU + 선택적 SQLite 디스크 저장소)
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_key(model, messages):
+    """model과 messages 내용으로 캐시 키(sha256)를 만듭니다."""
+    payload = json.dumps({'model': model, 'messages': messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """같은 (model, messages) 요청의 응답을 재사용하기 위한 캐시.
+
+    메모리에는 최근 사용 순으로 max_entries개까지 보관하고, db_path가 주어지면
+    SQLite 파일에도 저장해 프로세스 재시작이나 다른 워커와도 결과를 공유합니다.
+    각 항목은 저장 시점부터 ttl초가 지나면 만료됩니다.
+    """
+
+    def __init__(self, max_entries=1024, ttl=24 * 60 * 60, db_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self._memory = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if db_path:
+            folder = os.path.dirname(db_path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._db.commit()
+
+    def get(self, key):
+        """캐시된 값을 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT value, expires_at FROM responses WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = row
+                    if expires_at > now:
+                        # 디스크에서 찾은 값은 메모리로 올려 다음 조회를 빠르게 함
+                        self._store_memory(key, value, expires_at)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value, ttl=None):
+        """값을 저장합니다. ttl을 생략하면 캐시 기본값을 사용합니다."""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._store_memory(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)',
+                    (key, value, expires_at)
+                )
+                self._db.commit()
+
+    def _store_memory(self, key, value, expires_at):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get_or_create(self, model, messages, create, bypass=False, ttl=None):
+        """캐시에 있으면 그 값을, 없으면 create()를 호출해 결과를 저장하고 반환합니다.
+
+        bypass가 참이면 캐시를 조회하지 않고 새로 호출하되, 결과는 캐시에 갱신합니다.
+        """
+        key = make_key(model, messages)
+        if not bypass:
+            value = self.get(key)
+            if value is not None:
+                return value
+        value = create()
+        self.set(key, value, ttl)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM responses')
+                self._db.commit()
+
+    def stats(self):
+        """적중/실패 횟수와 적중률을 반환합니다."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'memory_entries': len(self._memory),
+            }
@@ -0,0 +1,344 @@
+# 모든 OpenAI 호출이 거쳐 가는 스케줄러 (모델별 요청/토큰 속도 제한, 재시도, 우선순위, 중복 호출 합치기)
+import asyncio
+import concurrent.futures
+import heapq
+import itertools
+import json
+import random
+import threading
+import time
+
+import openai
+
+import tracing
+from llm_cache import make_key
+
+# 우선순위 (숫자가 작을수록 먼저 실행): 화면에서 기다리는 요청이 배치 작업보다 앞섬
+INTERACTIVE = 0
+BATCH = 1
+
+# 모델별 (분당 요청 수, 분당 토큰 수) 한도. 이미지 모델은 분당 이미지 수이며 토큰 한도 없음
+# (계정 등급에 따라 다르므로 OpenAI 대시보드의 한도에 맞게 조정)
+DEFAULT_LIMITS = {
+    'gpt-3.5-turbo': (3500, 200000),
+    'gpt-4-turbo': (500, 300000),
+    'dall-e-2': (50, None),
+    'dall-e-3': (50, None),
+}
+UNKNOWN_MODEL_LIMIT = (60, None)
+
+# 재시도 설정: 시도마다 최대 대기 시간을 2배로 늘리고 그 안에서 무작위로 기다림 (Retry-After가 있으면 그 값)
+MAX_RETRIES = 5
+BASE_DELAY = 0.5
+MAX_DELAY = 30
+
+# 버킷에 한 번에 모아 둘 수 있는 양 (분당 한도의 몇 초 분량인지). OpenAI는 분당 한도를 더 짧은
+# 구간으로 나눠 적용하기도 하므로 1분 치를 한꺼번에 보내지 않도록 제한
+BURST_SECONDS = 10
+
+# 토큰 한도 계산용 응답 토큰 추정치 (요청 토큰은 글자 수로 넉넉하게 추정)
+COMPLETION_TOKENS = 200
+
+# asyncio 호출이 차례를 기다릴 때 다시 확인하는 간격 (초)
+ASYNC_POLL_INTERVAL = 0.05
+
+
+def estimate_tokens(messages):
+    """메시지의 토큰 수를 글자 수로 추정합니다 (한글은 글자당 1토큰 안팎이라 넉넉한 값)."""
+    return sum(len(str(message.get('content', ''))) for message in messages) + COMPLETION_TOKENS
+
+
+def is_retryable(error):
+    """다시 시도하면 성공할 수 있는 오류인지 판단합니다 (429, 5xx, 연결/시간 초과)."""
+    if isinstance(error, openai.error.RateLimitError):
+        return error.code != 'insufficient_quota'  # 사용량 한도 초과는 기다려도 풀리지 않음
+    if isinstance(error, (openai.error.ServiceUnavailableError, openai.error.Timeout,
+                          openai.error.APIConnectionError, openai.error.TryAgain)):
+        return True
+    if isinstance(error, openai.error.APIError):
+        return error.http_status is None or error.http_status >= 500
+    return False
+
+
+def retry_after(error):
+    """오류 응답의 Retry-After(또는 retry-after-ms) 헤더 값을 초 단위로 반환합니다. 없으면 None."""
+    headers = getattr(error, 'headers', None) or {}
+    try:
+        value = headers.get('retry-after-ms')
+        if value is not None:
+            return float(value) / 1000
+        value = headers.get('retry-after')
+        if value is not None:
+            return float(value)
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class TokenBucket:
+    """분당 한도를 초당 비율로 채워 가는 토큰 버킷 (최대 burst_seconds 분량까지 모아 둠)."""
+
+    def __init__(self, per_minute, burst_seconds=BURST_SECONDS):
+        self.rate = per_minute / 60
+        self.capacity = max(1, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount, now):
+        """amount만큼 꺼낼 수 있을 때까지 기다려야 하는 시간(초). 한도보다 큰 요청은 한도만큼으로 계산."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        amount = min(amount, self.capacity)
+        return 0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+
+class _ModelState:
+    def __init__(self, limit):
+        rpm, tpm = limit
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.paused_until = 0.0  # 429의 Retry-After 동안 이 모델의 모든 호출을 멈춤
+        self.waiting = []  # (우선순위, 순번) 힙
+
+
+class OpenAIScheduler:
+    """OpenAI 호출을 모델별 속도 한도 안에서 우선순위 순서로 실행합니다.
+
+    - 모델마다 분당 요청 수(RPM)와 분당 토큰 수(TPM) 버킷이 있고, 여유가 생길 때까지 호출을 미룹니다.
+    - 같은 모델을 기다리는 호출은 우선순위(INTERACTIVE < BATCH), 도착 순서대로 실행됩니다.
+    - 429/5xx/연결 오류는 지수 백오프(무작위 지연)로 다시 시도하고, Retry-After가 있으면
+      그동안 같은 모델의 다른 호출도 함께 멈춥니다.
+    - key가 같은 호출이 이미 진행 중이면 새로 보내지 않고 그 결과를 같이 받습니다.
+    """
+
+    def __init__(self, limits=None, max_retries=MAX_RETRIES, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._models = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._inflight = {}  # key -> concurrent.futures.Future
+        self._async_inflight = {}  # key -> asyncio.Future
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.throttled = 0
+        self.coalesced = 0
+
+    def _state(self, model):
+        state = self._models.get(model)
+        if state is None:
+            state = _ModelState(self.limits.get(model, UNKNOWN_MODEL_LIMIT))
+            self._models[model] = state
+        return state
+
+    def _try_admit(self, state, ticket, requests, tokens):
+        """차례가 되었고 한도에 여유가 있으면 실행을 허가하고 0을 반환합니다. (self._cond를 잡은 상태에서 호출)
+
+        차례가 아니면 None, 한도를 기다려야 하면 기다릴 시간(초)을 반환합니다.
+        """
+        if state.waiting[0] != ticket:
+            return None
+        now = time.monotonic()
+        wait = max(state.paused_until - now, state.requests.wait_time(requests, now))
+        if state.tokens is not None:
+            wait = max(wait, state.tokens.wait_time(tokens, now))
+        if wait > 0:
+            return wait
+        state.requests.take(requests)
+        if state.tokens is not None:
+            state.tokens.take(tokens)
+        heapq.heappop(state.waiting)
+        self.calls += 1
+        self._cond.notify_all()
+        return 0
+
+    def _acquire(self, model, priority, requests, tokens):
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            state = self._state(model)
+            heapq.heappush(state.waiting, ticket)
+            throttled = False
+            while True:
+                wait = self._try_admit(state, ticket, requests, tokens)
+                if wait == 0:
+                    break
+                throttled = True
+                self._cond.wait(wait)
+            if throttled:
+                self.throttled += 1
+
+    async def _acquire_async(self, model, priority, requests, tokens):
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            state = self._state(model)
+            heapq.heappush(state.waiting, ticket)
+        throttled = False
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_admit(state, ticket, requests, tokens)
+                if wait == 0:
+                    break
+                throttled = True
+                await asyncio.sleep(min(wait or ASYNC_POLL_INTERVAL, ASYNC_POLL_INTERVAL * 10))
+        except asyncio.CancelledError:
+            with self._cond:
+                if ticket in state.waiting:
+                    state.waiting.remove(ticket)
+                    heapq.heapify(state.waiting)
+                    self._cond.notify_all()
+            raise
+        if throttled:
+            with self._cond:
+                self.throttled += 1
+
+    def _on_error(self, model, error, attempt):
+        """재시도할 오류면 기다릴 시간(초)을, 아니면 None을 반환합니다."""
+        if attempt >= self.max_retries or not is_retryable(error):
+            with self._cond:
+                self.failures += 1
+            return None
+        delay = retry_after(error)
+        with self._cond:
+            self.retries += 1
+            if delay is not None:
+                # 서버가 알려준 시간 동안은 같은 모델의 다른 호출도 보내지 않음
+                state = self._state(model)
+                state.paused_until = max(state.paused_until, time.monotonic() + delay)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        tracing.count('openai_retries')
+        print(f"OpenAI {model} call failed ({error.__class__.__name__}: {error}), retrying in {delay:.2f}s")
+        return delay
+
+    def _run(self, model, create, priority, requests, tokens):
+        attempt = 0
+        while True:
+            self._acquire(model, priority, requests, tokens)
+            try:
+                return create()
+            except Exception as e:
+                delay = self._on_error(model, e, attempt)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def _run_async(self, model, create, priority, requests, tokens):
+        attempt = 0
+        while True:
+            await self._acquire_async(model, priority, requests, tokens)
+            try:
+                return await create()
+            except Exception as e:
+                delay = self._on_error(model, e, attempt)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def call(self, model, create, priority=INTERACTIVE, requests=1, tokens=0, key=None):
+        """create()를 한도 안에서 실행하고 결과를 반환합니다. 실패하면 마지막 오류를 발생시킵니다."""
+        if key is None:
+            return self._run(model, create, priority, requests, tokens)
+
+        with self._cond:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        try:
+            result = self._run(model, create, priority, requests, tokens)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._cond:
+                del self._inflight[key]
+
+    async def acall(self, model, create, priority=INTERACTIVE, requests=1, tokens=0, key=None):
+        """call()의 asyncio 버전. create는 코루틴을 반환하는 함수입니다."""
+        if key is None:
+            return await self._run_async(model, create, priority, requests, tokens)
+
+        future = self._async_inflight.get(key)
+        if future is not None:
+            with self._cond:
+                self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._async_inflight[key] = future
+        try:
+            result = await self._run_async(model, create, priority, requests, tokens)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 쪽이 없어도 경고가 나지 않도록 예외를 확인 처리
+            raise
+        finally:
+            del self._async_inflight[key]
+
+    def chat(self, model, messages, priority=INTERACTIVE, **kwargs):
+        """openai.ChatCompletion.create를 스케줄러를 거쳐 호출합니다. 같은 요청이 진행 중이면 결과를 공유합니다."""
+        return self.call(
+            model, lambda: openai.ChatCompletion.create(model=model, messages=messages, **kwargs),
+            priority, tokens=estimate_tokens(messages), key=self._chat_key(model, messages, kwargs),
+        )
+
+    async def achat(self, model, messages, priority=INTERACTIVE, **kwargs):
+        return await self.acall(
+            model, lambda: openai.ChatCompletion.acreate(model=model, messages=messages, **kwargs),
+            priority, tokens=estimate_tokens(messages), key=self._chat_key(model, messages, kwargs),
+        )
+
+    def image(self, prompt, model=None, n=1, priority=INTERACTIVE, **kwargs):
+        """openai.Image.create를 스케줄러를 거쳐 호출합니다 (이미지는 매번 달라야 하므로 합치지 않음).
+
+        model을 생략하면 API 기본 모델(dall-e-2)로 요청합니다.
+        """
+        params = dict(kwargs, prompt=prompt, n=n)
+        if model is not None:
+            params['model'] = model
+        return self.call(model or 'dall-e-2', lambda: openai.Image.create(**params), priority, requests=n)
+
+    async def aimage(self, prompt, model=None, n=1, priority=INTERACTIVE, **kwargs):
+        params = dict(kwargs, prompt=prompt, n=n)
+        if model is not None:
+            params['model'] = model
+        return await self.acall(model or 'dall-e-2', lambda: openai.Image.acreate(**params), priority, requests=n)
+
+    @staticmethod
+    def _chat_key(model, messages, kwargs):
+        if not kwargs:
+            return make_key(model, messages)
+        return make_key(model, messages) + json.dumps(kwargs, sort_keys=True, ensure_ascii=False)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'calls': self.calls,
+                'retries': self.retries,
+                'failures': self.failures,
+                'throttled': self.throttled,
+                'coalesced': self.coalesced,
+                'waiting': {model: len(state.waiting) for model, state in self._models.items()},
+            }
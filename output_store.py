@@ -0,0 +1,167 @@
+# 생성된 이미지 파일을 요청별 고유 경로에 저장하고 오래된 파일을 정리하는 모듈
+import concurrent.futures
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from io import BytesIO
+
+# 내용 해시로 이름이 정해지는 파일은 내용이 바뀌지 않으므로 오래 캐시해도 안전함
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# 내용 해시 이름의 이미지 파일 (image_key + 이미지 확장자). 같은 폴더의 다른 파일(원본의 .json 메타데이터 등)은
+# 같은 이름으로 다시 쓰일 수 있으므로 장기 캐시하지 않음
+IMMUTABLE_NAME = re.compile(r'[0-9a-f]{32}\.(?:jpg|png)')
+
+
+def image_key(image):
+    """이미지의 픽셀 내용으로 고정된 키를 만듭니다. 같은 이미지는 항상 같은 키가 됩니다."""
+    digest = hashlib.sha256(f"{image.mode}{image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()[:32]
+
+
+def atomic_write(path, data):
+    """임시 파일에 쓴 뒤 rename해서, 읽는 쪽에서 절반만 쓰인 파일을 보지 않도록 저장합니다."""
+    folder = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def touch_existing(path):
+    """path가 있으면 수정 시각을 지금으로 바꾸고 True를, 없으면 False를 반환합니다.
+
+    내용 해시 파일을 다시 쓰지 않고 재사용할 때 호출해 OutputJanitor가 수정 시각만 보고
+    아직 쓰이는 파일을 지우지 않도록 합니다.
+    """
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def save_image(image, folder, format='PNG', **params):
+    """이미지를 folder/<내용 해시>.<확장자>로 저장하고 파일 이름을 반환합니다 (이미 있으면 수정 시각만 갱신)."""
+    filename = f"{image_key(image)}.{format.lower()}"
+    path = os.path.join(folder, filename)
+    if not touch_existing(path):
+        with BytesIO() as buf:
+            image.save(buf, format, **params)
+            atomic_write(path, buf.getvalue())
+    return filename
+
+
+def apply_cache_headers(response, filename, immutable_folders):
+    """immutable_folders 바로 아래의 내용 해시 이름 이미지(IMMUTABLE_NAME)면 장기 캐시 헤더를 붙입니다."""
+    parts = filename.replace('\\', '/').split('/')
+    if len(parts) == 2 and parts[0] in immutable_folders and IMMUTABLE_NAME.fullmatch(parts[1]):
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+class OutputJanitor(threading.Thread):
+    """주기적으로 폴더를 검사해 max_age보다 오래된 파일을 지우고,
+    전체 크기가 max_bytes를 넘으면 오래된 파일부터 지우는 백그라운드 스레드."""
+
+    def __init__(self, folders, max_age=24 * 60 * 60, max_bytes=500 * 1024 * 1024, interval=60):
+        super().__init__(name='output-janitor', daemon=True)
+        self.folders = folders
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Output janitor error: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+
+    def sweep(self):
+        """정리를 한 번 수행하고 지운 파일 수를 반환합니다."""
+        files = []
+        for folder in self.folders:
+            if not os.path.isdir(folder):
+                continue
+            for entry in os.scandir(folder):
+                if entry.is_file():
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue  # 다른 워커가 먼저 지운 경우
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        files.sort()  # 오래된 파일부터
+        total = sum(size for _, size, _ in files)
+        cutoff = time.time() - self.max_age
+        removed = 0
+        for mtime, size, path in files:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        return removed
+
+
+class AsyncWriter:
+    """파일 인코딩/쓰기를 스레드 풀에서 처리하고, 경로별 완료 여부를 알려주는 클래스.
+
+    Pillow는 JPEG 인코딩 중 GIL을 놓기 때문에 스레드만으로도 요청 처리와 병렬로 동작합니다.
+    """
+
+    def __init__(self, max_workers=4):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='encode'
+        )
+        self._pending = {}  # path -> threading.Event
+        self._lock = threading.Lock()
+
+    def submit(self, path, func, *args):
+        """func(*args)를 백그라운드에서 실행하고, 끝나면 path를 준비 완료로 표시합니다."""
+        event = threading.Event()
+        with self._lock:
+            self._pending[path] = event
+
+        def run():
+            try:
+                return func(*args)
+            except Exception as e:
+                print(f"Error writing '{path}': {e}")
+                raise
+            finally:
+                with self._lock:
+                    if self._pending.get(path) is event:
+                        del self._pending[path]
+                event.set()
+
+        return self._executor.submit(run)
+
+    def is_pending(self, path):
+        with self._lock:
+            return path in self._pending
+
+    def wait(self, path, timeout=30):
+        """path의 쓰기가 끝날 때까지 기다린 뒤 파일이 존재하는지 반환합니다."""
+        with self._lock:
+            event = self._pending.get(path)
+        if event is not None:
+            event.wait(timeout)
+        return os.path.exists(path)
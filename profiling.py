@@ -0,0 +1,242 @@
+# 샘플링 프로파일러: sys._current_frames()로 스레드 스택을 주기적으로 읽어 collapsed stack(flamegraph) 형식으로 집계
+#   - 요청 프로파일: 한 요청을 처리하는 스레드(요청 스레드 + run_stages 단계 스레드)만 촘촘하게 샘플링해 파일로 저장
+#     flamegraph.pl profiles/<요청 ID>.folded > out.svg 또는 speedscope로 열어 볼 수 있음
+#   - 상시 샘플러: 모든 스레드를 낮은 빈도로 샘플링해 가장 많이 실행 중인 함수를 집계 (샘플링 비용 비율을 제한)
+# 합성은 별도 프로세스에서 실행되므로 합성 워커는 자기 스택을 직접 샘플링해 결과와 함께 돌려줌 (compositing.py)
+import contextlib
+import contextvars
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+# 요청 프로파일 샘플링 간격 (초)
+PROFILE_INTERVAL = 0.002
+
+# 상시 샘플러 샘플링 간격 (초)과 샘플링에 쓸 수 있는 최대 시간 비율 (넘으면 간격을 늘림)
+HOT_INTERVAL = 0.05
+HOT_MAX_OVERHEAD = 0.01
+
+# 상시 샘플러가 기억하는 서로 다른 스택 수 (넘으면 새 스택은 [other]로 합산)
+HOT_MAX_STACKS = 5000
+
+# 잠든 채 기다리는 스레드의 맨 위 프레임 (상시 샘플러 집계에서 제외)
+IDLE_FRAMES = {
+    'threading.py:wait', 'threading.py:_wait_for_tstate_lock', 'queue.py:get', 'selectors.py:select',
+    'socket.py:accept', 'socket.py:readinto', 'socketserver.py:serve_forever', 'thread.py:_worker',
+    'connection.py:_recv', 'connection.py:_poll', 'connection.py:wait', 'ssl.py:read', 'ssl.py:recv_into',
+}
+
+# 요청 ID로 허용하는 형식 (파일 이름으로 쓰므로 경로 문자를 막음)
+_SAFE_ID_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_')
+
+_session = contextvars.ContextVar('profile_session', default=None)
+
+
+def frame_label(frame):
+    code = frame.f_code
+    return f'{os.path.basename(code.co_filename)}:{code.co_name}'
+
+
+def fold(frame):
+    """프레임에서 시작해 바깥 호출까지 올라가며 "바깥;...;안쪽" 형식의 스택 문자열을 만듭니다."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ';'.join(labels)
+
+
+def write_folded(path, stacks):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, count in stacks.most_common():
+            f.write(f'{stack} {count}\n')
+
+
+class ProfileSession(threading.Thread):
+    """등록된 스레드들의 스택을 interval마다 샘플링하는 스레드 (한 요청 또는 한 합성 작업 동안만 실행)."""
+
+    def __init__(self, request_id=None, interval=PROFILE_INTERVAL):
+        super().__init__(name='profiler', daemon=True)
+        self.request_id = request_id or uuid.uuid4().hex
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._threads = Counter()  # 스레드 ID -> 등록 횟수
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def add_thread(self, ident):
+        with self._lock:
+            self._threads[ident] += 1
+
+    def remove_thread(self, ident):
+        with self._lock:
+            self._threads[ident] -= 1
+            if self._threads[ident] <= 0:
+                del self._threads[ident]
+
+    def merge(self, stacks, prefix):
+        """다른 곳(합성 프로세스 등)에서 모은 스택을 prefix 아래에 합칩니다."""
+        with self._lock:
+            for stack, count in stacks.items():
+                self.stacks[f'{prefix};{stack}'] += count
+
+    def run(self):
+        names = {}
+        while not self._stopped.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                idents = list(self._threads)
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                if ident not in names:
+                    names[ident] = next((t.name for t in threading.enumerate() if t.ident == ident), str(ident))
+                with self._lock:
+                    self.stacks[f'{names[ident]};{fold(frame)}'] += 1
+                    self.samples += 1
+            del frames
+
+    def stop(self):
+        self._stopped.set()
+        if self.is_alive():
+            self.join()
+
+    def write(self, folder):
+        path = os.path.join(folder, f'{self.request_id}.folded')
+        with self._lock:
+            stacks = Counter(self.stacks)
+        write_folded(path, stacks)
+        print(f"Wrote profile '{path}' ({self.samples} samples)")
+        return path
+
+
+def safe_request_id(value):
+    """요청이 보낸 ID를 파일 이름으로 써도 되면 그대로, 아니면 None을 반환합니다."""
+    if value and len(value) <= 64 and set(value) <= _SAFE_ID_CHARS:
+        return value
+    return None
+
+
+def active():
+    """지금 요청 프로파일이 켜져 있는지 (합성 워커에도 샘플링을 요청할지 정할 때 사용)."""
+    return _session.get() is not None
+
+
+@contextlib.contextmanager
+def request_profile(folder, request_id=None, enabled=True, interval=PROFILE_INTERVAL):
+    """with 블록 동안 이 스레드와 run_stages 단계 스레드를 샘플링하고 끝나면 folder/<요청 ID>.folded로 저장합니다.
+
+    enabled가 False면 아무것도 하지 않고 None을 돌려줍니다.
+    """
+    if not enabled:
+        yield None
+        return
+    session = ProfileSession(request_id, interval)
+    session.add_thread(threading.get_ident())
+    token = _session.set(session)
+    session.start()
+    try:
+        yield session
+    finally:
+        session.stop()
+        _session.reset(token)
+        session.write(folder)
+
+
+def follow(func, *args):
+    """func(*args)를 실행하는 동안 지금 스레드를 열려 있는 요청 프로파일에 등록합니다 (없으면 그냥 실행)."""
+    session = _session.get()
+    if session is None:
+        return func(*args)
+    ident = threading.get_ident()
+    session.add_thread(ident)
+    try:
+        return func(*args)
+    finally:
+        session.remove_thread(ident)
+
+
+def merge(stacks, prefix):
+    """열려 있는 요청 프로파일에 다른 프로세스에서 모은 스택을 합칩니다."""
+    session = _session.get()
+    if session is not None and stacks:
+        session.merge(stacks, prefix)
+
+
+class HotFrameSampler(threading.Thread):
+    """모든 스레드를 낮은 빈도로 샘플링해 실행 중인 함수(맨 위 프레임)와 스택을 집계하는 상시 샘플러.
+
+    한 번 샘플링하는 데 걸린 시간이 간격의 max_overhead 비율을 넘으면 다음 샘플까지 더 오래 쉬어
+    샘플링 비용이 프로세스 시간의 max_overhead를 넘지 않도록 합니다. 기다리는 중인 스레드
+    (IDLE_FRAMES)는 집계하지 않습니다.
+    """
+
+    def __init__(self, interval=HOT_INTERVAL, max_overhead=HOT_MAX_OVERHEAD, max_stacks=HOT_MAX_STACKS):
+        super().__init__(name='hot-sampler', daemon=True)
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.max_stacks = max_stacks
+        self.leaves = Counter()  # 맨 위 프레임 -> 샘플 수 (그 함수 자체에서 시간을 쓴 횟수)
+        self.stacks = Counter()
+        self.samples = 0  # 샘플링 횟수
+        self.busy = 0  # 집계한 스레드 스택 수
+        self.sampling_seconds = 0.0
+        self._started_at = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def sample(self):
+        own = threading.get_ident()
+        frames = sys._current_frames()
+        busy = []
+        for ident, frame in frames.items():
+            if ident == own or frame_label(frame) in IDLE_FRAMES:
+                continue
+            busy.append((frame_label(frame), fold(frame)))
+        del frames
+        with self._lock:
+            self.samples += 1
+            for leaf, stack in busy:
+                self.busy += 1
+                self.leaves[leaf] += 1
+                if stack not in self.stacks and len(self.stacks) >= self.max_stacks:
+                    stack = '[other]'
+                self.stacks[stack] += 1
+
+    def run(self):
+        self._started_at = time.perf_counter()
+        delay = self.interval
+        while not self._stopped.wait(delay):
+            start = time.perf_counter()
+            self.sample()
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.sampling_seconds += elapsed
+            delay = max(self.interval, elapsed / self.max_overhead - elapsed)
+
+    def stop(self):
+        self._stopped.set()
+
+    def hot(self, limit=20):
+        """가장 많이 샘플된 함수 limit개와 샘플링 통계를 반환합니다."""
+        with self._lock:
+            running = time.perf_counter() - self._started_at if self._started_at else 0.0
+            return {
+                'samples': self.samples,
+                'busy_samples': self.busy,
+                'overhead': self.sampling_seconds / running if running else 0.0,
+                'frames': [{'frame': leaf, 'samples': count, 'ratio': count / self.busy}
+                           for leaf, count in self.leaves.most_common(limit)],
+            }
+
+    def folded(self):
+        """집계한 스택 전체 (collapsed stack 형식 문자열)."""
+        with self._lock:
+            return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
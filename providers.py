@@ -0,0 +1,307 @@
+# 요약/번역(chat)과 이미지 생성을 맡는 백엔드 (실제 OpenAI 또는 네트워크 없이 동작하는 로컬 스텁)
+# 앱은 PROVIDER.chat(...) / PROVIDER.images(...)만 호출하므로 OPENAI_PROVIDER 환경 변수로 바꿔 끼울 수 있음
+#   OPENAI_PROVIDER=stub python app7.py   # OpenAI 없이 부하 테스트 (benchmarks/loadgen.py)
+import asyncio
+import functools
+import hashlib
+import math
+import os
+import random
+import threading
+import time
+from io import BytesIO
+
+import aiohttp
+import numpy as np
+import openai
+from PIL import Image
+
+import tracing
+from http_session import ImageDownloader, image_from_b64
+from llm_cache import make_key
+from openai_scheduler import OpenAIScheduler, INTERACTIVE, estimate_tokens
+
+# 스텁 기본 지연 시간 (중앙값, p95) 초: 실제 API와 비슷한 꼬리를 갖도록 로그 정규 분포에서 뽑음
+STUB_CHAT_LATENCY = (0.8, 2.0)
+STUB_IMAGE_LATENCY = (8.0, 15.0)
+
+# 스텁이 만드는 서로 다른 배경 이미지 수 (프롬프트마다 배경을 고르고 모서리 색으로 구분)
+STUB_IMAGE_VARIANTS = 8
+
+# 스텁 답변 길이 (요약 요청의 "within 20 letters"에 맞춤)
+STUB_REPLY_LENGTH = 20
+
+# 로그 정규 분포의 p95 위치 (표준 정규 분포의 95% 분위수)
+_Z95 = 1.645
+
+
+def sample_latency(rng, median, p95):
+    """중앙값과 p95가 주어진 로그 정규 분포에서 지연 시간(초)을 뽑습니다."""
+    if median <= 0:
+        return 0.0
+    sigma = math.log(max(p95, median) / median) / _Z95
+    return rng.lognormvariate(math.log(median), sigma)
+
+
+def parse_size(size):
+    width, height = (int(v) for v in size.split('x'))
+    return width, height
+
+
+def _digest(*parts):
+    return int.from_bytes(hashlib.md5(':'.join(str(p) for p in parts).encode('utf-8')).digest()[:8], 'big')
+
+
+@functools.lru_cache(maxsize=2 * STUB_IMAGE_VARIANTS)
+def render_background(width, height, variant):
+    """그라데이션, 물결무늬, 노이즈를 섞은 배경 이미지를 만듭니다 (JPEG 압축 부담이 실제 그림과 비슷하도록)."""
+    rng = np.random.default_rng(variant)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    angle = rng.uniform(0, 2 * np.pi)
+    t = (x * np.cos(angle) + y * np.sin(angle)) / max(width, height)
+    t = (t - t.min()) / (t.max() - t.min())
+    waves = sum(np.sin(x / rng.uniform(20, 120) + y / rng.uniform(20, 120) + rng.uniform(0, 6)) for _ in range(3)) / 3
+    start, end = rng.uniform(0, 255, 3), rng.uniform(0, 255, 3)
+    pixels = start + (end - start) * t[..., None] + 40 * waves[..., None]
+    pixels += rng.normal(0, 12, pixels.shape)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), 'RGB')
+
+
+def render_stub_image(prompt, size, index=0):
+    """(프롬프트, index) 에 대해 항상 같은 이미지를 반환합니다 (둘 중 하나가 다르면 내용 해시도 다름)."""
+    width, height = parse_size(size)
+    seed = _digest(prompt, size, index)
+    image = render_background(width, height, seed % STUB_IMAGE_VARIANTS).copy()
+    image.paste(((seed >> 8) & 255, (seed >> 16) & 255, (seed >> 24) & 255), (0, 0, 16, 16))
+    return image
+
+
+def stub_reply(messages):
+    """마지막 메시지 앞부분을 답변으로 돌려줍니다 (같은 요청에는 항상 같은 답변)."""
+    content = str(messages[-1].get('content', ''))
+    return content[:STUB_REPLY_LENGTH].strip() or '요약'
+
+
+class OpenAIProvider:
+    """OpenAI API를 스케줄러를 거쳐 호출하고, 생성된 이미지를 PIL 이미지로 받아 옵니다."""
+
+    name = 'openai'
+
+    def __init__(self, scheduler=None, downloader=None, response_format='b64_json'):
+        self.scheduler = scheduler or OpenAIScheduler()
+        self.downloader = downloader or ImageDownloader()
+        self.response_format = response_format
+
+    # 단계 시간은 tracing에 chat, dalle(생성 응답까지), download(다운로드 + 디코딩)로 기록
+    def chat(self, model, messages, priority=INTERACTIVE):
+        with tracing.stage('chat'):
+            response = self.scheduler.chat(model=model, messages=messages, priority=priority)
+        return response.choices[0].message['content'].strip()
+
+    def images(self, prompt, n=1, model=None, size='1024x1024', priority=INTERACTIVE):
+        with tracing.stage('dalle'):
+            response = self.scheduler.image(model=model, prompt=prompt, n=n, size=size,
+                                            response_format=self.response_format, priority=priority)
+        # 응답에 포함된 이미지를 디코딩 (URL만 있으면 그 URL에서 이미지 다운로드)
+        with tracing.stage('download'):
+            return [self.downloader.load_generated(item) for item in response['data']]
+
+    async def achat(self, model, messages, priority=INTERACTIVE):
+        with tracing.stage('chat'):
+            response = await self.scheduler.achat(model, messages, priority)
+        return response.choices[0].message['content'].strip()
+
+    async def aimages(self, prompt, n=1, model=None, size='1024x1024', priority=INTERACTIVE, executor=None):
+        """images()의 asyncio 버전. 디코딩은 executor에서 실행하고, URL은 openai.aiosession의 세션으로 받습니다."""
+        with tracing.stage('dalle'):
+            response = await self.scheduler.aimage(model=model, prompt=prompt, n=n, size=size,
+                                                   response_format=self.response_format, priority=priority)
+        loop = asyncio.get_running_loop()
+        images = []
+        with tracing.stage('download'):
+            for item in response['data']:
+                if 'b64_json' in item:
+                    images.append(await loop.run_in_executor(executor, image_from_b64, item['b64_json']))
+                else:
+                    images.append(await self._adownload(item['url'], loop, executor))
+        return images
+
+    async def _adownload(self, url, loop, executor):
+        # 조각 단위로 받아 메모리 버퍼에 모은 뒤 executor에서 디코딩
+        buffer = BytesIO()
+        session = openai.aiosession.get()
+        owned = session is None
+        if owned:
+            session = aiohttp.ClientSession()
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                async for chunk in response.content.iter_chunked(self.downloader.chunk_size):
+                    buffer.write(chunk)
+        finally:
+            if owned:
+                await session.close()
+        buffer.seek(0)
+
+        def decode():
+            image = Image.open(buffer)
+            image.load()
+            return image
+        return await loop.run_in_executor(executor, decode)
+
+    def stats(self):
+        return {'provider': self.name, 'scheduler': self.scheduler.stats(), 'downloads': self.downloader.stats()}
+
+
+class StubProvider:
+    """네트워크 없이 OpenAI 응답을 흉내 내는 로컬 백엔드 (부하 테스트용).
+
+    - chat: 마지막 메시지 앞부분을 답변으로 돌려줌
+    - images: 프롬프트와 이미지 번호로 정해진 그림을 size 크기로 생성 (512x512, 1024x1024 등)
+      이미지 번호는 호출마다 이어지므로 같은 프롬프트로 여러 번 불러도 실제 DALL·E처럼 다른 그림이 나옴
+    - 지연 시간은 (중앙값, p95) 로그 정규 분포, error_rate 비율로 429/503 오류를 발생시킴
+    - seed가 같으면 지연 시간과 오류가 같은 순서로 나옴
+    scheduler를 주면 실제 앱처럼 스케줄러의 재시도/우선순위/합치기를 거칩니다.
+    """
+
+    name = 'stub'
+
+    def __init__(self, chat_latency=STUB_CHAT_LATENCY, image_latency=STUB_IMAGE_LATENCY, error_rate=0.0,
+                 seed=0, scheduler=None):
+        self.chat_latency = chat_latency
+        self.image_latency = image_latency
+        self.error_rate = error_rate
+        self.scheduler = scheduler
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.chat_calls = 0
+        self.image_calls = 0
+        self.errors = 0
+        self._image_index = 0
+
+    def _plan(self, latency):
+        """이번 호출의 (지연 시간, 오류) 를 정합니다."""
+        with self._lock:
+            delay = sample_latency(self._rng, *latency)
+            failed = self._rng.random() < self.error_rate
+            status = self._rng.choice((429, 503)) if failed else None
+            if failed:
+                self.errors += 1
+        error = None
+        if status == 429:
+            error = openai.error.RateLimitError('Rate limit reached (stub)', http_status=429)
+        elif status == 503:
+            error = openai.error.ServiceUnavailableError('Service unavailable (stub)', http_status=503)
+        return delay, error
+
+    def _count(self, kind):
+        with self._lock:
+            setattr(self, kind, getattr(self, kind) + 1)
+
+    def _image_indexes(self, n):
+        """이번 호출에 쓸 이미지 번호 n개 (나눠 보낸 요청과 재시도도 서로 다른 그림을 받음)"""
+        with self._lock:
+            start = self._image_index
+            self._image_index += n
+        return range(start, start + n)
+
+    def _chat(self, messages):
+        self._count('chat_calls')
+        delay, error = self._plan(self.chat_latency)
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return stub_reply(messages)
+
+    def _images(self, prompt, n, size):
+        self._count('image_calls')
+        delay, error = self._plan(self.image_latency)
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return [render_stub_image(prompt, size, index) for index in self._image_indexes(n)]
+
+    async def _achat(self, messages):
+        self._count('chat_calls')
+        delay, error = self._plan(self.chat_latency)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return stub_reply(messages)
+
+    async def _aimages(self, prompt, n, size, executor):
+        self._count('image_calls')
+        delay, error = self._plan(self.image_latency)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        loop = asyncio.get_running_loop()
+        return [await loop.run_in_executor(executor, render_stub_image, prompt, size, index)
+                for index in self._image_indexes(n)]
+
+    # 단계 시간은 OpenAIProvider와 같은 이름으로 기록 (스텁은 다운로드 없이 dalle 단계에서 이미지를 만듦)
+    # 스케줄러에는 OpenAIProvider와 같은 모델, 요청/토큰 수, 합치기 키로 넘김
+    def chat(self, model, messages, priority=INTERACTIVE):
+        with tracing.stage('chat'):
+            if self.scheduler is None:
+                return self._chat(messages)
+            return self.scheduler.call(model, lambda: self._chat(messages), priority,
+                                       tokens=estimate_tokens(messages), key=make_key(model, messages))
+
+    def images(self, prompt, n=1, model=None, size='1024x1024', priority=INTERACTIVE):
+        with tracing.stage('dalle'):
+            if self.scheduler is None:
+                return self._images(prompt, n, size)
+            return self.scheduler.call(model or 'dall-e-2', lambda: self._images(prompt, n, size), priority,
+                                       requests=n)
+
+    async def achat(self, model, messages, priority=INTERACTIVE):
+        with tracing.stage('chat'):
+            if self.scheduler is None:
+                return await self._achat(messages)
+            return await self.scheduler.acall(model, lambda: self._achat(messages), priority,
+                                              tokens=estimate_tokens(messages), key=make_key(model, messages))
+
+    async def aimages(self, prompt, n=1, model=None, size='1024x1024', priority=INTERACTIVE, executor=None):
+        with tracing.stage('dalle'):
+            if self.scheduler is None:
+                return await self._aimages(prompt, n, size, executor)
+            return await self.scheduler.acall(model or 'dall-e-2',
+                                              lambda: self._aimages(prompt, n, size, executor), priority, requests=n)
+
+    def stats(self):
+        with self._lock:
+            stats = {'provider': self.name, 'chat_calls': self.chat_calls,
+                     'image_calls': self.image_calls, 'errors': self.errors}
+        if self.scheduler is not None:
+            stats['scheduler'] = self.scheduler.stats()
+        return stats
+
+
+def _env_latency(name, default):
+    # "중앙값,p95" 형식 (예: STUB_IMAGE_LATENCY=0.5,1.5), 값 하나면 고정 지연
+    value = os.environ.get(name)
+    if not value:
+        return default
+    parts = [float(v) for v in value.split(',')]
+    return parts[0], parts[-1]
+
+
+def create_provider(name=None, scheduler=None, downloader=None, response_format='b64_json'):
+    """이름("openai" 또는 "stub")에 맞는 백엔드를 만듭니다. name을 생략하면 OPENAI_PROVIDER 환경 변수를 사용합니다.
+
+    스텁 설정은 STUB_CHAT_LATENCY, STUB_IMAGE_LATENCY, STUB_ERROR_RATE, STUB_SEED 환경 변수로 바꿀 수 있습니다.
+    스텁도 scheduler를 거치므로 재시도, 속도 한도, 합치기와 /openai/stats가 OpenAI 백엔드와 같게 동작합니다.
+    """
+    name = name or os.environ.get('OPENAI_PROVIDER', 'openai')
+    if name == 'openai':
+        return OpenAIProvider(scheduler, downloader, response_format)
+    if name == 'stub':
+        return StubProvider(
+            chat_latency=_env_latency('STUB_CHAT_LATENCY', STUB_CHAT_LATENCY),
+            image_latency=_env_latency('STUB_IMAGE_LATENCY', STUB_IMAGE_LATENCY),
+            error_rate=float(os.environ.get('STUB_ERROR_RATE', 0)),
+            seed=int(os.environ.get('STUB_SEED', 0)),
+            scheduler=scheduler,
+        )
+    raise ValueError(f'unknown provider: {name}')
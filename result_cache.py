@@ -0,0 +1,196 @@
+# /generate 결과 캐시: 같은 요청이면 저장된 결과 JPEG를 바로 돌려주고,
+# 이미지 관련 값(title, instruction, painting_style)만 같으면 저장된 원본으로 합성만 다시 함
+import hashlib
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+
+from output_store import touch_existing
+
+# 스타일 값 중 대소문자/공백 차이를 무시하는 항목
+_CASE_INSENSITIVE = ('textColor', 'borderColor', 'position')
+
+
+def make_key(fields):
+    """요청 값 dict로 캐시 키(sha256)를 만듭니다 (키 순서와 무관)."""
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def canonical_text(value):
+    """앞뒤 공백과 연속 공백 차이를 없앤 문자열."""
+    return ' '.join(str(value).split())
+
+
+def canonical_style(style):
+    """같은 결과를 내는 스타일 값이 같은 키가 되도록 정리합니다 ("50"과 50, "Black"과 "black" 등)."""
+    canonical = {}
+    for name, value in style.items():
+        if isinstance(value, str):
+            value = value.strip()
+            if name in _CASE_INSENSITIVE:
+                value = value.lower()
+            elif name == 'fontSize' and value.isdigit():
+                value = int(value)
+        canonical[name] = value
+    return canonical
+
+
+class _Entry:
+    def __init__(self, image_id, files, result_name=None, message=None):
+        self.image_id = image_id
+        self.files = files
+        self.result_name = result_name
+        self.message = message
+
+
+class ResultCache:
+    """생성 요청 → 저장된 원본/결과 파일 매핑 (메모리 색인 + 디스크 파일, 크기 예산 안에서 LRU 삭제).
+
+    두 단계로 찾습니다.
+    - 전체 일치: 이미지 값 + 문구 + 스타일이 모두 같으면 결과 파일 이름을 돌려줌 (DALL·E, 요약, 합성 생략)
+    - 원본 일치: 이미지 값만 같으면 원본 이미지 ID를 돌려줌 (DALL·E 생략, 합성만 다시)
+    store_results가 False면 원본만 기록하므로 모든 적중이 원본 일치가 됩니다.
+
+    색인된 파일 전체 크기가 max_bytes를 넘으면 가장 오래 쓰이지 않은 항목부터 지우고,
+    다른 항목이 더 이상 참조하지 않는 파일은 디스크에서도 삭제합니다. 파일이 다른 이유
+    (OutputJanitor 등)로 지워졌으면 찾을 때 확인해 항목을 버립니다.
+    pending(path)은 아직 백그라운드에서 쓰는 중인 파일을 존재하는 것으로 보기 위한 함수입니다.
+    """
+
+    def __init__(self, originals_folder, results_folder, max_bytes=200 * 1024 * 1024, store_results=True,
+                 pending=None):
+        self.originals_folder = originals_folder
+        self.results_folder = results_folder
+        self.max_bytes = max_bytes
+        self.store_results = store_results
+        self.pending = pending or (lambda path: False)
+        self._entries = OrderedDict()  # ('original' | 'result', key) -> _Entry
+        self._refs = Counter()  # path -> 참조하는 항목 수
+        self._sizes = {}  # path -> bytes (아직 쓰는 중이면 0)
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.full_hits = 0
+        self.partial_hits = 0
+        self.stale = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    def original_files(self, image_id):
+        return [os.path.join(self.originals_folder, f'{image_id}.jpg'),
+                os.path.join(self.originals_folder, f'{image_id}.json')]
+
+    def result_file(self, result_name):
+        return os.path.join(self.results_folder, result_name)
+
+    def _exists(self, path):
+        return os.path.exists(path) or self.pending(path)
+
+    def _size(self, path):
+        size = self._sizes.get(path)
+        if not size:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0
+            self._sizes[path] = size
+        return size
+
+    def _get(self, slot):
+        """slot 항목을 찾아 파일이 모두 남아 있으면 반환하고 최근 사용으로 표시합니다. (self._lock 안에서 호출)
+
+        재사용하는 파일은 수정 시각을 갱신해 OutputJanitor가 오래된 파일로 보고 지우지 않도록 합니다.
+        """
+        entry = self._entries.get(slot)
+        if entry is None:
+            return None
+        if not all(self._exists(path) for path in entry.files):
+            self._remove(slot, delete_files=False)
+            self.stale += 1
+            return None
+        for path in entry.files:
+            touch_existing(path)  # 아직 쓰는 중인 파일은 없어도 됨 (쓰기가 끝나면 새 시각)
+        self._entries.move_to_end(slot)
+        return entry
+
+    def lookup(self, original_fields, full_fields):
+        """('full', 항목) / ('original', 항목) / (None, None) 을 반환합니다.
+
+        항목에는 image_id가 있고, 전체 일치면 result_name과 message도 있습니다.
+        """
+        with self._lock:
+            self.lookups += 1
+            entry = self._get(('result', make_key(full_fields)))
+            if entry is not None:
+                self.full_hits += 1
+                self.bytes_saved += sum(self._size(path) for path in entry.files)
+                return 'full', entry
+            entry = self._get(('original', make_key(original_fields)))
+            if entry is not None:
+                self.partial_hits += 1
+                self.bytes_saved += sum(self._size(path) for path in entry.files)
+                return 'original', entry
+            return None, None
+
+    def put(self, original_fields, full_fields, image_id, result_name, message):
+        """생성 결과를 기록하고, 예산을 넘으면 오래된 항목을 지웁니다."""
+        original_files = self.original_files(image_id)
+        with self._lock:
+            self._add(('original', make_key(original_fields)), _Entry(image_id, original_files))
+            if self.store_results:
+                self._add(('result', make_key(full_fields)),
+                          _Entry(image_id, original_files + [self.result_file(result_name)], result_name, message))
+            self._evict()
+
+    def _add(self, slot, entry):
+        if slot in self._entries:
+            self._remove(slot, delete_files=False)
+        self._entries[slot] = entry
+        for path in entry.files:
+            self._refs[path] += 1
+
+    def _remove(self, slot, delete_files):
+        entry = self._entries.pop(slot)
+        for path in entry.files:
+            self._refs[path] -= 1
+            if self._refs[path] > 0:
+                continue
+            del self._refs[path]
+            self._sizes.pop(path, None)
+            if delete_files:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _total_bytes(self):
+        return sum(self._size(path) for path in self._refs)
+
+    def _evict(self):
+        total = self._total_bytes()
+        while total > self.max_bytes and len(self._entries) > 1:
+            slot = next(iter(self._entries))
+            freed = [path for path in self._entries[slot].files if self._refs[path] == 1]
+            freed_bytes = sum(self._size(path) for path in freed)
+            self._remove(slot, delete_files=True)
+            self.evictions += 1
+            total -= freed_bytes
+
+    def stats(self):
+        with self._lock:
+            hits = self.full_hits + self.partial_hits
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes(),
+                'max_bytes': self.max_bytes,
+                'lookups': self.lookups,
+                'full_hits': self.full_hits,
+                'partial_hits': self.partial_hits,
+                'misses': self.lookups - hits,
+                'hit_ratio': hits / self.lookups if self.lookups else 0.0,
+                'full_hit_ratio': self.full_hits / self.lookups if self.lookups else 0.0,
+                'bytes_saved': self.bytes_saved,
+                'stale': self.stale,
+                'evictions': self.evictions,
+            }
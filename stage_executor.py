@@ -0,0 +1,115 @@
+# 의존 관계가 있는 생성 단계(번역, 요약, DALL·E 등)를 병렬로 실행하는 모듈
+import concurrent.futures
+import contextvars
+import threading
+
+import profiling
+
+# 모든 요청이 공유하는 단계 실행용 스레드 풀 (대부분 OpenAI 응답을 기다리는 I/O 작업)
+STAGE_WORKERS = 16
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """공유 스레드 풀을 반환합니다. 처음 호출될 때 생성합니다."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=STAGE_WORKERS, thread_name_prefix='stage'
+            )
+        return _executor
+
+
+def _check_stages(stages):
+    """존재하지 않는 의존성이나 순환 의존성이 있으면 ValueError를 발생시킵니다."""
+    for name, (_, deps) in stages.items():
+        for dep in deps:
+            if dep not in stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+
+    # 위상 정렬로 순환 여부 확인
+    remaining = {name: set(deps) for name, (_, deps) in stages.items()}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Circular stage dependencies: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def run_stages(stages, executor=None, timeout=None):
+    """단계들을 의존 관계에 따라 실행하고 {단계 이름: 결과}를 반환합니다.
+
+    stages는 {이름: (함수, [의존 단계 이름, ...])} 형태이며, 각 함수는 의존 단계의
+    결과를 순서대로 인자로 받습니다. 의존성이 없는 단계는 바로 동시에 시작되고,
+    나머지는 필요한 결과가 모두 준비되는 즉시 시작되므로 전체 소요 시간은 가장 긴
+    의존 경로의 길이가 됩니다. 어느 단계든 실패하면 그 예외를 그대로 다시 발생시킵니다.
+    """
+    _check_stages(stages)
+    executor = executor or get_executor()
+    # 호출한 쪽의 contextvars(요청 추적 등). 의존 단계는 앞 단계 스레드의 완료 콜백에서 제출되므로
+    # 그 시점의 컨텍스트가 아니라 여기서 잡아 둔 것을 단계마다 복사해 사용
+    context = contextvars.copy_context()
+
+    pending = {name: set(deps) for name, (_, deps) in stages.items()}
+    results = {}
+    errors = []
+    futures = []
+    lock = threading.Lock()
+    finished = threading.Event()
+
+    def submit(name):
+        func, deps = stages[name]
+        args = [results[dep] for dep in deps]
+        # 호출한 쪽의 contextvars를 단계 스레드에서도 그대로 사용하고,
+        # 요청 프로파일이 켜져 있으면 단계를 실행하는 동안 이 스레드도 샘플링
+        future = executor.submit(context.copy().run, profiling.follow, func, *args)
+        futures.append(future)
+        future.add_done_callback(lambda f, name=name: on_done(name, f))
+
+    def take_ready():
+        ready = [name for name, deps in pending.items() if not deps]
+        for name in ready:
+            del pending[name]
+        return ready
+
+    def on_done(name, future):
+        with lock:
+            if errors:
+                return
+            exc = future.exception()
+            if exc is not None:
+                errors.append(exc)
+                finished.set()
+                return
+            results[name] = future.result()
+            for deps in pending.values():
+                deps.discard(name)
+            ready = take_ready()
+            if len(results) == len(stages):
+                finished.set()
+        for other in ready:
+            submit(other)
+
+    if not stages:
+        return results
+
+    with lock:
+        roots = take_ready()
+    for name in roots:
+        submit(name)
+
+    if not finished.wait(timeout):
+        for future in futures:
+            future.cancel()
+        raise TimeoutError(f"Stages did not finish within {timeout} seconds")
+
+    if errors:
+        for future in futures:
+            future.cancel()
+        raise errors[0]
+    return results
@@ -0,0 +1,66 @@
+# jobs.JobManager 테스트 (상태 조회로 진행 상황과 결과 확인)
+import threading
+import time
+
+import pytest
+
+from jobs import JobManager, JobQueueFull
+
+
+def _wait_finished(job, timeout=1):
+    deadline = time.monotonic() + timeout
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job.to_dict()
+
+
+def test_status_reports_latest_progress_then_result():
+    manager = JobManager(max_workers=1)
+    reached = threading.Event()
+    release = threading.Event()
+
+    def generate(progress):
+        progress('image_ready', originalUrl='/static/originals/a.jpg')
+        reached.set()
+        release.wait(1)
+        return {'imageUrl': '/static/results/b.jpg'}
+
+    job = manager.submit(generate)
+    reached.wait(1)
+    info = job.to_dict()
+    assert info['status'] == 'running'
+    assert info['progress'] == {'stage': 'image_ready', 'originalUrl': '/static/originals/a.jpg'}
+
+    release.set()
+    info = _wait_finished(job)
+    assert info['status'] == 'done'
+    assert info['result'] == {'imageUrl': '/static/results/b.jpg'}
+
+
+def test_failed_job_reports_error():
+    manager = JobManager(max_workers=1)
+
+    def generate(progress):
+        raise RuntimeError('DALL·E failed')
+
+    info = _wait_finished(manager.submit(generate))
+    assert info['status'] == 'error'
+    assert info['error'] == 'DALL·E failed'
+
+
+def test_full_queue_raises_job_queue_full():
+    manager = JobManager(max_workers=1, max_pending=1)
+    release = threading.Event()
+    jobs = [manager.submit(lambda progress: release.wait(1)) for _ in range(2)]
+    with pytest.raises(JobQueueFull):
+        manager.submit(lambda progress: None)
+    release.set()
+    for job in jobs:
+        _wait_finished(job)
+
+
+def test_events_end_with_done():
+    manager = JobManager(max_workers=1)
+    job = manager.submit(lambda progress: progress('saved') or {'imageUrl': 'x'})
+    events = [event for event in manager.iter_events(job, heartbeat=0.1) if event is not None]
+    assert [name for name, _ in events] == ['status', 'progress', 'done']
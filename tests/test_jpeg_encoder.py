@@ -0,0 +1,56 @@
+# jpeg_encoder.BudgetJpegEncoder 품질 탐색 테스트
+import numpy as np
+import pytest
+from PIL import Image
+
+from jpeg_encoder import BudgetJpegEncoder
+from providers import render_background
+
+SIZE = 512
+BUDGET = 60 * 1024
+
+
+def _easy_image(variant=0):
+    # 스텁 제공자의 배경 이미지 (실제 그림과 비슷하게 압축됨)
+    return render_background(SIZE, SIZE, variant).copy()
+
+
+def _hard_image():
+    # 잡음을 많이 섞은 이미지: 예산 안에 넣으려면 품질을 크게 낮춰야 함
+    noise = np.random.RandomState(1).randint(0, 255, (SIZE, SIZE, 3), dtype=np.uint8)
+    return Image.blend(_easy_image(), Image.fromarray(noise, 'RGB'), 0.6)
+
+
+def test_result_fits_budget_within_encode_cap():
+    encoder = BudgetJpegEncoder()
+    result = encoder.encode(_easy_image(), BUDGET)
+    assert result.size <= BUDGET
+    assert result.encodes <= encoder.max_encodes
+
+
+def test_easy_image_after_hard_image_keeps_fresh_quality():
+    encoder = BudgetJpegEncoder()
+    hard = encoder.encode(_hard_image(), BUDGET)
+    easy_fresh = BudgetJpegEncoder().encode(_easy_image(), BUDGET)
+    assert hard.quality < easy_fresh.quality - 20
+
+    easy = encoder.encode(_easy_image(), BUDGET)
+    assert easy.size <= BUDGET
+    assert easy.quality >= easy_fresh.quality - 5
+
+
+def test_start_quality_not_remembered_when_search_did_not_converge():
+    encoder = BudgetJpegEncoder(max_encodes=1)
+    encoder.encode(_hard_image(), BUDGET)
+    assert encoder.stats()['last_quality'] is None
+
+
+@pytest.mark.parametrize('budget', [40 * 1024, 60 * 1024, 100 * 1024])
+def test_alternating_images_not_worse_than_fresh_encoder(budget):
+    encoder = BudgetJpegEncoder()
+    for i in range(4):
+        image = _hard_image() if i % 2 else _easy_image(i)
+        result = encoder.encode(image, budget)
+        fresh = BudgetJpegEncoder().encode(image, budget)
+        assert result.size <= budget or result.quality == encoder.min_quality
+        assert result.quality >= fresh.quality - 5
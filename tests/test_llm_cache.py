@@ -0,0 +1,85 @@
+# llm_cache.ResponseCache 테스트 (TTL 만료, LRU 제거, SQLite 저장소)
+import pytest
+
+import llm_cache
+from llm_cache import ResponseCache, make_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_cache, 'time', clock)
+    return clock
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = ResponseCache(ttl=60)
+    cache.set('k', 'v')
+    clock.now += 59
+    assert cache.get('k') == 'v'
+    clock.now += 2
+    assert cache.get('k') is None
+    assert cache.stats()['memory_entries'] == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = ResponseCache(ttl=60)
+    cache.set('short', 'v', ttl=5)
+    cache.set('long', 'v')
+    clock.now += 10
+    assert cache.get('short') is None
+    assert cache.get('long') == 'v'
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResponseCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # a를 최근 사용으로 옮겨 b가 가장 오래된 항목이 됨
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_disk_store_survives_a_new_cache_and_respects_ttl(clock, tmp_path):
+    db_path = str(tmp_path / 'cache' / 'responses.db')
+    ResponseCache(ttl=60, db_path=db_path).set('k', 'v')
+
+    reopened = ResponseCache(ttl=60, db_path=db_path)
+    assert reopened.get('k') == 'v'
+    assert reopened.stats()['disk_hits'] == 1
+
+    clock.now += 61
+    assert ResponseCache(ttl=60, db_path=db_path).get('k') is None
+
+
+def test_get_or_create_calls_create_once_until_bypass(clock):
+    cache = ResponseCache()
+    calls = []
+
+    def create():
+        calls.append(1)
+        return f'reply {len(calls)}'
+
+    messages = [{'role': 'user', 'content': '안녕'}]
+    assert cache.get_or_create('gpt-4-turbo', messages, create) == 'reply 1'
+    assert cache.get_or_create('gpt-4-turbo', messages, create) == 'reply 1'
+    assert cache.get_or_create('gpt-4-turbo', messages, create, bypass=True) == 'reply 2'
+    assert cache.get_or_create('gpt-4-turbo', messages, create) == 'reply 2'
+    assert len(calls) == 2
+
+
+def test_key_depends_on_model_and_messages():
+    messages = [{'role': 'user', 'content': '안녕'}]
+    assert make_key('gpt-4-turbo', messages) == make_key('gpt-4-turbo', [dict(messages[0])])
+    assert make_key('gpt-4-turbo', messages) != make_key('gpt-3.5-turbo', messages)
+    assert make_key('gpt-4-turbo', messages) != make_key('gpt-4-turbo', [{'role': 'user', 'content': '안녕!'}])
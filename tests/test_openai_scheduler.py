@@ -0,0 +1,152 @@
+# openai_scheduler.OpenAIScheduler 테스트 (실제 API 대신 create 함수를 직접 넘김)
+import asyncio
+import threading
+import time
+
+import openai
+import pytest
+
+from openai_scheduler import BATCH, INTERACTIVE, OpenAIScheduler, TokenBucket
+
+
+def _rate_limit_error(retry_after_ms=None, code=None):
+    headers = {'retry-after-ms': str(retry_after_ms)} if retry_after_ms is not None else None
+    return openai.error.RateLimitError('Rate limit reached', http_status=429, headers=headers, code=code)
+
+
+def _start(target, *args):
+    thread = threading.Thread(target=target, args=args)
+    thread.start()
+    return thread
+
+
+def test_retries_429_after_retry_after():
+    scheduler = OpenAIScheduler()
+    attempts = []
+
+    def create():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise _rate_limit_error(retry_after_ms=300)
+        return 'ok'
+
+    assert scheduler.call('gpt-4-turbo', create) == 'ok'
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.29
+    assert scheduler.stats()['retries'] == 1
+
+
+def test_retry_after_pauses_other_calls_to_the_same_model():
+    scheduler = OpenAIScheduler()
+    failed = threading.Event()
+    calls = []
+
+    def failing_once():
+        if not failed.is_set():
+            failed.set()
+            raise _rate_limit_error(retry_after_ms=300)
+        return 'first'
+
+    thread = _start(scheduler.call, 'gpt-4-turbo', failing_once)
+    failed.wait(1)
+    started = time.monotonic()
+    scheduler.call('gpt-4-turbo', lambda: calls.append(time.monotonic()))
+    thread.join()
+    assert calls[0] - started >= 0.25
+
+
+def test_insufficient_quota_is_not_retried():
+    scheduler = OpenAIScheduler()
+    attempts = []
+
+    def create():
+        attempts.append(1)
+        raise _rate_limit_error(code='insufficient_quota')
+
+    with pytest.raises(openai.error.RateLimitError):
+        scheduler.call('gpt-4-turbo', create)
+    assert len(attempts) == 1
+    assert scheduler.stats()['failures'] == 1
+
+
+def test_same_key_calls_share_one_request():
+    scheduler = OpenAIScheduler()
+    release = threading.Event()
+    created = []
+    results = []
+
+    def create():
+        created.append(1)
+        release.wait(1)
+        return 'summary'
+
+    threads = [_start(lambda: results.append(scheduler.call('gpt-4-turbo', create, key='same'))) for _ in range(5)]
+    deadline = time.monotonic() + 1
+    while scheduler.stats()['coalesced'] < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert results == ['summary'] * 5
+    assert scheduler.stats()['coalesced'] == 4
+
+
+def test_same_key_async_calls_share_one_request():
+    scheduler = OpenAIScheduler()
+    created = []
+
+    async def create():
+        created.append(1)
+        await asyncio.sleep(0.05)
+        return 'summary'
+
+    async def run():
+        return await asyncio.gather(*[scheduler.acall('gpt-4-turbo', create, key='same') for _ in range(3)])
+
+    assert asyncio.run(run()) == ['summary'] * 3
+    assert len(created) == 1
+    assert scheduler.stats()['coalesced'] == 2
+
+
+def test_interactive_calls_run_before_waiting_batch_calls():
+    scheduler = OpenAIScheduler()
+    failed = threading.Event()
+    order = []
+
+    def paused_call():
+        # 첫 시도가 429로 모델을 0.3초 멈추게 하고, 그동안 BATCH와 INTERACTIVE 호출이 차례를 기다림
+        if not failed.is_set():
+            failed.set()
+            raise _rate_limit_error(retry_after_ms=300)
+        order.append('retried')
+
+    threads = [_start(scheduler.call, 'gpt-4-turbo', paused_call)]
+    failed.wait(1)
+    threads.append(_start(scheduler.call, 'gpt-4-turbo', lambda: order.append('batch'), BATCH))
+    time.sleep(0.05)
+    threads.append(_start(scheduler.call, 'gpt-4-turbo', lambda: order.append('interactive'), INTERACTIVE))
+    for thread in threads:
+        thread.join()
+
+    assert order == ['interactive', 'retried', 'batch']
+
+
+def test_token_bucket_refills_at_the_per_minute_rate():
+    bucket = TokenBucket(60, burst_seconds=1)  # 초당 1개, 최대 1개
+    now = bucket.updated
+    assert bucket.wait_time(1, now) == 0
+    bucket.take(1)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 0.5) == pytest.approx(0.5)
+    assert bucket.wait_time(1, now + 1.0) == 0
+
+
+def test_token_limit_paces_calls():
+    scheduler = OpenAIScheduler(limits={'gpt-4-turbo': (6000, 600)})  # 토큰 초당 10개, 최대 100개
+    scheduler.call('gpt-4-turbo', lambda: None, tokens=100)
+    started = time.monotonic()
+    scheduler.call('gpt-4-turbo', lambda: None, tokens=5)
+    assert time.monotonic() - started >= 0.45
+    assert scheduler.stats()['throttled'] == 1
@@ -0,0 +1,42 @@
+# output_store 테스트 (내용 해시 파일 저장과 장기 캐시 헤더)
+import os
+
+import pytest
+from PIL import Image
+
+from output_store import IMMUTABLE_CACHE_CONTROL, apply_cache_headers, image_key, save_image
+
+IMAGE_ID = '0123456789abcdef0123456789abcdef'
+
+
+class FakeResponse:
+    def __init__(self):
+        self.headers = {}
+
+
+@pytest.mark.parametrize('filename', [f'originals/{IMAGE_ID}.jpg', f'results/{IMAGE_ID}.png'])
+def test_content_hash_images_are_immutable(filename):
+    response = apply_cache_headers(FakeResponse(), filename, ('results', 'originals'))
+    assert response.headers['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+
+
+@pytest.mark.parametrize('filename', [
+    f'originals/{IMAGE_ID}.json',  # store_message가 같은 이름으로 다시 씀
+    'results/result.jpg',
+    f'html/{IMAGE_ID}.jpg',
+    f'results/nested/{IMAGE_ID}.jpg',
+])
+def test_other_files_are_not_immutable(filename):
+    response = apply_cache_headers(FakeResponse(), filename, ('results', 'originals'))
+    assert 'Cache-Control' not in response.headers
+
+
+def test_save_image_reuses_existing_file(tmp_path):
+    image = Image.new('RGB', (8, 8), (200, 10, 10))
+    filename = save_image(image, str(tmp_path))
+    assert filename == f'{image_key(image)}.png'
+
+    path = os.path.join(str(tmp_path), filename)
+    os.utime(path, (1, 1))
+    assert save_image(image, str(tmp_path)) == filename
+    assert os.path.getmtime(path) > 1
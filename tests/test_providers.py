@@ -0,0 +1,30 @@
+# providers.StubProvider 테스트 (변형 이미지마다 다른 그림)
+import asyncio
+
+from output_store import image_key
+from providers import StubProvider
+
+
+def _stub():
+    return StubProvider(chat_latency=(0, 0), image_latency=(0, 0))
+
+
+def test_variants_in_one_call_differ():
+    images = _stub().images('바다 풍경', n=3, size='256x256')
+    assert len({image_key(image) for image in images}) == 3
+
+
+def test_repeated_calls_with_same_prompt_differ():
+    stub = _stub()
+    first = stub.images('바다 풍경', size='256x256')[0]
+    second = stub.images('바다 풍경', size='256x256')[0]
+    assert image_key(first) != image_key(second)
+
+
+def test_async_calls_differ_too():
+    stub = _stub()
+
+    async def generate():
+        return await stub.aimages('바다 풍경', n=2, size='256x256') + await stub.aimages('바다 풍경', size='256x256')
+
+    assert len({image_key(image) for image in asyncio.run(generate())}) == 3
@@ -0,0 +1,95 @@
+# result_cache.ResultCache 테스트 (전체/원본 일치, 삭제된 파일, 크기 예산 LRU)
+import os
+
+from result_cache import ResultCache, canonical_style, make_key
+
+ORIGINAL = {'title': '바다', 'instruction': '', 'painting_style': ''}
+
+
+def _full(message='안녕하세요', **style):
+    return dict(ORIGINAL, message=message, style=canonical_style(dict({'textColor': 'black'}, **style)))
+
+
+def _write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+
+
+def _store(cache, image_id, result_name, original=ORIGINAL, full=None, size=100):
+    for path in cache.original_files(image_id) + [cache.result_file(result_name)]:
+        _write(path, size)
+    cache.put(original, full or _full(), image_id, result_name, '요약')
+
+
+def _cache(tmp_path, **kwargs):
+    return ResultCache(str(tmp_path / 'originals'), str(tmp_path / 'results'), **kwargs)
+
+
+def test_full_match_returns_result_and_message(tmp_path):
+    cache = _cache(tmp_path)
+    _store(cache, 'img1', 'res1.jpg')
+    kind, entry = cache.lookup(ORIGINAL, _full())
+    assert kind == 'full'
+    assert (entry.image_id, entry.result_name, entry.message) == ('img1', 'res1.jpg', '요약')
+
+
+def test_equivalent_style_values_share_a_key():
+    assert make_key(_full(textColor=' Black ', fontSize='50')) == make_key(_full(textColor='black', fontSize=50))
+
+
+def test_different_message_reuses_only_the_original(tmp_path):
+    cache = _cache(tmp_path)
+    _store(cache, 'img1', 'res1.jpg')
+    kind, entry = cache.lookup(ORIGINAL, _full(message='다른 문구'))
+    assert kind == 'original'
+    assert entry.image_id == 'img1'
+    assert cache.stats()['partial_hits'] == 1
+
+
+def test_store_results_false_only_matches_originals(tmp_path):
+    cache = _cache(tmp_path, store_results=False)
+    _store(cache, 'img1', 'res1.jpg')
+    assert cache.lookup(ORIGINAL, _full())[0] == 'original'
+
+
+def test_deleted_files_make_the_entry_stale(tmp_path):
+    cache = _cache(tmp_path)
+    _store(cache, 'img1', 'res1.jpg')
+    os.remove(cache.original_files('img1')[0])
+    assert cache.lookup(ORIGINAL, _full()) == (None, None)
+    assert cache.stats()['stale'] == 2
+
+
+def test_pending_files_count_as_present(tmp_path):
+    cache = _cache(tmp_path, pending=lambda path: path.endswith('res1.jpg'))
+    _store(cache, 'img1', 'res1.jpg')
+    os.remove(cache.result_file('res1.jpg'))
+    assert cache.lookup(ORIGINAL, _full())[0] == 'full'
+
+
+def test_hit_refreshes_file_mtime(tmp_path):
+    cache = _cache(tmp_path)
+    _store(cache, 'img1', 'res1.jpg')
+    result = cache.result_file('res1.jpg')
+    os.utime(result, (1, 1))
+    cache.lookup(ORIGINAL, _full())
+    assert os.path.getmtime(result) > 1
+
+
+def test_over_budget_evicts_least_recently_used_files(tmp_path):
+    # 항목 하나(원본 jpg, json, 결과)가 300바이트이므로 예산 700바이트에는 두 개까지 들어감
+    cache = _cache(tmp_path, max_bytes=700)
+    first = dict(ORIGINAL, title='first')
+    second = dict(ORIGINAL, title='second')
+    third = dict(ORIGINAL, title='third')
+    _store(cache, 'img1', 'res1.jpg', first, dict(first, message='m'))
+    _store(cache, 'img2', 'res2.jpg', second, dict(second, message='m'))
+    assert cache.lookup(first, dict(first, message='m'))[0] == 'full'  # img1을 최근 사용으로
+    _store(cache, 'img3', 'res3.jpg', third, dict(third, message='m'))
+
+    assert not os.path.exists(cache.result_file('res2.jpg'))
+    assert not os.path.exists(cache.original_files('img2')[0])
+    assert os.path.exists(cache.result_file('res1.jpg'))
+    assert cache.lookup(second, dict(second, message='m')) == (None, None)
+    assert cache.stats()['bytes'] <= 700
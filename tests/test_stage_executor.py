@@ -0,0 +1,104 @@
+# stage_executor.run_stages 테스트
+import contextvars
+import threading
+import time
+
+import pytest
+
+from stage_executor import run_stages
+
+
+def _sleep_then(value, seconds=0.1):
+    def run(*args):
+        time.sleep(seconds)
+        return value
+    return run
+
+
+def test_dependencies_receive_results_in_order():
+    stages = {
+        'translate': (lambda: 'hello', []),
+        'summary': (lambda text: text.upper(), ['translate']),
+        'back': (lambda summary, original: f'{summary}/{original}', ['summary', 'translate']),
+    }
+    assert run_stages(stages) == {'translate': 'hello', 'summary': 'HELLO', 'back': 'HELLO/hello'}
+
+
+def test_independent_stages_run_concurrently():
+    # 번역 → 요약 (0.2초)과 DALL·E (0.2초)가 동시에 실행되면 전체는 가장 긴 경로 길이
+    stages = {
+        'translate': (_sleep_then('en'), []),
+        'summary': (_sleep_then('short'), ['translate']),
+        'dalle': (_sleep_then('image', 0.2), []),
+    }
+    started = time.monotonic()
+    results = run_stages(stages)
+    assert results == {'translate': 'en', 'summary': 'short', 'dalle': 'image'}
+    assert time.monotonic() - started < 0.35
+
+
+def test_stage_starts_as_soon_as_its_dependencies_finish():
+    started = {}
+
+    def record(name, seconds):
+        def run(*args):
+            started[name] = time.monotonic()
+            time.sleep(seconds)
+            return name
+        return run
+
+    begin = time.monotonic()
+    run_stages({
+        'fast': (record('fast', 0.05), []),
+        'slow': (record('slow', 0.3), []),
+        'after_fast': (record('after_fast', 0), ['fast']),
+    })
+    assert started['after_fast'] - begin < 0.2
+
+
+def test_failure_is_raised_to_the_caller():
+    def fail(text):
+        raise RuntimeError('chat failed')
+
+    with pytest.raises(RuntimeError, match='chat failed'):
+        run_stages({'translate': (lambda: 'en', []), 'summary': (fail, ['translate'])})
+
+
+def test_stages_after_a_failure_do_not_run():
+    ran = threading.Event()
+
+    def fail():
+        raise RuntimeError('translate failed')
+
+    with pytest.raises(RuntimeError):
+        run_stages({'translate': (fail, []), 'summary': (lambda text: ran.set(), ['translate'])})
+    assert not ran.is_set()
+
+
+@pytest.mark.parametrize('stages', [
+    {'a': (lambda b: b, ['b'])},
+    {'a': (lambda b: b, ['b']), 'b': (lambda a: a, ['a'])},
+])
+def test_unknown_or_circular_dependencies_raise_value_error(stages):
+    with pytest.raises(ValueError):
+        run_stages(stages)
+
+
+def test_timeout_raises_timeout_error():
+    with pytest.raises(TimeoutError):
+        run_stages({'slow': (_sleep_then('x', 0.5), [])}, timeout=0.1)
+
+
+def test_context_variables_reach_stage_threads():
+    request_id = contextvars.ContextVar('request_id', default=None)
+    request_id.set('req-1')
+    results = run_stages({
+        'read': (request_id.get, []),
+        # 의존 단계는 앞 단계가 끝난 스레드에서 제출되지만 호출한 쪽의 값을 봐야 함
+        'dependent': (lambda value: (value, request_id.get()), ['read']),
+    })
+    assert results == {'read': 'req-1', 'dependent': ('req-1', 'req-1')}
+
+
+def test_empty_stages_return_empty_results():
+    assert run_stages({}) == {}
@@ -0,0 +1,60 @@
+# text_layout.fit_font_size 테스트 (저장소의 fonts 폴더 사용)
+import os
+
+import pytest
+from PIL import Image, ImageDraw
+
+from font_registry import FontRegistry
+from text_layout import fit_font_size, layout_text
+
+FONTS_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fonts')
+
+TEXTS = [
+    '안녕하세요 반갑습니다 오늘도 좋은 하루 보내세요',
+    '띄어쓰기없이아주길게붙여쓴한글문장은음절사이에서나뉩니다',
+    'Hello world, this is a longer English sentence for wrapping',
+    '첫 줄\n둘째 줄은 조금 더 깁니다',
+]
+
+
+@pytest.fixture(scope='module')
+def fonts():
+    return FontRegistry(FONTS_FOLDER)
+
+
+def _fits(fonts, font_name, text, size, max_width, max_height):
+    block = layout_text(text, fonts.get(font_name, size), max_width)
+    return block.width <= max_width and block.height <= max_height
+
+
+@pytest.mark.parametrize('text', TEXTS)
+@pytest.mark.parametrize('box', [(300, 120), (500, 300), (900, 200)])
+def test_returns_largest_size_that_fits(fonts, text, box):
+    max_width, max_height = box
+    font, block = fit_font_size(fonts, 'NanumBrush.ttf', text, max_width, max_height)
+    assert block.width <= max_width and block.height <= max_height
+    # 한 단계 위 크기는 넘쳐야 함 (최대 크기에 닿은 경우 제외)
+    if font.size < 100:
+        assert not _fits(fonts, 'NanumBrush.ttf', text, font.size + 1, max_width, max_height)
+
+
+def test_matches_linear_search(fonts):
+    text = TEXTS[0]
+    expected = next(size for size in range(100, 9, -1) if _fits(fonts, 'NanumSquareRoundEB.ttf', text, size, 400, 150))
+    font, _ = fit_font_size(fonts, 'NanumSquareRoundEB.ttf', text, 400, 150)
+    assert font.size == expected
+
+
+def test_falls_back_to_min_size_when_nothing_fits(fonts):
+    font, block = fit_font_size(fonts, 'NanumBrush.ttf', TEXTS[0], 40, 10, min_size=12)
+    assert font.size == 12
+    assert block.lines
+
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_block_width_matches_drawn_text(fonts, text):
+    # 크기 맞춤은 TextBlock의 폭을 믿으므로 실제로 그린 텍스트의 잉크 오른쪽 끝과 같아야 함
+    font, block = fit_font_size(fonts, 'NanumBrush.ttf', text, 400, 200)
+    draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    right = draw.multiline_textbbox((0, 0), block.text, font=font, spacing=4)[2]
+    assert right == pytest.approx(block.width, abs=1)
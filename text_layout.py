@@ -0,0 +1,208 @@
+# 글자 폭 테이블을 이용한 텍스트 배치(줄바꿈)와 자동 글자 크기 맞춤
+import threading
+import weakref
+
+# Pillow multiline_text의 기본 줄 간격(px)
+LINE_SPACING = 4
+
+_tables = weakref.WeakKeyDictionary()  # font -> AdvanceTable
+_tables_lock = threading.Lock()
+
+
+def is_hangul_syllable(char):
+    return '가' <= char <= '힣'
+
+
+class AdvanceTable:
+    """한 폰트 객체(폰트 + 크기)의 글자별 가로 폭과 글자 쌍 커닝 값을 한 번만 재고 저장해 두는 테이블."""
+
+    def __init__(self, font):
+        self.font = font
+        self._advances = {}
+        self._kerning = {}
+        self._ink_right = {}
+        # multiline_text와 같은 방식으로 줄 높이 계산
+        self.line_height = font.getbbox('A')[3] + LINE_SPACING
+        ascent, descent = font.getmetrics()
+        self.text_height = ascent + descent
+
+    def advance(self, char):
+        width = self._advances.get(char)
+        if width is None:
+            width = self.font.getlength(char)
+            self._advances[char] = width
+        return width
+
+    def ink_right(self, char):
+        """글자를 0에서 그렸을 때 잉크(실제로 칠해지는 부분)의 오른쪽 끝. 보통 글자 폭보다 조금 작습니다."""
+        right = self._ink_right.get(char)
+        if right is None:
+            right = self.font.getbbox(char)[2]
+            self._ink_right[char] = right
+        return right
+
+    def ink_width(self, text, width):
+        """글자 폭 합이 width인 text의 잉크 오른쪽 끝 (font.getbbox(text)[2]와 같은 값)."""
+        if not text:
+            return 0
+        return round(width - self.advance(text[-1]) + self.ink_right(text[-1]))
+
+    def kerning(self, left, right):
+        """두 글자를 붙여 썼을 때 각 글자 폭의 합과의 차이 (대부분 0)."""
+        pair = left + right
+        value = self._kerning.get(pair)
+        if value is None:
+            value = self.font.getlength(pair) - self.advance(left) - self.advance(right)
+            self._kerning[pair] = value
+        return value
+
+    def width(self, text):
+        if not text:
+            return 0
+        total = self.advance(text[0])
+        for prev, char in zip(text, text[1:]):
+            total += self.kerning(prev, char) + self.advance(char)
+        return total
+
+
+def get_advance_table(font):
+    """폰트 객체에 대한 AdvanceTable을 반환합니다. 같은 폰트 객체는 같은 테이블을 공유합니다."""
+    with _tables_lock:
+        table = _tables.get(font)
+        if table is None:
+            table = AdvanceTable(font)
+            _tables[font] = table
+        return table
+
+
+class TextBlock:
+    """줄바꿈 결과. 줄마다 (텍스트, 폭)을 가지고 있어 다시 textbbox로 잴 필요가 없습니다.
+
+    폭은 textbbox와 같이 잉크의 오른쪽 끝까지입니다.
+    """
+
+    def __init__(self, lines, widths, table):
+        self.lines = lines
+        self.widths = widths
+        self.line_height = table.line_height
+        self.text = '\n'.join(lines)
+        self.width = max(widths) if widths else 0
+        # 마지막 줄은 줄 간격 없이 글자 높이만 차지
+        self.height = (len(lines) - 1) * table.line_height + table.text_height if lines else 0
+
+    def line_boxes(self, x=0, y=0, align='left'):
+        """(x, y)에 그렸을 때 각 줄이 차지하는 (left, top, right, bottom) 상자 리스트."""
+        boxes = []
+        for i, width in enumerate(self.widths):
+            left = x
+            if align == 'center':
+                left = x + (self.width - width) / 2
+            elif align == 'right':
+                left = x + self.width - width
+            top = y + i * self.line_height
+            boxes.append((left, top, left + width, top + self.line_height - LINE_SPACING))
+        return boxes
+
+
+def _split_word(word, table, max_width):
+    """한 줄보다 긴 단어를 나눕니다. 한글 음절 사이에서 먼저 나누고, 불가능하면 아무 글자 사이에서 나눕니다.
+
+    (조각 리스트, 조각별 잉크 폭 리스트)를 반환합니다.
+    """
+    pieces, widths = [], []
+    start = 0
+    width = 0
+    last_break = None  # 나눌 수 있는 마지막 위치와 그 지점까지의 폭
+    i = 0
+    while i < len(word):
+        char = word[i]
+        char_width = table.advance(char)
+        if i > start:
+            char_width += table.kerning(word[i - 1], char)
+            if is_hangul_syllable(word[i - 1]) and is_hangul_syllable(char):
+                last_break = (i, width)
+
+        if i > start and width + char_width - table.advance(char) + table.ink_right(char) > max_width:
+            end, end_width = last_break if last_break is not None else (i, width)
+            pieces.append(word[start:end])
+            widths.append(table.ink_width(word[start:end], end_width))
+            start = end
+            width = 0
+            last_break = None
+            i = start
+            continue
+
+        width += char_width
+        i += 1
+
+    pieces.append(word[start:])
+    widths.append(table.ink_width(word[start:], table.width(word[start:])))
+    return pieces, widths
+
+
+def layout_text(text, font, max_width):
+    """텍스트를 max_width에 맞게 줄바꿈한 TextBlock을 반환합니다.
+
+    각 단어의 폭은 글자 폭 테이블로 한 번만 계산하고 줄 폭은 누적해서 구하므로 전체
+    길이에 비례하는 시간이 걸립니다. 줄에 들어가는지는 이전 래퍼(font.getbbox)처럼 마지막 글자의
+    잉크 오른쪽 끝으로 판단합니다. 띄어쓰기에서 먼저 줄을 바꾸고, 띄어쓰기 없이 한 줄보다
+    긴 단어(붙여 쓴 한글 등)는 음절 사이에서 나눕니다. 텍스트 안의 줄바꿈은 그대로 유지합니다.
+    """
+    table = get_advance_table(font)
+    space = table.advance(' ')
+    lines, widths = [], []
+
+    for paragraph in text.split('\n'):
+        line, line_width = [], 0
+        for word in paragraph.split(' '):
+            if not word:
+                continue
+            word_width = table.width(word)
+            if line:
+                joined = (line_width + table.kerning(line[-1][-1], ' ') + space
+                          + table.kerning(' ', word[0]) + word_width)
+                if table.ink_width(word, joined) <= max_width:
+                    line.append(word)
+                    line_width = joined
+                    continue
+                lines.append(' '.join(line))
+                widths.append(table.ink_width(line[-1], line_width))
+                line, line_width = [], 0
+
+            if table.ink_width(word, word_width) <= max_width:
+                line, line_width = [word], word_width
+            else:
+                pieces, piece_widths = _split_word(word, table, max_width)
+                lines.extend(pieces[:-1])
+                widths.extend(piece_widths[:-1])
+                line, line_width = [pieces[-1]], table.width(pieces[-1])
+
+        lines.append(' '.join(line))
+        widths.append(table.ink_width(line[-1], line_width) if line else 0)
+
+    return TextBlock(lines, widths, table)
+
+
+def fit_font_size(fonts, font_name, text, max_width, max_height, min_size=10, max_size=100):
+    """텍스트를 줄바꿈했을 때 (max_width, max_height) 상자 안에 들어가는 가장 큰 글자 크기를 찾습니다.
+
+    크기를 1씩 줄여 가며 폰트를 다시 만드는 대신 크기를 이분 탐색하고, 각 후보 크기는
+    글자 폭 테이블로만 배치를 계산하므로 O(log n)번의 배치 계산으로 끝납니다.
+    (font, TextBlock)을 반환하며, 최소 크기로도 넘치면 최소 크기 결과를 반환합니다.
+    """
+    best = None
+    low, high = min_size, max_size
+    while low <= high:
+        size = (low + high) // 2
+        font = fonts.get(font_name, size)
+        block = layout_text(text, font, max_width)
+        if block.width <= max_width and block.height <= max_height:
+            best = (font, block)
+            low = size + 1
+        else:
+            high = size - 1
+
+    if best is None:
+        font = fonts.get(font_name, min_size)
+        best = (font, layout_text(text, font, max_width))
+    return best
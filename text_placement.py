@@ -0,0 +1,134 @@
+# 이미지 영역별 밝기/복잡도를 분석해 텍스트 위치와 색상을 고르는 모듈 (GPT 호출 없이 로컬에서 계산)
+import math
+
+import numpy as np
+
+# 분석용으로 줄인 이미지의 긴 변 길이(px)
+ANALYSIS_SIZE = 128
+
+# 격자 후보의 간격 (축소 이미지 기준 px)
+GRID_STEP = 2
+
+# 점수 가중치: 대비는 높을수록, 밝기 편차와 경계(복잡도)는 낮을수록 좋음
+STD_WEIGHT = 1.0
+EDGE_WEIGHT = 1.0
+
+# 이름 있는 위치(중앙, 네 모서리)는 비슷한 점수면 우선 선택
+NAMED_BONUS = 0.03
+
+NAMED_POSITIONS = ('center', 'top left', 'top right', 'bottom left', 'bottom right')
+
+
+def _integral(values):
+    """왼쪽/위쪽에 0 행·열을 붙인 누적합(적분 영상)."""
+    out = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(values, axis=0), axis=1, out=out[1:, 1:])
+    return out
+
+
+def _box_sums(integral, x0, y0, x1, y1):
+    return integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+
+
+def named_position(position_hint, image_width, image_height, box_width, box_height, margin=10):
+    """calculate_text_position과 같은 규칙으로 이름 있는 위치의 좌상단 좌표를 계산합니다."""
+    if position_hint == 'top left':
+        x, y = margin, margin
+    elif position_hint == 'top right':
+        x, y = image_width - box_width - margin, margin
+    elif position_hint == 'bottom right':
+        x, y = image_width - box_width - margin, image_height - box_height - margin
+    elif position_hint == 'bottom left':
+        x, y = margin, image_height - box_height - margin
+    else:
+        x = (image_width - box_width) / 2
+        y = (image_height - box_height) / 2
+    return max(0, min(x, image_width - box_width)), max(0, min(y, image_height - box_height))
+
+
+class Placement:
+    def __init__(self, x, y, text_color, border_color, score, position):
+        self.x = x
+        self.y = y
+        self.text_color = text_color
+        self.border_color = border_color
+        self.score = score
+        self.position = position  # 이름 있는 위치면 그 이름, 격자 후보면 'grid'
+
+
+def pick_text_placement(image, box_width, box_height, position_hint='auto', margin=10):
+    """box_width x box_height 크기의 텍스트를 놓기 가장 좋은 위치와 글자/테두리 색을 반환합니다.
+
+    position_hint가 'auto'가 아니면 위치는 그 힌트대로 두고 해당 영역에 맞는 색만 고릅니다.
+
+    이미지를 줄여 휘도와 경계 강도를 구하고 적분 영상으로 모든 후보 영역(이름 있는 위치 +
+    격자)의 평균 밝기, 밝기 편차, 경계 밀도를 한 번에 계산합니다. 배경과의 대비가 크고
+    복잡하지 않은 영역일수록 점수가 높습니다.
+    """
+    width, height = image.size
+    box_width = min(box_width, width)
+    box_height = min(box_height, height)
+
+    # 분석용 축소 이미지 (박스 필터 축소라 빠름)
+    factor = max(1, math.ceil(max(width, height) / ANALYSIS_SIZE))
+    small = image.convert('RGB').reduce(factor) if factor > 1 else image.convert('RGB')
+    rgb = np.asarray(small, dtype=np.float32)
+    luma = rgb[..., 0] * 0.299 + rgb[..., 1] * 0.587 + rgb[..., 2] * 0.114
+    scale_x = small.width / width
+    scale_y = small.height / height
+
+    # 경계 강도 (가로/세로 밝기 차이의 절댓값)
+    edges = np.zeros_like(luma)
+    edges[:, 1:] += np.abs(np.diff(luma, axis=1))
+    edges[1:, :] += np.abs(np.diff(luma, axis=0))
+
+    sum_l = _integral(luma)
+    sum_l2 = _integral(luma * luma)
+    sum_e = _integral(edges)
+
+    # 축소 이미지 기준 박스 크기와 후보 좌표
+    bw = max(1, min(small.width, int(round(box_width * scale_x))))
+    bh = max(1, min(small.height, int(round(box_height * scale_y))))
+    names = NAMED_POSITIONS if position_hint == 'auto' else (position_hint,)
+    named = [named_position(p, width, height, box_width, box_height, margin) for p in names]
+    if position_hint == 'auto':
+        xs = np.arange(0, small.width - bw + 1, GRID_STEP)
+        ys = np.arange(0, small.height - bh + 1, GRID_STEP)
+    else:
+        xs = ys = np.arange(0)  # 고정 위치면 격자 후보 없음
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    cand_x = np.concatenate([
+        np.array([min(int(round(x * scale_x)), small.width - bw) for x, _ in named]), grid_x.ravel()
+    ])
+    cand_y = np.concatenate([
+        np.array([min(int(round(y * scale_y)), small.height - bh) for _, y in named]), grid_y.ravel()
+    ])
+
+    area = float(bw * bh)
+    x1, y1 = cand_x + bw, cand_y + bh
+    mean = _box_sums(sum_l, cand_x, cand_y, x1, y1) / area
+    var = _box_sums(sum_l2, cand_x, cand_y, x1, y1) / area - mean * mean
+    std = np.sqrt(np.maximum(var, 0))
+    edge = _box_sums(sum_e, cand_x, cand_y, x1, y1) / area
+
+    contrast = np.abs(mean - 127.5) / 127.5
+    score = contrast - STD_WEIGHT * std / 128 - EDGE_WEIGHT * edge / 64
+    score[:len(named)] += NAMED_BONUS
+
+    best = int(np.argmax(score))
+    if best < len(named):
+        x, y = named[best]
+        position = names[best]
+    else:
+        # 축소 좌표를 원래 크기로 되돌리고 여백 안으로 제한
+        x = min(max(cand_x[best] / scale_x, margin), width - box_width - margin)
+        y = min(max(cand_y[best] / scale_y, margin), height - box_height - margin)
+        x, y = max(0, x), max(0, y)
+        position = 'grid'
+
+    # 밝은 배경이면 검은 글자 + 흰 테두리, 어두운 배경이면 반대
+    if mean[best] > 128:
+        text_color, border_color = 'black', 'white'
+    else:
+        text_color, border_color = 'white', 'black'
+    return Placement(int(x), int(y), text_color, border_color, float(score[best]), position)
@@ -0,0 +1,173 @@
+# 생성 파이프라인 단계별 소요 시간 기록 (단계 타이머 + 히스토그램 + Prometheus 텍스트 출력)
+# 단계 시간은 항상 프로세스 전체 히스토그램에 쌓이고, 요청 추적(Trace)이 열려 있으면 그 요청에도 기록됨
+# 요청 추적은 contextvars로 전달되므로 stage_executor.run_stages로 실행한 단계에서도 같은 추적에 기록됨
+import contextlib
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+
+# 히스토그램 버킷 경계 (초): 글자 그리기(ms 단위)부터 DALL·E 응답(수십 초)까지
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# p50/p95/p99 계산에 쓰는 단계별 최근 측정값 수
+WINDOW = 1024
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Prometheus 지표 이름 앞에 붙는 이름
+METRIC_PREFIX = 'card'
+
+_current = contextvars.ContextVar('trace', default=None)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+class Histogram:
+    """누적 버킷 개수와 합계, 분위수 계산용 최근 측정값을 가진 히스토그램."""
+
+    def __init__(self, buckets=BUCKETS, window=WINDOW):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds):
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += seconds
+        self.recent.append(seconds)
+
+    def quantiles(self):
+        values = sorted(self.recent)
+        return {q: percentile(values, q) for q in QUANTILES}
+
+
+class Trace:
+    """한 요청의 단계별 소요 시간과 횟수 (같은 단계가 여러 번 실행되면 합산)."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages = OrderedDict()
+        self.counts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def header(self):
+        """X-Timing 헤더 값 (Server-Timing 형식, 예: "chat;dur=812.4, dalle;dur=9120.3, total;dur=9530.1")."""
+        with self._lock:
+            parts = [f'{stage};dur={seconds * 1000:.1f}' for stage, seconds in self.stages.items()]
+            parts += [f'{name};count={amount}' for name, amount in self.counts.items()]
+        parts.append(f'total;dur={self.elapsed() * 1000:.1f}')
+        return ', '.join(parts)
+
+
+class Metrics:
+    """단계별 히스토그램과 카운터 모음. prometheus()로 /metrics 응답 본문을 만듭니다."""
+
+    def __init__(self):
+        self._histograms = OrderedDict()
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def prometheus(self):
+        """Prometheus 텍스트 형식(0.0.4)의 지표 문자열."""
+        name = f'{METRIC_PREFIX}_stage_seconds'
+        lines = [f'# HELP {name} Time spent in each generation stage.', f'# TYPE {name} histogram']
+        with self._lock:
+            histograms = list(self._histograms.items())
+            for stage, h in histograms:
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {h.sum:.6f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {h.count}')
+
+            # 최근 WINDOW개 측정값의 분위수 (버킷 경계와 관계없이 p50/p95/p99를 바로 볼 수 있도록)
+            recent = f'{METRIC_PREFIX}_stage_recent_seconds'
+            lines += [f'# HELP {recent} Quantiles of the last {WINDOW} samples of each stage.',
+                      f'# TYPE {recent} summary']
+            for stage, h in histograms:
+                for q, value in h.quantiles().items():
+                    lines.append(f'{recent}{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+                lines.append(f'{recent}_sum{{stage="{stage}"}} {h.sum:.6f}')
+                lines.append(f'{recent}_count{{stage="{stage}"}} {h.count}')
+
+            for counter, value in self._counters.items():
+                counter = f'{METRIC_PREFIX}_{counter}_total'
+                lines += [f'# TYPE {counter} counter', f'{counter} {value}']
+        return '\n'.join(lines) + '\n'
+
+
+# 프로세스 전체에서 공유하는 지표
+METRICS = Metrics()
+
+
+@contextlib.contextmanager
+def request_trace():
+    """요청 추적을 열고 Trace를 돌려줍니다. 끝나면 전체 시간을 'total' 단계로 기록합니다."""
+    trace = Trace()
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        METRICS.observe('total', trace.elapsed())
+
+
+def record(stage, seconds):
+    """다른 곳(합성 프로세스 등)에서 잰 단계 시간을 기록합니다."""
+    METRICS.observe(stage, seconds)
+    trace = _current.get()
+    if trace is not None:
+        trace.add(stage, seconds)
+
+
+@contextlib.contextmanager
+def stage(name):
+    """with 블록의 실행 시간을 name 단계로 기록합니다 (예외가 나도 기록)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def count(name, amount=1):
+    """재시도, 인코딩 횟수 같은 카운터를 올립니다."""
+    METRICS.increment(name, amount)
+    trace = _current.get()
+    if trace is not None:
+        trace.count(name, amount)